@@ -1,7 +1,28 @@
 """aioarxiv: A package for interacting with the arXiv API asynchronously."""
 
 from .client import Client
-from .errors import ArxivError, UnexpectedEmptyPageError, HTTPError
+from .errors import ArxivError, UnexpectedEmptyPageError, HTTPError, DownloadError, OAIError
+from .downloads import DownloadResult
+from .rate_limiter import (
+    BaseRateLimiter,
+    AsyncRateLimiter,
+    SharedRateLimiter,
+    TokenBucketRateLimiter,
+    RateLimiterRegistry,
+)
+from .retry import RetryPolicy
+from .scheduler import FairScheduler, Priority, RequestTag, ClassStats, request_tag
+from .cache import HTTPCache, SQLiteHTTPCache, CachedResponse, PageCache, CachedPage
+from .stats import ClientStats, AttemptStats
+from .checkpoint import Checkpoint, CheckpointStore, JSONCheckpointStore, SQLiteCheckpointStore
+from .lookup import IdLookup
+from .sync import SyncResult
+from .announcements import AnnouncementCalendar, AnnouncementPoller
+from .planner import QueryPlanner, Shard
+from .query import QueryNode, QuerySyntaxError, parse_query, canonical_query
+from .snapshot import read_snapshot, load_snapshot
+from .index import LocalIndex
+from .parsers import BaseParser, ArxivParser, FeedparserParser, ParsedFeed
 from .models import (
     BaseResult,
     BaseQuery,
@@ -9,6 +30,8 @@ from .models import (
     RSSResult,
     SearchQuery,
     RSSQuery,
+    OAIResult,
+    OAIQuery,
     SortCriterion,
     SortOrder,
     AnnounceType,
@@ -19,12 +42,56 @@ __all__ = [
     "ArxivError",
     "UnexpectedEmptyPageError",
     "HTTPError",
+    "DownloadError",
+    "OAIError",
+    "DownloadResult",
+    "BaseRateLimiter",
+    "AsyncRateLimiter",
+    "SharedRateLimiter",
+    "TokenBucketRateLimiter",
+    "RateLimiterRegistry",
+    "RetryPolicy",
+    "FairScheduler",
+    "Priority",
+    "RequestTag",
+    "ClassStats",
+    "request_tag",
+    "HTTPCache",
+    "SQLiteHTTPCache",
+    "CachedResponse",
+    "PageCache",
+    "CachedPage",
+    "ClientStats",
+    "AttemptStats",
+    "Checkpoint",
+    "CheckpointStore",
+    "JSONCheckpointStore",
+    "SQLiteCheckpointStore",
+    "IdLookup",
+    "SyncResult",
+    "AnnouncementCalendar",
+    "AnnouncementPoller",
+    "QueryPlanner",
+    "Shard",
+    "QueryNode",
+    "QuerySyntaxError",
+    "parse_query",
+    "canonical_query",
+    "read_snapshot",
+    "load_snapshot",
+    "LocalIndex",
+    "BaseParser",
+    "ArxivParser",
+    "FeedparserParser",
+    "ParsedFeed",
     "BaseResult",
     "BaseQuery",
     "SearchResult",
     "RSSResult",
     "SearchQuery",
     "RSSQuery",
+    "OAIResult",
+    "OAIQuery",
     "SortCriterion",
     "SortOrder",
     "AnnounceType",
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as time_of_day
+from typing import Callable, Iterable, Optional, Set
+
+from aioarxiv.models.utilities import _classname
+
+logger = logging.getLogger(__name__)
+
+_EST = timedelta(hours=-5)
+_EDT = timedelta(hours=-4)
+# Looking further ahead than this for an announcement means the calendar is broken.
+_MAX_DAYS = 366
+
+
+def _nth_sunday(year: int, month: int, n: int) -> date:
+    first = date(year, month, 1)
+    return first + timedelta(days=(6 - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _eastern_offset(instant: datetime) -> timedelta:
+    """
+    The UTC offset of US Eastern time at a UTC `instant`: daylight time runs
+    from 2:00 on the second Sunday in March to 2:00 on the first Sunday in
+    November.
+    """
+    year = instant.year
+    dst_start = datetime.combine(_nth_sunday(year, 3, 2), time_of_day(7), timezone.utc)
+    dst_end = datetime.combine(_nth_sunday(year, 11, 1), time_of_day(6), timezone.utc)
+    return _EDT if dst_start <= instant < dst_end else _EST
+
+
+def _eastern_to_utc(local: datetime) -> datetime:
+    """
+    Converts a naive US Eastern wall-clock time to UTC.
+    """
+    standard = (local - _EST).replace(tzinfo=timezone.utc)
+    return standard + _EST - _eastern_offset(standard)
+
+
+class AnnouncementCalendar(object):
+    """
+    arXiv's announcement calendar: when its RSS feeds are expected to change.
+
+    Feeds are rebuilt once per announcement, at `update_time` US Eastern
+    (midnight by default) on each weekday that isn't one of arXiv's
+    `holidays`. They don't change on weekends.
+
+    Times are seconds since the epoch, like `time.time()`.
+    """
+
+    update_time: time_of_day
+    """The US Eastern time of day at which feeds are rebuilt."""
+    holidays: Set[date]
+    """Dates (in US Eastern time) on which arXiv doesn't announce, so feeds don't change."""
+    clock: Callable[[], float]
+    """
+    A clock returning seconds since the epoch; `time.time` unless a different
+    clock is injected (e.g. in tests).
+    """
+
+    def __init__(
+        self,
+        update_time: time_of_day = time_of_day(0, 0),
+        holidays: Iterable[date] = (),
+        clock: Callable[[], float] = time.time,
+    ):
+        self.update_time = update_time
+        self.holidays = set(holidays)
+        self.clock = clock
+
+    def is_announcement_day(self, day: date) -> bool:
+        """
+        Whether feeds change on `day` (in US Eastern time).
+        """
+        return day.weekday() < 5 and day not in self.holidays
+
+    def update_at(self, day: date) -> float:
+        """
+        When feeds are rebuilt on `day`, if it's an announcement day.
+        """
+        return _eastern_to_utc(datetime.combine(day, self.update_time)).timestamp()
+
+    def next_update(self, after: Optional[float] = None) -> float:
+        """
+        When feeds are next expected to change, strictly after `after`
+        (default: now).
+        """
+        after = self.clock() if after is None else after
+        day = self._eastern_day(after)
+        for _ in range(_MAX_DAYS):
+            if self.is_announcement_day(day) and self.update_at(day) > after:
+                return self.update_at(day)
+            day += timedelta(days=1)
+        raise ValueError("No announcement within a year of {}".format(after))
+
+    def previous_update(self, before: Optional[float] = None) -> float:
+        """
+        When feeds last changed, at or before `before` (default: now).
+        """
+        before = self.clock() if before is None else before
+        day = self._eastern_day(before)
+        for _ in range(_MAX_DAYS):
+            if self.is_announcement_day(day) and self.update_at(day) <= before:
+                return self.update_at(day)
+            day -= timedelta(days=1)
+        raise ValueError("No announcement within a year before {}".format(before))
+
+    @staticmethod
+    def _eastern_day(instant: float) -> date:
+        utc = datetime.fromtimestamp(instant, timezone.utc)
+        return (utc + _eastern_offset(utc)).date()
+
+    def __repr__(self) -> str:
+        return "{}(update_time={}, holidays={})".format(
+            _classname(self), repr(self.update_time), repr(sorted(self.holidays))
+        )
+
+
+class AnnouncementPoller(object):
+    """
+    Decides how long `Client.watch` waits between polls of an RSS feed,
+    following an `AnnouncementCalendar`.
+
+    The poller sleeps until `lead` seconds before the next expected update,
+    then polls every `dense_interval` seconds until `dense_window` seconds
+    after it. If the feed still hasn't changed (e.g. arXiv is late, or it's
+    an unlisted holiday), the interval doubles with each poll, up to
+    `max_interval`, until the feed changes or the following update is due.
+
+    The first poll sets the baseline: if the feed already holds the latest
+    expected update, the poller waits for the next one; if it's dated
+    before that update, the update is overdue and polled for.
+    """
+
+    calendar: AnnouncementCalendar
+    """The announcement calendar, whose clock the poller reads."""
+    lead: float
+    """Seconds before an expected update to start polling."""
+    dense_interval: float
+    """Seconds between polls around an expected update."""
+    dense_window: float
+    """Seconds after an expected update for which polls stay dense."""
+    max_interval: float
+    """The longest wait between polls while an update is overdue."""
+
+    def __init__(
+        self,
+        calendar: Optional[AnnouncementCalendar] = None,
+        lead: float = 300.0,
+        dense_interval: float = 60.0,
+        dense_window: float = 1800.0,
+        max_interval: float = 3600.0,
+    ):
+        self.calendar = calendar or AnnouncementCalendar()
+        self.lead = lead
+        self.dense_interval = dense_interval
+        self.dense_window = dense_window
+        self.max_interval = max_interval
+        self._awaiting: Optional[float] = None
+        self._interval = dense_interval
+
+    @property
+    def awaiting(self) -> Optional[float]:
+        """The expected update the poller is waiting for; `None` before the first poll."""
+        return self._awaiting
+
+    def delay(self, changed: bool, updated: Optional[float] = None) -> float:
+        """
+        Returns the seconds to wait before the next poll, given whether the
+        last poll found the feed changed and, if known, when the feed was
+        last updated (e.g. its entries' `RSSResult.feed_date`).
+        """
+        now = self.calendar.clock()
+        if self._awaiting is None:
+            # The first poll finds the feed as it is: unless it's dated before
+            # the latest expected update, that update has already landed.
+            previous = self.calendar.previous_update(now)
+            if updated is not None and updated < previous - self.lead:
+                self._awaiting = previous
+            else:
+                self._awaiting = self.calendar.next_update(now)
+            self._interval = self.dense_interval
+        elif changed:
+            # A change shortly before an expected update is that update, early.
+            self._awaiting = self.calendar.next_update(now + self.lead)
+            self._interval = self.dense_interval
+        else:
+            following = self.calendar.next_update(self._awaiting)
+            if now >= following - self.lead:
+                logger.info("Expected feed update at %s never came", self._awaiting)
+                self._awaiting = following
+                self._interval = self.dense_interval
+
+        window_opens = self._awaiting - self.lead
+        if now < window_opens:
+            return window_opens - now
+        if now < self._awaiting + self.dense_window:
+            return self.dense_interval
+        # Overdue: back off, but don't sleep through the following update.
+        self._interval = min(self._interval * 2, self.max_interval)
+        following = self.calendar.next_update(self._awaiting)
+        return max(min(self._interval, following - self.lead - now), 0.0)
+
+    def __repr__(self) -> str:
+        return "{}(lead={}, dense_interval={}, dense_window={}, max_interval={})".format(
+            _classname(self),
+            repr(self.lead),
+            repr(self.dense_interval),
+            repr(self.dense_window),
+            repr(self.max_interval),
+        )
@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from yarl import URL
+
+from aioarxiv.models.utilities import _classname
+from aioarxiv.query import QuerySyntaxError, canonical_query
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Returns a canonical form of a request URL, so that equivalent requests share
+    a cache key.
+
+    The scheme and host are lowercased, empty query parameters (e.g. an empty
+    `id_list`) are dropped and the remaining parameters are sorted. A
+    `search_query` is replaced by its `canonical_query`, if it parses.
+    """
+    url = URL(str(url))
+    query = sorted((k, _canonical_param(k, v)) for k, v in url.query.items() if v != "")
+    canonical = url.with_scheme(url.scheme.lower()).with_host((url.host or "").lower())
+    return str(canonical.with_query(query))
+
+
+def _canonical_param(name: str, value: str) -> str:
+    if name != "search_query":
+        return value
+    try:
+        return canonical_query(value)
+    except QuerySyntaxError:
+        return value
+
+
+class CachedResponse(object):
+    """
+    A response body stored by an `HTTPCache`, with its validators.
+    """
+
+    body: bytes
+    """The response body."""
+    etag: Optional[str]
+    """The response's `ETag` header, if any."""
+    last_modified: Optional[str]
+    """The response's `Last-Modified` header, if any."""
+    stored_at: float
+    """When the response was fetched or last revalidated, in seconds since the epoch."""
+
+    def __init__(
+        self,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        stored_at: Optional[float] = None,
+    ):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.time() if stored_at is None else stored_at
+
+    def validators(self) -> Dict[str, str]:
+        """
+        Returns the conditional request headers which revalidate this response.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def __repr__(self) -> str:
+        return "{}(<{} bytes>, etag={}, last_modified={}, stored_at={})".format(
+            _classname(self),
+            len(self.body),
+            repr(self.etag),
+            repr(self.last_modified),
+            repr(self.stored_at),
+        )
+
+
+class HTTPCache(object):
+    """
+    A base class for persistent caches of feed responses, used by `Client` when
+    passed as `http_cache`.
+
+    A response younger than its endpoint's TTL is served without a request,
+    skipping the rate limiter entirely. An older response is revalidated with
+    `If-None-Match`/`If-Modified-Since` when it has validators; a `304 Not
+    Modified` reply refreshes it without downloading the body again.
+
+    Subclasses implement `_load` and `_store`.
+    """
+
+    ttl: Dict[str, float]
+    """Seconds for which responses stay fresh, keyed by host."""
+    default_ttl: float
+    """Seconds for which responses from hosts missing from `ttl` stay fresh."""
+    hits: int
+    """Number of lookups served from the cache without a request."""
+    misses: int
+    """Number of lookups which found no usable response."""
+    revalidations: int
+    """Number of stale responses confirmed unchanged by a `304` reply."""
+
+    def __init__(
+        self,
+        ttl: Optional[Mapping[str, float]] = None,
+        default_ttl: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = dict(ttl or {})
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def ttl_for(self, url: str) -> float:
+        """
+        Returns the TTL for responses from the host of `url`.
+        """
+        return self.ttl.get((URL(str(url)).host or "").lower(), self.default_ttl)
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """
+        Returns the stored response for `url`, fresh or stale, if any.
+        """
+        return self._load(canonical_url(url))
+
+    def is_fresh(self, url: str, cached: CachedResponse) -> bool:
+        """
+        Whether `cached` can be served for `url` without revalidation.
+        """
+        return self.clock() - cached.stored_at < self.ttl_for(url)
+
+    def put(self, url: str, response: CachedResponse):
+        """
+        Stores `response` for `url`, replacing any previous response.
+        """
+        self._store(canonical_url(url), response)
+
+    def _load(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    def _store(self, key: str, response: CachedResponse):
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return "{}(hits={}, misses={}, revalidations={})".format(
+            _classname(self), repr(self.hits), repr(self.misses), repr(self.revalidations)
+        )
+
+
+class SQLiteHTTPCache(HTTPCache):
+    """
+    An `HTTPCache` stored in a SQLite database file.
+    """
+
+    path: str
+    """Path of the database file; `":memory:"` for a cache that isn't persisted."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[Mapping[str, float]] = None,
+        default_ttl: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(ttl=ttl, default_ttl=default_ttl, clock=clock)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " body BLOB NOT NULL,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " stored_at REAL NOT NULL)"
+            )
+
+    def _load(self, key: str) -> Optional[CachedResponse]:
+        row = self._db.execute(
+            "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(bytes(row[0]), etag=row[1], last_modified=row[2], stored_at=row[3])
+
+    def _store(self, key: str, response: CachedResponse):
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, body, etag, last_modified, stored_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, response.body, response.etag, response.last_modified, response.stored_at),
+            )
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self._db.close()
+
+
+def page_key(url: str) -> Tuple[str, int, Optional[int]]:
+    """
+    Returns the `PageCache` key for a page URL: the canonical query URL without
+    its pagination parameters, the page's start offset, and its page size
+    (`None` for feeds that aren't paginated, e.g. RSS).
+    """
+    url = URL(canonical_url(url))
+    query = {k: v for k, v in url.query.items() if k not in ("start", "max_results")}
+    page_size = url.query.get("max_results")
+    return (
+        str(url.with_query(sorted(query.items()))),
+        int(url.query.get("start", 0)),
+        int(page_size) if page_size is not None else None,
+    )
+
+
+def _approximate_size(result: object) -> int:
+    """
+    A cheap estimate of the memory held by a parsed result, in bytes.
+
+    Counts the length of each attribute's text, doubled if the result keeps
+    its raw feedparser entry in `_raw` (results built by `ArxivParser` don't).
+    """
+    size = 0
+    for name, value in vars(result).items():
+        if name == "_raw" or value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            size += sum(len(str(item)) for item in value)
+        else:
+            size += len(str(value))
+    if getattr(result, "_raw", None) is not None:
+        return 2 * size
+    return size
+
+
+class CachedPage(object):
+    """
+    A page of parsed results stored by a `PageCache`.
+    """
+
+    results: List[object]
+    """The page's results, in feed order."""
+    num_entries: int
+    """
+    Number of entries in the feed page, including partial entries which
+    couldn't be parsed into results.
+    """
+    total_results: Optional[int]
+    """The total number of results reported by the feed, if any."""
+    size: int
+    """Approximate memory held by `results`, in bytes."""
+    stored_at: float
+    """When the page was stored, according to the cache's clock."""
+
+    def __init__(
+        self,
+        results: List[object],
+        num_entries: int,
+        total_results: Optional[int] = None,
+        stored_at: float = 0.0,
+    ):
+        self.results = results
+        self.num_entries = num_entries
+        self.total_results = total_results
+        self.size = sum(_approximate_size(r) for r in results)
+        self.stored_at = stored_at
+
+    def __repr__(self) -> str:
+        return "{}(<{} results>, num_entries={}, total_results={})".format(
+            _classname(self),
+            len(self.results),
+            repr(self.num_entries),
+            repr(self.total_results),
+        )
+
+
+class PageCache(object):
+    """
+    A bounded in-memory cache of parsed result pages, used by `Client` when
+    passed as `page_cache`.
+
+    Repeating a query serves its pages without fetching, parsing or building
+    results again, which suits services that run the same queries for many
+    users. Cached results are shared between callers and should be treated as
+    read-only.
+
+    Pages expire `ttl` seconds after they're stored. The least recently used
+    pages are evicted to stay within both `max_pages` and `max_bytes`.
+    """
+
+    max_pages: int
+    """Maximum number of pages held."""
+    max_bytes: int
+    """Maximum approximate memory held by cached results, in bytes."""
+    ttl: Optional[float]
+    """Seconds for which a page stays valid; `None` to never expire pages."""
+    hits: int
+    """Number of lookups served from the cache."""
+    misses: int
+    """Number of lookups which found no valid page."""
+    evictions: int
+    """Number of pages evicted to stay within the cache's bounds."""
+
+    def __init__(
+        self,
+        max_pages: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._pages: OrderedDict[Tuple[str, int, Optional[int]], CachedPage] = OrderedDict()
+        self._bytes = 0
+
+    @property
+    def size(self) -> int:
+        """Approximate memory held by cached results, in bytes."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """
+        Returns the valid cached page for `url`, if any, marking it as
+        recently used.
+        """
+        key = page_key(url)
+        page = self._pages.get(key)
+        if page is not None and self.ttl is not None and self.clock() - page.stored_at >= self.ttl:
+            self._discard(key)
+            page = None
+        if page is None:
+            self.misses += 1
+            return None
+        self._pages.move_to_end(key)
+        self.hits += 1
+        return page
+
+    def put(self, url: str, page: CachedPage):
+        """
+        Stores `page` for `url`, evicting least recently used pages as needed.
+        Pages larger than `max_bytes` aren't stored.
+        """
+        key = page_key(url)
+        self._discard(key)
+        if page.size > self.max_bytes or self.max_pages <= 0:
+            return
+        page.stored_at = self.clock()
+        self._pages[key] = page
+        self._bytes += page.size
+        while len(self._pages) > self.max_pages or self._bytes > self.max_bytes:
+            oldest = next(iter(self._pages))
+            self._discard(oldest)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Discards every cached page.
+        """
+        self._pages.clear()
+        self._bytes = 0
+
+    def _discard(self, key: Tuple[str, int, Optional[int]]):
+        page = self._pages.pop(key, None)
+        if page is not None:
+            self._bytes -= page.size
+
+    def __repr__(self) -> str:
+        return "{}(max_pages={}, max_bytes={}, ttl={})".format(
+            _classname(self), repr(self.max_pages), repr(self.max_bytes), repr(self.ttl)
+        )
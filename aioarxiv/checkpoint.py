@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+from aioarxiv.models import OAIQuery, RSSQuery, SearchQuery
+from aioarxiv.models.utilities import _classname
+
+logger = logging.getLogger(__name__)
+
+
+def query_fingerprint(query: Union[SearchQuery, OAIQuery, RSSQuery], *extra: object) -> str:
+    """
+    Returns a stable digest of the parameters that determine a query's results
+    (and any `extra` values, e.g. a planned date range), used to check that a
+    checkpoint belongs to the harvest resuming from it.
+
+    `max_results` isn't included, so a harvest can be resumed with a different
+    limit.
+    """
+    if isinstance(query, RSSQuery):
+        args = [("feed", query.feed), ("id_list", ",".join(query.id_list)), ("query", query.query)]
+    else:
+        args = sorted(query._url_args().items())
+    payload = json.dumps([args, [str(value) for value in extra]], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Checkpoint(object):
+    """
+    The cursor of a resumable harvest (see `Client.harvest`), saved to a
+    `CheckpointStore` after each page.
+    """
+
+    fingerprint: str
+    """The `query_fingerprint` of the harvested query."""
+    shard: int
+    """Index of the shard being harvested; always 0 for an unplanned query."""
+    offset: int
+    """Start offset of the next page to fetch within the current shard."""
+    total_results: Optional[int]
+    """The current shard's total result count, as of its last page."""
+    last_ids: List[str]
+    """
+    Unversioned IDs already yielded which might be served again by the next
+    page, e.g. if papers were added since: the last committed page's, plus any
+    yielded from the next page before the harvest stopped. They're skipped.
+    """
+    yielded: int
+    """Number of results yielded so far, across all runs."""
+    shards: Optional[List[Tuple[datetime, datetime]]]
+    """The planned shards' date windows, for harvests of a `QueryPlanner`."""
+    resumption_token: Optional[str]
+    """
+    The OAI-PMH resumption token of the next page, for harvests of
+    `Client.oai_records`; `None` before the first page.
+    """
+    watermark: Optional[datetime]
+    """
+    The latest `updated` time synced by `Client.sync`; `None` before the first
+    sync.
+    """
+    watermark_ids: List[str]
+    """
+    Versioned IDs synced by `Client.sync` which were updated at exactly the
+    `watermark`. They're skipped by the next sync.
+    """
+    seen: Dict[str, float]
+    """
+    Keys (short ID and announcement type) of the feed entries yielded by
+    `Client.watch`, mapped to when each was last in the feed, in seconds since
+    the epoch.
+    """
+    done: bool
+    """Whether the harvest has finished."""
+
+    def __init__(
+        self,
+        fingerprint: str,
+        shard: int = 0,
+        offset: int = 0,
+        total_results: Optional[int] = None,
+        last_ids: Optional[List[str]] = None,
+        yielded: int = 0,
+        shards: Optional[List[Tuple[datetime, datetime]]] = None,
+        done: bool = False,
+        resumption_token: Optional[str] = None,
+        watermark: Optional[datetime] = None,
+        seen: Optional[Dict[str, float]] = None,
+        watermark_ids: Optional[List[str]] = None,
+    ):
+        self.fingerprint = fingerprint
+        self.shard = shard
+        self.offset = offset
+        self.total_results = total_results
+        self.last_ids = last_ids or []
+        self.yielded = yielded
+        self.shards = shards
+        self.done = done
+        self.resumption_token = resumption_token
+        self.watermark = watermark
+        self.watermark_ids = watermark_ids or []
+        self.seen = seen or {}
+
+    def to_dict(self) -> dict:
+        """
+        Returns a JSON-serializable representation of the checkpoint.
+        """
+        return {
+            "fingerprint": self.fingerprint,
+            "shard": self.shard,
+            "offset": self.offset,
+            "total_results": self.total_results,
+            "last_ids": self.last_ids,
+            "yielded": self.yielded,
+            "shards": (
+                [[start.isoformat(), end.isoformat()] for start, end in self.shards]
+                if self.shards is not None
+                else None
+            ),
+            "done": self.done,
+            "resumption_token": self.resumption_token,
+            "watermark": self.watermark.isoformat() if self.watermark is not None else None,
+            "watermark_ids": self.watermark_ids,
+            "seen": self.seen,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Checkpoint:
+        """
+        Restores a checkpoint from the output of `to_dict`.
+        """
+        shards = data.get("shards")
+        watermark = data.get("watermark")
+        return cls(
+            fingerprint=data["fingerprint"],
+            shard=data.get("shard", 0),
+            offset=data.get("offset", 0),
+            total_results=data.get("total_results"),
+            last_ids=list(data.get("last_ids", [])),
+            yielded=data.get("yielded", 0),
+            shards=(
+                [
+                    (datetime.fromisoformat(start), datetime.fromisoformat(end))
+                    for start, end in shards
+                ]
+                if shards is not None
+                else None
+            ),
+            done=data.get("done", False),
+            resumption_token=data.get("resumption_token"),
+            watermark=datetime.fromisoformat(watermark) if watermark is not None else None,
+            watermark_ids=list(data.get("watermark_ids", [])),
+            seen=dict(data.get("seen", {})),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Checkpoint):
+            return self.to_dict() == other.to_dict()
+        return False
+
+    def __repr__(self) -> str:
+        return "{}(fingerprint={}, shard={}, offset={}, yielded={}, done={})".format(
+            _classname(self),
+            repr(self.fingerprint[:12]),
+            repr(self.shard),
+            repr(self.offset),
+            repr(self.yielded),
+            repr(self.done),
+        )
+
+
+class CheckpointStore(object):
+    """
+    A base class for storage of harvest `Checkpoint`s, keyed by harvest name.
+
+    Subclasses implement `load`, `save` and `delete`. `save` must be atomic: a
+    crash while saving leaves either the previous or the new checkpoint.
+    """
+
+    def load(self, key: str) -> Optional[Checkpoint]:
+        """
+        Returns the checkpoint saved under `key`, if any.
+        """
+        raise NotImplementedError
+
+    def save(self, key: str, checkpoint: Checkpoint):
+        """
+        Saves `checkpoint` under `key`, replacing any previous checkpoint.
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """
+        Removes the checkpoint saved under `key`, so the harvest starts over.
+        """
+        raise NotImplementedError
+
+
+class JSONCheckpointStore(CheckpointStore):
+    """
+    A `CheckpointStore` kept in a JSON file, which is rewritten to a temporary
+    file and atomically renamed over the original on each save.
+    """
+
+    path: str
+    """Path of the JSON file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, checkpoints: Dict[str, dict]):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".checkpoint-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(checkpoints, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, key: str) -> Optional[Checkpoint]:
+        data = self._read().get(key)
+        return Checkpoint.from_dict(data) if data is not None else None
+
+    def save(self, key: str, checkpoint: Checkpoint):
+        checkpoints = self._read()
+        checkpoints[key] = checkpoint.to_dict()
+        self._write(checkpoints)
+
+    def delete(self, key: str):
+        checkpoints = self._read()
+        if checkpoints.pop(key, None) is not None:
+            self._write(checkpoints)
+
+    def __repr__(self) -> str:
+        return "{}(path={})".format(_classname(self), repr(self.path))
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """
+    A `CheckpointStore` kept in a SQLite database file; each save is a single
+    transaction.
+    """
+
+    path: str
+    """Path of the database file; `":memory:"` for a store that isn't persisted."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints (key TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+
+    def load(self, key: str) -> Optional[Checkpoint]:
+        row = self._db.execute("SELECT data FROM checkpoints WHERE key = ?", (key,)).fetchone()
+        return Checkpoint.from_dict(json.loads(row[0])) if row is not None else None
+
+    def save(self, key: str, checkpoint: Checkpoint):
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO checkpoints (key, data) VALUES (?, ?)",
+                (key, json.dumps(checkpoint.to_dict())),
+            )
+
+    def delete(self, key: str):
+        with self._db:
+            self._db.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self._db.close()
+
+    def __repr__(self) -> str:
+        return "{}(path={})".format(_classname(self), repr(self.path))
+
+
+def load_checkpoint(store: CheckpointStore, key: str, fingerprint: str) -> Checkpoint:
+    """
+    Returns the checkpoint saved under `key` if it belongs to the harvest with
+    `fingerprint`, or a fresh checkpoint otherwise.
+    """
+    checkpoint = store.load(key)
+    if checkpoint is None:
+        return Checkpoint(fingerprint)
+    if checkpoint.fingerprint != fingerprint:
+        logger.warning("Checkpoint %r belongs to a different query; starting over", key)
+        return Checkpoint(fingerprint)
+    logger.info("Resuming harvest %r from %r", key, checkpoint)
+    return checkpoint
@@ -1,21 +1,91 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import inspect
 import logging
+import os
+import time
+from concurrent.futures import Executor
 import feedparser
 import aiohttp
+from collections import deque
+from datetime import datetime, timezone
+from xml.etree import ElementTree
 from yarl import URL
-from typing import AsyncGenerator, Optional, Union, cast
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
-from aioarxiv.models import SearchResult, RSSResult, RSSQuery, SearchQuery
-from aioarxiv.errors import HTTPError, UnexpectedEmptyPageError
-from aioarxiv.rate_limiter import AsyncRateLimiter
+from aioarxiv.cache import (
+    CachedPage,
+    CachedResponse,
+    HTTPCache,
+    PageCache,
+    canonical_url,
+    page_key,
+)
+from aioarxiv.checkpoint import Checkpoint, CheckpointStore, load_checkpoint, query_fingerprint
+from aioarxiv.models import (
+    OAIQuery,
+    OAIResult,
+    SearchResult,
+    RSSResult,
+    RSSQuery,
+    SearchQuery,
+    SortCriterion,
+    SortOrder,
+)
+from aioarxiv.errors import ArxivError, HTTPError, OAIError, UnexpectedEmptyPageError
+from aioarxiv.rate_limiter import AsyncRateLimiter, BaseRateLimiter, RateLimiterRegistry
+from aioarxiv.retry import RetryPolicy, parse_retry_after
+from aioarxiv.scheduler import Priority, request_tag
+from aioarxiv.stats import AttemptStats, ClientStats
+from aioarxiv.downloads import DownloadResult, download_many, fetch_to_file
+from aioarxiv.streaming import AtomStreamParser, StreamedPage
+from aioarxiv.lookup import IdLookup, chunk_ids, dedup_ids, match_ids
+from aioarxiv.oai import OAIPage, OAIStreamParser
+from aioarxiv.sync import SyncResult
+from aioarxiv.announcements import AnnouncementPoller
+from aioarxiv.parsers import ArxivParser, BaseParser, ParsedFeed, entry_to_result, parse_detached
 from aioarxiv.decorators import refcount_context
-from aioarxiv.models.utilities import _classname, strip_arxiv_id_version
+from aioarxiv.models.utilities import _DEFAULT_TIME, _classname, strip_arxiv_id_version
 
 logger = logging.getLogger(__name__)
 
 MAX_PAGE_SIZE = 2_000
 
+# Bytes read from the response at a time when streaming pages.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Longest comma-joined `id_list` sent in a single `Client.get_by_ids` request,
+# keeping request URLs well within common server limits.
+MAX_ID_LIST_CHARS = 6_000
+
+# Errors a request is retried on, as directed by `Client.retry_policy`.
+_RETRIABLE_ERRORS: Tuple[Type[BaseException], ...] = (
+    HTTPError,
+    UnexpectedEmptyPageError,
+    aiohttp.ClientError,
+)
+
+T = TypeVar("T")
+
 
 @refcount_context
 class Client(object):
@@ -34,6 +104,10 @@ class Client(object):
     """
     The arXiv RSS feed API endpoint format.
     """
+    oai_url = "https://oaipmh.arxiv.org/oai"
+    """
+    The arXiv OAI-PMH endpoint, used by `Client.oai_records`.
+    """
     page_size: int
     """
     Maximum number of results fetched in a single API request. Smaller pages can
@@ -48,17 +122,117 @@ class Client(object):
     [arXiv's Terms of Use](https://arxiv.org/help/api/tou) ask that you "make no
     more than one request every three seconds."
     """
-    num_retries: int
+    retry_policy: RetryPolicy
+    """
+    Decides whether and when failing API requests are retried. Defaults to
+    exponential backoff with jitter, honoring `Retry-After` headers.
+    """
+    stats: ClientStats
+    """
+    Counters and per-try timings for this client's requests.
+    """
+    http_cache: Optional[HTTPCache]
+    """
+    An optional persistent cache of feed responses, e.g. a `SQLiteHTTPCache`.
+    Fresh cached responses are served without a request or any rate-limiter
+    wait; stale ones are revalidated with conditional requests.
+    """
+    page_cache: Optional[PageCache]
+    """
+    An optional in-memory cache of parsed result pages. Repeated queries are
+    served from it without fetching or parsing their pages again.
+    """
+    parser: BaseParser
+    """
+    Turns response bodies into results. Defaults to an `ArxivParser`, which is
+    specialized for arXiv's feeds and falls back to `feedparser` for malformed
+    documents; pass a `FeedparserParser` to always use `feedparser`.
+    """
+    parse_executor: Optional[Executor]
+    """
+    An optional executor in which responses are parsed, keeping parsing off
+    the event loop. A `ThreadPoolExecutor` keeps the loop responsive; a
+    `ProcessPoolExecutor` also parses several pages in parallel on multi-core
+    hosts, e.g. with `Client.prefetch_pages`. `None` parses on the event loop.
+
+    The client doesn't shut the executor down.
+    """
+    streaming: bool
+    """
+    Whether Search API pages are parsed incrementally as they download,
+    yielding each result as soon as its entry is complete instead of after the
+    whole page arrives. This lowers time-to-first-result and peak memory for
+    large pages.
+
+    Streamed pages bypass `Client.http_cache`, `Client.page_cache` and
+    prefetching, which all need complete pages. RSS feeds are never streamed.
+    """
+    prefetch_pages: int
+    """
+    Number of Search API pages to fetch in the background while the current
+    page is being consumed. `0` disables prefetching.
+
+    Prefetched requests still pass through the client's rate limiters, so they
+    respect `delay_seconds`; prefetching only overlaps network time with the
+    time spent processing already-fetched results.
+    """
+    coalesce_requests: bool
+    """
+    Whether concurrent fetches of the same feed URL (after canonicalization)
+    share a single request, so fan-in load, e.g. many users of an API server
+    asking for the same page at once, costs one request and one rate-limiter
+    slot instead of one per caller. Each caller gets the same parsed results.
+    """
+    connections_per_host: int
+    """
+    Maximum number of simultaneous connections to each host in the client's
+    connection pool; `0` for no limit.
+    """
+    keepalive_timeout: float
+    """
+    Seconds an idle pooled connection is kept open for reuse.
     """
-    Number of times to retry a failing API request before raising an Exception.
+    dns_cache_ttl: Optional[int]
     """
-    rate_limiter: AsyncRateLimiter
+    Seconds resolved host addresses are cached; `None` caches them forever.
     """
-    An asynchronous rate limiter for API requests.
+    rate_limiter: BaseRateLimiter
+    """
+    An asynchronous rate limiter for query API requests. Defaults to an
+    `AsyncRateLimiter` spaced by `delay_seconds`; pass a `SharedRateLimiter` to
+    share one budget between worker processes on the same machine.
+    """
+    rate_limiters: RateLimiterRegistry
+    """
+    Rate limiters keyed by host. Query API requests use `Client.rate_limiter`;
+    RSS feeds and downloads each get a separate limiter spaced by
+    `delay_seconds`, so they don't share the query API's budget.
+
+    Register a different limiter to change a host's budget, e.g.
+    `client.rate_limiters.register("arxiv.org", TokenBucketRateLimiter(rate=1, burst=4))`.
+    Pass the registry to `BaseResult.download_pdf` and
+    `BaseResult.download_source` to rate-limit downloads.
     """
     _session: aiohttp.ClientSession
 
-    def __init__(self, page_size: int = 100, delay_seconds: float = 3.0, num_retries: int = 3):
+    def __init__(
+        self,
+        page_size: int = 100,
+        delay_seconds: float = 3.0,
+        num_retries: int = 3,
+        prefetch_pages: int = 0,
+        streaming: bool = False,
+        rate_limiter: Optional[BaseRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        http_cache: Optional[HTTPCache] = None,
+        page_cache: Optional[PageCache] = None,
+        parser: Optional[BaseParser] = None,
+        parse_executor: Optional[Executor] = None,
+        coalesce_requests: bool = True,
+        connections_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: Optional[int] = 300,
+    ):
         """
         Constructs an arXiv API client with the specified options.
 
@@ -69,16 +243,40 @@ class Client(object):
         """
         self.page_size = min(page_size, MAX_PAGE_SIZE)
         self.delay_seconds = delay_seconds
-        self.num_retries = num_retries
-        self.rate_limiter = AsyncRateLimiter(period=delay_seconds)
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=num_retries)
+        self.stats = ClientStats()
+        self.http_cache = http_cache
+        self.page_cache = page_cache
+        self.parser = parser or ArxivParser()
+        self.parse_executor = parse_executor
+        self.prefetch_pages = max(prefetch_pages, 0)
+        self.streaming = streaming
+        self.coalesce_requests = coalesce_requests
+        self.connections_per_host = connections_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.rate_limiter = rate_limiter or AsyncRateLimiter(period=delay_seconds)
+        self.rate_limiters = RateLimiterRegistry(
+            default_factory=lambda: AsyncRateLimiter(period=delay_seconds),
+            limiters={URL(self.query_url_format).host: self.rate_limiter},
+        )
         self._session: Optional[aiohttp.ClientSession] = None
+        self._in_flight: Dict[Tuple[str, bool], asyncio.Future] = {}
 
     async def __aenter__(self):
         """
         Async context manager entry point to create aiohttp session.
         """
         if self._session is None:
-            self._session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.connections_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, trace_configs=[self.stats._trace_config()]
+            )
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -89,16 +287,29 @@ class Client(object):
             await self._session.close()
             self._session = None
 
+    @property
+    def num_retries(self) -> int:
+        """
+        Number of times to retry a failing API request before raising an
+        Exception. Shorthand for `Client.retry_policy.max_retries`.
+        """
+        return self.retry_policy.max_retries
+
+    @num_retries.setter
+    def num_retries(self, num_retries: int):
+        self.retry_policy.max_retries = num_retries
+
     def __str__(self) -> str:
         # TODO: develop a more informative string representation.
         return repr(self)
 
     def __repr__(self) -> str:
-        return "{}(page_size={}, delay_seconds={}, num_retries={})".format(
+        return "{}(page_size={}, delay_seconds={}, num_retries={}, prefetch_pages={})".format(
             _classname(self),
             repr(self.page_size),
             repr(self.delay_seconds),
             repr(self.num_retries),
+            repr(self.prefetch_pages),
         )
 
     async def results(
@@ -136,8 +347,577 @@ class Client(object):
             if limit is not None and limit <= 0:
                 return
 
-            async for result in self._search_results(cast(SearchQuery, query), offset, limit):
+            if self.streaming:
+                results = self._stream_search_results(cast(SearchQuery, query), offset, limit)
+            else:
+                results = self._search_results(cast(SearchQuery, query), offset, limit)
+            try:
+                async for result in results:
+                    yield result
+            finally:
+                # Close eagerly so outstanding prefetches are cancelled as soon
+                # as the caller closes this generator.
+                await results.aclose()
+
+    def get_by_ids(
+        self,
+        ids: Iterable[str],
+        ordered: bool = True,
+        concurrency: int = 4,
+        chunk_size: int = MAX_PAGE_SIZE,
+    ) -> IdLookup:
+        """
+        Looks up the arXiv entries for many IDs, returning an `IdLookup` which
+        yields their `SearchResult`s and reports IDs without results.
+
+        IDs may be short IDs, `arXiv:` IDs, or abs/PDF URLs; they're normalized
+        and deduplicated, and invalid IDs are reported in `IdLookup.invalid`
+        rather than failing the lookup. Unversioned IDs resolve to the latest
+        version.
+
+        The IDs are requested in chunks of at most `chunk_size` IDs, short
+        enough to keep request URLs safe. Up to `concurrency` chunk requests
+        are in flight at once, all passing through the client's rate limiter
+        as one `Priority.Bulk` stream, so a large lookup doesn't hold up
+        interactive queries.
+
+        Args:
+            ids: The arXiv IDs to look up
+            ordered: Whether to yield results in input order; if `False`, each
+                chunk's results are yielded as soon as the chunk arrives
+            concurrency: Maximum number of chunk requests in flight
+            chunk_size: Maximum number of IDs per request
+
+        Returns:
+            An `IdLookup`; iterate it with `async for`
+        """
+        requested, invalid = dedup_ids(ids)
+        lookup = IdLookup(requested, invalid)
+        lookup._results = self._lookup_results(
+            lookup, ordered, max(concurrency, 1), min(max(chunk_size, 1), MAX_PAGE_SIZE)
+        )
+        return lookup
+
+    async def _lookup_results(
+        self, lookup: IdLookup, ordered: bool, concurrency: int, chunk_size: int
+    ) -> AsyncGenerator[SearchResult, None]:
+        """
+        Internal method fetching the chunks of an `IdLookup` concurrently.
+        """
+        if not self._session:
+            raise RuntimeError("Client session not initialized. Use async context manager.")
+
+        chunks = iter(chunk_ids(lookup.requested, chunk_size, MAX_ID_LIST_CHARS))
+        in_flight: Deque[Tuple[List[str], asyncio.Task]] = deque()
+        # A lookup is one bulk stream, however many chunks it's split into.
+        stream = "lookup {:x}".format(id(lookup))
+
+        def schedule():
+            while len(in_flight) < concurrency:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                url = self._format_url(SearchQuery(id_list=chunk), 0, len(chunk))
+                with request_tag(Priority.Bulk, stream=stream, fallback=True):
+                    task = asyncio.ensure_future(self._fetch_page(url))
+                in_flight.append((chunk, task))
+
+        try:
+            schedule()
+            while in_flight:
+                if ordered:
+                    chunk, task = in_flight.popleft()
+                else:
+                    done, _ = await asyncio.wait(
+                        [t for _, t in in_flight], return_when=asyncio.FIRST_COMPLETED
+                    )
+                    chunk, task = next(item for item in in_flight if item[1] in done)
+                    in_flight.remove((chunk, task))
+                page = await task
+                schedule()
+
+                found = match_ids(chunk, cast(List[SearchResult], page.results))
+                for arxiv_id in chunk:
+                    if arxiv_id in found:
+                        yield found[arxiv_id]
+                    else:
+                        lookup.missing.append(arxiv_id)
+        finally:
+            self._cancel_prefetched(in_flight)
+
+    async def download_pdf(
+        self, result: Union[SearchResult, RSSResult], dirpath: str = "./", filename: str = ""
+    ) -> str:
+        """
+        Downloads the PDF for `result` through this client's pooled session and
+        download rate limiter, reusing open connections to arXiv. See
+        `BaseResult.download_pdf`.
+
+        Returns:
+            The path of the downloaded file
+        """
+        if not self._session:
+            raise RuntimeError("Client session not initialized. Use async context manager.")
+        path = os.path.join(dirpath, filename or result._get_default_filename())
+        downloaded = await fetch_to_file(
+            self._session, result.pdf_url, path, self.rate_limiters, stats=self.stats
+        )
+        return downloaded.path
+
+    async def download_source(
+        self, result: Union[SearchResult, RSSResult], dirpath: str = "./", filename: str = ""
+    ) -> str:
+        """
+        Downloads the source tarfile for `result` through this client's pooled
+        session and download rate limiter. See `BaseResult.download_source`.
+
+        Returns:
+            The path of the downloaded file
+        """
+        if not self._session:
+            raise RuntimeError("Client session not initialized. Use async context manager.")
+        path = os.path.join(dirpath, filename or result._get_default_filename("tar.gz"))
+        downloaded = await fetch_to_file(
+            self._session, result._get_source_url(), path, self.rate_limiters, stats=self.stats
+        )
+        return downloaded.path
+
+    async def download_many(
+        self,
+        results: Iterable[Union[SearchResult, RSSResult]],
+        kind: str = "pdf",
+        dest: str = "./",
+        concurrency: int = 4,
+        overwrite: bool = False,
+        checksums: Optional[Mapping[str, str]] = None,
+    ) -> List[DownloadResult]:
+        """
+        Downloads the PDFs or source tarfiles of many results into `dest`,
+        through this client's pooled session and download rate limiter.
+
+        Each file is streamed to a `.part` file and renamed into place once
+        complete and verified, so an interrupted batch never leaves truncated
+        files behind; running it again resumes partial files with HTTP `Range`
+        requests and skips files which already exist. A failed file doesn't
+        stop the batch: check each `DownloadResult`.
+
+        Args:
+            results: The results whose files to download
+            kind: `"pdf"` or `"source"`
+            dest: The directory to save files in, with the default filenames
+            concurrency: Maximum number of downloads in flight
+            overwrite: Whether to download files which already exist
+            checksums: Expected hex SHA-256 digests, keyed by short ID
+
+        Returns:
+            One `DownloadResult` per result, in input order
+        """
+        if not self._session:
+            raise RuntimeError("Client session not initialized. Use async context manager.")
+        return await download_many(
+            self._session,
+            results,
+            kind=kind,
+            dest=dest,
+            concurrency=concurrency,
+            overwrite=overwrite,
+            checksums=checksums,
+            rate_limiters=self.rate_limiters,
+            stats=self.stats,
+        )
+
+    async def harvest(
+        self, query: SearchQuery, store: CheckpointStore, key: Optional[str] = None
+    ) -> AsyncGenerator[SearchResult, None]:
+        """
+        Fetches results for a Search API query like `results`, saving a
+        `Checkpoint` to `store` after each page so that a harvest which is
+        interrupted (e.g. by a crash or a restart) resumes where it stopped
+        instead of starting over.
+
+        A page's checkpoint is saved once all of its results have been yielded,
+        i.e. when the next result is requested. If the generator is closed or
+        fails mid-page, the results already yielded from that page are
+        recorded too, so nothing is yielded twice. Only a hard crash mid-page
+        can repeat that page's results when the harvest resumes.
+
+        Harvests don't use prefetching or streaming.
+
+        Args:
+            query: The query; its `max_results` applies across runs
+            store: Where checkpoints are saved
+            key: The harvest's name in `store`; defaults to the query's
+                fingerprint. A checkpoint saved by a different query is
+                ignored.
+
+        Yields:
+            The query's results not yielded by a previous run
+        """
+        fingerprint = query_fingerprint(query)
+        key = key or fingerprint
+        checkpoint = load_checkpoint(store, key, fingerprint)
+        harvest = self._harvest([query], query.max_results, checkpoint, store, key)
+        try:
+            async for result in harvest:
                 yield result
+        finally:
+            await harvest.aclose()
+
+    async def _harvest(
+        self,
+        queries: List[SearchQuery],
+        limit: Optional[int],
+        checkpoint: Checkpoint,
+        store: CheckpointStore,
+        key: str,
+    ) -> AsyncGenerator[SearchResult, None]:
+        """
+        Internal method paginating through `queries` ("shards") in order from
+        `checkpoint`, committing it to `store` after each page.
+        """
+        if not self._session:
+            raise RuntimeError("Client session not initialized. Use async context manager.")
+
+        # Unversioned IDs yielded from the current page, which isn't committed yet.
+        pending: List[str] = []
+        try:
+            while not checkpoint.done:
+                if limit is not None and checkpoint.yielded >= limit:
+                    return
+                if checkpoint.shard >= len(queries):
+                    checkpoint.done = True
+                    store.save(key, checkpoint)
+                    return
+
+                url = self._format_url(queries[checkpoint.shard], checkpoint.offset, self.page_size)
+                page = await self._fetch_page(url, first_page=(checkpoint.offset == 0))
+
+                # Results can shift between pages as papers are added, and a
+                # resumed page may already have been partly yielded.
+                skip = set(checkpoint.last_ids)
+                page_ids = []
+                for result in cast(List[SearchResult], page.results):
+                    arxiv_id = strip_arxiv_id_version(result.get_short_id())
+                    page_ids.append(arxiv_id)
+                    if arxiv_id in skip:
+                        continue
+                    if limit is not None and checkpoint.yielded + len(pending) >= limit:
+                        return
+                    pending.append(arxiv_id)
+                    yield result
+
+                checkpoint.yielded += len(pending)
+                pending = []
+                # A feed without a usable total is treated as the shard's last page.
+                total_results = page.total_results
+                if total_results is None:
+                    total_results = checkpoint.offset + page.num_entries
+                checkpoint.offset += page.num_entries
+                checkpoint.total_results = total_results
+                # Keep skipping IDs of a partly yielded page which were pushed
+                # onto later pages, within a bounded window.
+                page_id_set = set(page_ids)
+                carried = [i for i in checkpoint.last_ids if i not in page_id_set]
+                checkpoint.last_ids = (carried + page_ids)[-2 * self.page_size :]
+                if not page.num_entries or checkpoint.offset >= total_results:
+                    checkpoint.shard += 1
+                    checkpoint.offset = 0
+                    checkpoint.total_results = None
+                store.save(key, checkpoint)
+        finally:
+            if pending:
+                checkpoint.yielded += len(pending)
+                checkpoint.last_ids = checkpoint.last_ids + pending
+                store.save(key, checkpoint)
+
+    async def sync(
+        self,
+        query: SearchQuery,
+        since: Optional[datetime] = None,
+        store: Optional[CheckpointStore] = None,
+        key: Optional[str] = None,
+    ) -> SyncResult:
+        """
+        Fetches the results of `query` updated since a watermark, e.g. to keep
+        a mirror of a category fresh.
+
+        Results are requested most recently updated first
+        (`SortCriterion.LastUpdatedDate`, descending), and pagination stops at
+        the first result updated before the watermark, so a frequent sync
+        costs a page or two however many results the query has. The returned
+        `SyncResult.watermark` is the `since` of the next sync.
+
+        With a `store`, the watermark is saved to a `Checkpoint` after a
+        complete sync and used when `since` isn't given. Results updated at
+        exactly the saved watermark were synced last time, and are skipped.
+        Results whose updated date couldn't be parsed are logged and skipped.
+
+        Args:
+            query: The query to sync; its sort order is ignored, and its
+                `max_results` caps the results fetched
+            since: Fetch results updated at or after this time (naive times are
+                UTC); defaults to the watermark saved in `store`, or all results
+            store: Where the watermark is saved, if it should persist
+            key: The sync's name in `store`; defaults to the query's fingerprint
+
+        Returns:
+            The results updated since the watermark, and the new watermark
+        """
+        if not self._session:
+            raise RuntimeError("Client session not initialized. Use async context manager.")
+
+        sync_query = SearchQuery(
+            query=query.query,
+            id_list=query.id_list,
+            sort_by=SortCriterion.LastUpdatedDate,
+            sort_order=SortOrder.Descending,
+        )
+        fingerprint = query_fingerprint(sync_query, "sync")
+        key = key or fingerprint
+        if store is not None:
+            checkpoint = load_checkpoint(store, key, fingerprint)
+        else:
+            checkpoint = Checkpoint(fingerprint)
+        if since is None:
+            since = checkpoint.watermark
+        elif since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # Versioned IDs already synced at exactly the watermark.
+        seen = set(checkpoint.watermark_ids) if since == checkpoint.watermark else set()
+
+        limit = query.max_results
+        results: List[SearchResult] = []
+        pages = 0
+        offset = 0
+        complete = truncated = False
+        while not (complete or truncated):
+            url = self._format_url(sync_query, offset, self.page_size)
+            page = await self._fetch_page(url, first_page=(offset == 0))
+            pages += 1
+            for result in cast(List[SearchResult], page.results):
+                if result.updated == _DEFAULT_TIME:
+                    # An unparseable date can't be compared with the watermark.
+                    logger.warning("Skipping result without an updated date: %s", result)
+                    continue
+                if since is not None and result.updated < since:
+                    complete = True
+                    break
+                if result.get_short_id() in seen:
+                    continue
+                if limit is not None and len(results) >= limit:
+                    truncated = True
+                    break
+                results.append(result)
+            offset += page.num_entries
+            # A feed without a usable total is treated as the last page.
+            total_results = page.total_results
+            if not page.num_entries or total_results is None or offset >= total_results:
+                complete = not truncated
+        logger.info("Synced %d results in %d pages since %s", len(results), pages, since)
+
+        watermark = since
+        if complete and results:
+            newest = max(result.updated for result in results)
+            at_newest = [r.get_short_id() for r in results if r.updated == newest]
+            if newest == since:
+                at_newest = sorted(seen.union(at_newest))
+            watermark = newest
+            checkpoint.watermark_ids = at_newest
+        if store is not None and complete:
+            checkpoint.watermark = watermark
+            store.save(key, checkpoint)
+        return SyncResult(results, watermark, pages, complete)
+
+    async def watch(
+        self,
+        query: RSSQuery,
+        interval: float = 600.0,
+        store: Optional[CheckpointStore] = None,
+        key: Optional[str] = None,
+        retention: float = 4 * 24 * 3600,
+        poller: Optional[AnnouncementPoller] = None,
+    ) -> AsyncGenerator[RSSResult, None]:
+        """
+        Polls an RSS feed every `interval` seconds, yielding each entry the
+        first time it appears; runs until the caller stops iterating.
+
+        Polls are conditional requests (`If-None-Match`/`If-Modified-Since`),
+        and a feed which is unchanged, by a 304 response or by its content, is
+        not parsed again. Between arXiv's daily announcements, a poll costs a
+        request and nothing more.
+
+        Entries are deduplicated by their versioned short ID and
+        `RSSResult.announce_type`, across polls and, with a `store`, across
+        runs: the keys yielded are saved to a `Checkpoint`. A key is forgotten
+        once it's been out of the feed for `retention` seconds, so a paper
+        replaced again later is announced again.
+
+        With a `poller`, polls follow arXiv's announcement calendar instead of
+        a fixed `interval`: dense around each expected feed update, sparse
+        (backing off) after it, and not at all in between.
+
+        Args:
+            query: The feed to watch; its `id_list` filters entries, and its
+                `max_results` is ignored
+            interval: Seconds between polls
+            store: Where the seen entries are saved, if they should persist
+            key: The watch's name in `store`; defaults to the query's fingerprint
+            retention: Seconds an entry is remembered after leaving the feed
+            poller: Schedules polls around arXiv's announcements; overrides
+                `interval`
+
+        Yields:
+            The feed's entries not yielded before, in feed order
+        """
+        if not self._session:
+            raise RuntimeError("Client session not initialized. Use async context manager.")
+
+        url = self._format_url(query, 0, MAX_PAGE_SIZE)
+        fingerprint = query_fingerprint(query, "watch")
+        key = key or fingerprint
+        if store is not None:
+            checkpoint = load_checkpoint(store, key, fingerprint)
+        else:
+            checkpoint = Checkpoint(fingerprint)
+        # The feed's validators and the digest of its last parsed content.
+        state: Dict[str, str] = {}
+
+        # Keys yielded from the current poll, which aren't saved yet.
+        pending: Set[str] = set()
+        try:
+            while True:
+                with request_tag(Priority.Bulk, stream=key, fallback=True):
+                    feed = await self._poll_feed(url, state)
+                updated = None
+                if feed is not None:
+                    now = time.time()
+                    in_feed = set()
+                    for result in cast(List[RSSResult], feed.results):
+                        if result.feed_date != _DEFAULT_TIME:
+                            feed_date = result.feed_date.timestamp()
+                            updated = feed_date if updated is None else max(updated, feed_date)
+                        short_id = result.get_short_id()
+                        if query.id_list and strip_arxiv_id_version(short_id) not in query.id_list:
+                            continue
+                        announce_type = result.announce_type.value if result.announce_type else ""
+                        seen_key = "{} {}".format(short_id, announce_type)
+                        in_feed.add(seen_key)
+                        if seen_key in checkpoint.seen or seen_key in pending:
+                            continue
+                        pending.add(seen_key)
+                        yield result
+
+                    for seen_key in in_feed:
+                        checkpoint.seen[seen_key] = now
+                    checkpoint.seen = {
+                        k: last_seen
+                        for k, last_seen in checkpoint.seen.items()
+                        if now - last_seen <= retention
+                    }
+                    pending = set()
+                    if store is not None:
+                        store.save(key, checkpoint)
+                await asyncio.sleep(
+                    poller.delay(feed is not None, updated) if poller is not None else interval
+                )
+        finally:
+            if pending:
+                now = time.time()
+                checkpoint.seen.update((seen_key, now) for seen_key in pending)
+                if store is not None:
+                    store.save(key, checkpoint)
+
+    async def oai_records(
+        self,
+        query: OAIQuery,
+        store: Optional[CheckpointStore] = None,
+        key: Optional[str] = None,
+        include_deleted: bool = False,
+    ) -> AsyncGenerator[OAIResult, None]:
+        """
+        Harvests arXiv's metadata over OAI-PMH, following `ListRecords`
+        resumption tokens page by page. This is arXiv's recommended route for
+        bulk metadata, e.g. syncing whole categories: each page holds many
+        more records than a Search API page, and the harvest doesn't degrade
+        with depth.
+
+        Each page is parsed as it downloads, and its records are yielded once
+        it's complete. Requests pass through the rate limiter for the OAI-PMH
+        host, tagged `Priority.Bulk`, and are retried as directed by
+        `Client.retry_policy`, which honors the repository's `Retry-After`
+        flow control.
+
+        With a `store`, the harvest is resumable like `Client.harvest`: the
+        next page's resumption token is saved to a `Checkpoint` after each
+        page. arXiv's resumption tokens expire after a while, so resume soon
+        or delete the checkpoint and narrow `OAIQuery.from_date` instead.
+
+        Args:
+            query: The records to harvest; its `max_results` applies across runs
+            store: Where checkpoints are saved, if the harvest should be resumable
+            key: The harvest's name in `store`; defaults to the query's
+                fingerprint
+            include_deleted: Whether to yield records of withdrawn papers,
+                which have `OAIResult.deleted` set and no metadata
+
+        Yields:
+            The harvested records not yielded by a previous run
+
+        Raises:
+            OAIError: If the repository rejects the request, e.g. an unknown
+                set or an expired resumption token
+        """
+        if not self._session:
+            raise RuntimeError("Client session not initialized. Use async context manager.")
+
+        fingerprint = query_fingerprint(query)
+        key = key or fingerprint
+        if store is not None:
+            checkpoint = load_checkpoint(store, key, fingerprint)
+        else:
+            checkpoint = Checkpoint(fingerprint)
+        limit = query.max_results
+
+        # Unversioned IDs yielded from the current page, which isn't committed yet.
+        pending: List[str] = []
+        try:
+            while not checkpoint.done:
+                if limit is not None and checkpoint.yielded >= limit:
+                    return
+                url = self._format_oai_url(query, checkpoint.resumption_token)
+                with request_tag(Priority.Bulk, stream=key, fallback=True):
+                    page = await self._fetch_oai_page(url)
+                logger.info(
+                    "Harvested %d OAI-PMH records (cursor %s of %s)",
+                    len(page.results),
+                    page.cursor,
+                    page.complete_list_size,
+                )
+
+                # A resumed page may already have been partly yielded.
+                skip = set(checkpoint.last_ids)
+                for result in page.results:
+                    arxiv_id = strip_arxiv_id_version(result.get_short_id())
+                    if arxiv_id in skip or (result.deleted and not include_deleted):
+                        continue
+                    if limit is not None and checkpoint.yielded + len(pending) >= limit:
+                        return
+                    pending.append(arxiv_id)
+                    yield result
+
+                checkpoint.yielded += len(pending)
+                pending = []
+                checkpoint.last_ids = []
+                checkpoint.resumption_token = page.resumption_token
+                checkpoint.done = page.resumption_token is None
+                if store is not None:
+                    store.save(key, checkpoint)
+        finally:
+            if pending:
+                checkpoint.yielded += len(pending)
+                checkpoint.last_ids = checkpoint.last_ids + pending
+                if store is not None:
+                    store.save(key, checkpoint)
 
     async def _rss_results(
         self, query: RSSQuery, offset: int, limit: Optional[int]
@@ -158,76 +938,158 @@ class Client(object):
             raise RuntimeError("Client session not initialized. Use async context manager.")
 
         url = self._format_url(query, 0, MAX_PAGE_SIZE)
-        feed = await self._parse_feed(url, first_page=True)
+        page = await self._fetch_page(url, first_page=True)
 
-        if not feed.entries:
+        if not page.num_entries:
             logger.info("Got empty RSS feed; stopping generation")
             return
 
         yielded_count = 0
         skipped_count = 0
 
-        for entry in feed.entries:
-            try:
-                result = RSSResult._from_feed_entry(entry)
-
-                # Skip if entry's ID isn't in the id_list (when id_list is specified)
-                if (
-                    query.id_list
-                    and strip_arxiv_id_version(result.get_short_id()) not in query.id_list
-                ):
-                    continue  # Stripping version number for consistency with Search API
-
-                # Handle offset
-                if skipped_count < offset:
-                    skipped_count += 1
-                    continue
+        for result in cast(List[RSSResult], page.results):
+            # Skip if entry's ID isn't in the id_list (when id_list is specified)
+            if query.id_list and strip_arxiv_id_version(result.get_short_id()) not in query.id_list:
+                continue  # Stripping version number for consistency with Search API
 
-                # Handle limit
-                if limit is not None and yielded_count >= limit:
-                    return
+            # Handle offset
+            if skipped_count < offset:
+                skipped_count += 1
+                continue
 
-                yielded_count += 1
-                yield result
+            # Handle limit
+            if limit is not None and yielded_count >= limit:
+                return
 
-            except RSSResult.MissingFieldError as e:
-                logger.warning("Skipping partial RSS result: %s", e)
+            yielded_count += 1
+            yield result
 
     async def _search_results(
         self, query: SearchQuery, offset: int, limit: Optional[int]
     ) -> AsyncGenerator[SearchResult, None]:
         """
         Internal method to handle Search API results with server-side pagination.
+
+        When `Client.prefetch_pages` is positive, up to that many subsequent
+        pages are requested in the background while the current page is being
+        yielded. Outstanding prefetches are cancelled when the generator is
+        closed.
         """
         if not self._session:
             raise RuntimeError("Client session not initialized. Use async context manager.")
 
         current_offset = offset
         remaining = limit
+        # Background page fetches, keyed by the page's start offset.
+        prefetched: Deque[Tuple[int, asyncio.Task]] = deque()
 
-        while True:
-            page_url = self._format_url(query, current_offset, self.page_size)
-            feed = await self._parse_feed(page_url, first_page=(current_offset == offset))
+        try:
+            while True:
+                if prefetched and prefetched[0][0] == current_offset:
+                    _, task = prefetched.popleft()
+                    page = await task
+                else:
+                    # Prefetched pages no longer line up with the current
+                    # offset (e.g. the API returned a short page).
+                    self._cancel_prefetched(prefetched)
+                    page_url = self._format_url(query, current_offset, self.page_size)
+                    page = await self._fetch_page(page_url, first_page=(current_offset == offset))
 
-            if not feed.entries:
-                return
+                if not page.num_entries:
+                    return
 
-            total_results = int(feed.feed.opensearch_totalresults)
+                # A feed without a usable total is treated as the last page.
+                total_results = page.total_results
+                if total_results is None:
+                    total_results = current_offset + page.num_entries
+                next_offset = current_offset + page.num_entries
+                end = total_results
+                if remaining is not None:
+                    end = min(end, current_offset + remaining)
+                self._schedule_prefetch(query, prefetched, next_offset, end)
 
-            for entry in feed.entries:
-                try:
-                    yield SearchResult._from_feed_entry(entry)
+                for result in cast(List[SearchResult], page.results):
+                    yield result
                     if remaining is not None:
                         remaining -= 1
                         if remaining <= 0:
                             return
-                except SearchResult.MissingFieldError as e:
-                    logger.warning("Skipping partial search result: %s", e)
 
-            current_offset += len(feed.entries)
-            if current_offset >= total_results:
+                current_offset = next_offset
+                if current_offset >= total_results:
+                    break
+        finally:
+            self._cancel_prefetched(prefetched)
+
+    async def _stream_search_results(
+        self, query: SearchQuery, offset: int, limit: Optional[int]
+    ) -> AsyncGenerator[SearchResult, None]:
+        """
+        Internal method to handle Search API results in `Client.streaming`
+        mode, paginating like `_search_results` but yielding each page's
+        results as they're parsed.
+        """
+        if not self._session:
+            raise RuntimeError("Client session not initialized. Use async context manager.")
+
+        current_offset = offset
+        remaining = limit
+        while True:
+            page = StreamedPage()
+            page_url = self._format_url(query, current_offset, self.page_size)
+            results = self._stream_page(page_url, page, first_page=(current_offset == offset))
+            try:
+                async for result in results:
+                    yield result
+                    if remaining is not None:
+                        remaining -= 1
+                        if remaining <= 0:
+                            return
+            finally:
+                # Closing the page stream releases its connection immediately.
+                await results.aclose()
+
+            if not page.num_entries:
+                return
+            current_offset += page.num_entries
+            if page.total_results is None or current_offset >= page.total_results:
                 break
 
+    def _schedule_prefetch(
+        self,
+        query: SearchQuery,
+        prefetched: Deque[Tuple[int, asyncio.Task]],
+        next_offset: int,
+        end: int,
+    ):
+        """
+        Tops up `prefetched` with background fetches for the pages following
+        `next_offset`, up to `Client.prefetch_pages` pages and never at or past
+        `end`.
+        """
+        start = prefetched[-1][0] + self.page_size if prefetched else next_offset
+        while len(prefetched) < self.prefetch_pages and start < end:
+            page_url = self._format_url(query, start, self.page_size)
+            logger.debug("Prefetching page: %s", page_url)
+            task = asyncio.ensure_future(self._fetch_page(page_url, first_page=False))
+            prefetched.append((start, task))
+            start += self.page_size
+
+    @staticmethod
+    def _cancel_prefetched(prefetched: Deque[Tuple[object, asyncio.Task]]):
+        """
+        Cancels and discards every outstanding prefetch in `prefetched`.
+        """
+        while prefetched:
+            _, task = prefetched.popleft()
+            if task.done():
+                # Retrieve the outcome so failed prefetches aren't reported as
+                # unhandled exceptions.
+                if not task.cancelled():
+                    task.exception()
+            else:
+                task.cancel()
+
     def _format_url(self, query: Union[RSSQuery, SearchQuery], start: int, page_size: int) -> str:
         """
         Construct a request URL for the query.
@@ -247,48 +1109,455 @@ class Client(object):
         )
         return URL(self.query_url_format).with_query(url_args)
 
+    def _format_oai_url(self, query: OAIQuery, resumption_token: Optional[str]) -> str:
+        """
+        Construct an OAI-PMH `ListRecords` request URL: the query's selective
+        harvesting parameters for the first page, the resumption token alone
+        for later pages.
+        """
+        if resumption_token is None:
+            return URL(self.oai_url).with_query(query._url_args())
+        return URL(self.oai_url).with_query(
+            {"verb": "ListRecords", "resumptionToken": resumption_token}
+        )
+
+    async def _fetch_page(self, url: str, first_page: bool = True) -> CachedPage:
+        """
+        Fetches the feed page at `url` and builds its results, consulting and
+        filling `Client.page_cache` when one is configured.
+
+        Entries missing required fields are logged and skipped.
+        """
+        if self.page_cache is not None:
+            page = self.page_cache.get(url)
+            if page is not None:
+                logger.debug("Serving parsed page from page cache: %s", url)
+                return page
+
+        feed = await self._parse_feed(url, first_page=first_page)
+        page = CachedPage(feed.results, feed.num_entries, feed.total_results)
+        if self.page_cache is not None and page.num_entries:
+            self.page_cache.put(url, page)
+        return page
+
     async def _parse_feed(
         self, url: str, first_page: bool = True, _try_index: int = 0
-    ) -> feedparser.FeedParserDict:
+    ) -> ParsedFeed:
         """
-        Fetches and parses the feed from the specified URL.
-        Implements retry logic for failed requests.
+        Fetches the feed from the specified URL and parses it with
+        `Client.parser`.
+        Retries failed requests as directed by `Client.retry_policy`.
+
+        With `Client.coalesce_requests`, concurrent calls for the same
+        canonical URL share one request and its parsed feed.
         """
+        if not self.coalesce_requests:
+            return await self.__parse_feed_with_retries(url, first_page, _try_index)
+
+        key = (canonical_url(url), first_page)
+        while key in self._in_flight:
+            flight = self._in_flight[key]
+            self.stats.coalesced_requests += 1
+            logger.debug("Joining in-flight request: %s", url)
+            try:
+                # Shielded so that a cancelled follower doesn't cancel the request.
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+                # The caller making the request was cancelled; take over.
+
+        flight = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = flight
         try:
-            return await self.__try_parse_feed(url, first_page=first_page, try_index=_try_index)
-        except (HTTPError, UnexpectedEmptyPageError, aiohttp.ClientError) as err:
-            if _try_index < self.num_retries:
-                logger.debug("Got error (try %d): %s", _try_index, err)
-                return await self._parse_feed(url, first_page=first_page, _try_index=_try_index + 1)
-            logger.debug("Giving up (try %d): %s", _try_index, err)
+            feed = await self.__parse_feed_with_retries(url, first_page, _try_index)
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as err:
+            flight.set_exception(err)
+            # Followers re-raise it; don't warn that nobody retrieved it.
+            flight.exception()
+            raise
+        else:
+            flight.set_result(feed)
+            return feed
+        finally:
+            del self._in_flight[key]
+
+    async def __parse_feed_with_retries(
+        self, url: str, first_page: bool, _try_index: int
+    ) -> ParsedFeed:
+        """
+        Fetches and parses a feed, retrying failed requests.
+        """
+        return await _single(
+            self._with_retries(
+                url,
+                lambda try_index: self.__try_parse_feed(url, first_page, try_index),
+                try_index=_try_index,
+            )
+        )
+
+    async def _poll_feed(self, url: str, state: Dict[str, str]) -> Optional[ParsedFeed]:
+        """
+        Fetches and parses a feed for `Client.watch`, retrying failed requests.
+        Returns `None` if the feed hasn't changed since the poll that last
+        updated `state`.
+        """
+        return await _single(
+            self._with_retries(url, lambda try_index: self.__try_poll_feed(url, state, try_index))
+        )
+
+    async def _stream_page(
+        self, url: str, page: StreamedPage, first_page: bool = True
+    ) -> AsyncGenerator[SearchResult, None]:
+        """
+        Fetches the Search API page at `url`, yielding results as their entries
+        are parsed from the response body and recording the page's entry count
+        and total results in `page`.
+
+        Retries failed requests, including bodies which aren't well-formed
+        XML (e.g. truncated), as directed by `Client.retry_policy`. A retry
+        skips entries already yielded by earlier tries. If the body still
+        doesn't parse, the page is fetched whole and parsed by `Client.parser`
+        instead.
+        """
+
+        async def attempt(try_index: int) -> AsyncGenerator[SearchResult, None]:
+            parser = AtomStreamParser()
+            index = 0
+            async for entry in self.__try_stream_feed(url, parser, first_page, try_index):
+                index += 1
+                page.total_results = parser.total_results
+                if index <= page.num_entries:
+                    continue  # Already yielded by an earlier try.
+                page.num_entries = index
+                try:
+                    result = entry_to_result(entry)
+                except SearchResult.MissingFieldError as e:
+                    logger.warning("Skipping partial SearchResult: %s", e)
+                    continue
+                yield result
+            page.total_results = parser.total_results
+            if index == 0 and not first_page:
+                raise UnexpectedEmptyPageError(url, try_index, feedparser.FeedParserDict())
+
+        results = self._with_retries(
+            url, attempt, retry_on=_RETRIABLE_ERRORS + (ElementTree.ParseError,)
+        )
+        yielded = set()
+        try:
+            async for result in results:
+                yielded.add(result.entry_id)
+                yield result
+        except ElementTree.ParseError as e:
+            logger.warning("Malformed streamed page; fetching it whole: %s", e)
+            fetched = await self._fetch_page(url, first_page=first_page)
+            page.num_entries = fetched.num_entries
+            page.total_results = fetched.total_results
+            for result in cast(List[SearchResult], fetched.results):
+                if result.entry_id not in yielded:
+                    yield result
+        finally:
+            await results.aclose()
+
+    async def _fetch_oai_page(self, url: str) -> OAIPage:
+        """
+        Fetches and parses an OAI-PMH `ListRecords` page, retrying failed
+        requests as directed by `Client.retry_policy`. A `noRecordsMatch`
+        response is an empty last page.
+        """
+        return await _single(
+            self._with_retries(
+                url,
+                lambda try_index: self.__try_fetch_oai_page(url, try_index),
+                retry_on=_RETRIABLE_ERRORS + (ElementTree.ParseError,),
+            )
+        )
+
+    async def _with_retries(
+        self,
+        url: str,
+        attempt: Callable[[int], Union[Awaitable[T], AsyncIterator[T]]],
+        retry_on: Tuple[Type[BaseException], ...] = _RETRIABLE_ERRORS,
+        try_index: int = 0,
+    ) -> AsyncGenerator[T, None]:
+        """
+        Runs `attempt(try_index)` until a try succeeds, retrying the errors in
+        `retry_on` as directed by `Client.retry_policy` and recording each try
+        in `Client.stats`.
+
+        `attempt` returns either an awaitable, whose result is yielded, or an
+        async iterator, whose items are yielded as they arrive. Items from a
+        try which later fails have already been yielded; such attempts must
+        skip them on the next try.
+        """
+        started = time.monotonic()
+        attempts: List[AttemptStats] = []
+        backoff = 0.0
+        while True:
+            try_started = time.monotonic()
+            outcome = attempt(try_index)
+            try:
+                if inspect.isawaitable(outcome):
+                    result = await outcome
+                    self.__record_success(url, try_index, backoff, try_started)
+                    yield result
+                    return
+                try:
+                    async for item in outcome:
+                        yield item
+                finally:
+                    await cast(AsyncGenerator[T, None], outcome).aclose()
+            except retry_on as err:
+                backoff = await self.__backoff_or_raise(
+                    url, err, attempts, try_index, backoff, try_started, started
+                )
+                try_index += 1
+                continue
+
+            self.__record_success(url, try_index, backoff, try_started)
+            return
+
+    async def __backoff_or_raise(
+        self,
+        url: str,
+        err: Exception,
+        attempts: List[AttemptStats],
+        try_index: int,
+        backoff: float,
+        try_started: float,
+        started: float,
+    ) -> float:
+        """
+        Records a failed try and waits out the retry policy's backoff before
+        the next one, returning the backoff. Raises `err` if the policy gives
+        up.
+        """
+        attempts.append(
+            self.stats._record_attempt(
+                AttemptStats(
+                    url=str(url),
+                    try_index=try_index,
+                    backoff=backoff,
+                    elapsed=time.monotonic() - try_started,
+                    status=getattr(err, "status", None),
+                    error=str(err),
+                )
+            )
+        )
+        delay = self.retry_policy.delay(err, try_index + 1, time.monotonic() - started)
+        if delay is None:
+            logger.debug("Giving up (try %d): %s", try_index, err)
+            self.stats.failures += 1
+            if isinstance(err, ArxivError):
+                err.attempts = attempts
             raise err
+        logger.debug("Got error (try %d); retrying in %f seconds: %s", try_index, delay, err)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def __record_success(self, url: str, try_index: int, backoff: float, try_started: float):
+        """
+        Records a successful try.
+        """
+        self.stats._record_attempt(
+            AttemptStats(
+                url=str(url),
+                try_index=try_index,
+                backoff=backoff,
+                elapsed=time.monotonic() - try_started,
+                status=200,
+            )
+        )
+
+    def __acquire(self, url: str, first_page: bool):
+        """
+        Returns the rate limiter context for a request to `url`, tagged for a
+        `FairScheduler`: first pages are interactive and later pages bulk, each
+        query being its own stream, unless the caller's `request_tag` says
+        otherwise.
+        """
+        priority = Priority.Interactive if first_page else Priority.Bulk
+        with request_tag(priority, stream=page_key(url)[0], fallback=True):
+            return self.rate_limiters.for_url(url).acquire()
+
+    async def __try_stream_feed(
+        self, url: str, parser: AtomStreamParser, first_page: bool, try_index: int
+    ) -> AsyncGenerator[ElementTree.Element, None]:
+        """
+        Helper method for _stream_page that feeds the response body to `parser`
+        as it arrives, yielding completed entries.
+        """
+        async with self.__acquire(url, first_page):
+            logger.info("Streaming page (try: %d): %s", try_index, url)
+
+            async with self._session.get(url, headers={"user-agent": "aioarxiv/1.1.3"}) as resp:
+                if resp.status != 200:
+                    raise HTTPError(
+                        url,
+                        try_index,
+                        resp.status,
+                        retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+                    )
+                async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    for entry in parser.feed(chunk):
+                        yield entry
+                for entry in parser.close():
+                    yield entry
+
+    async def __try_fetch_oai_page(self, url: str, try_index: int) -> OAIPage:
+        """
+        Helper method for _fetch_oai_page that parses the response body as it
+        arrives.
+        """
+        parser = OAIStreamParser()
+        async with self.__acquire(url, first_page=False):
+            logger.info("Requesting OAI-PMH page (try: %d): %s", try_index, url)
+
+            async with self._session.get(url, headers={"user-agent": "aioarxiv/1.1.3"}) as resp:
+                if resp.status != 200:
+                    raise HTTPError(
+                        url,
+                        try_index,
+                        resp.status,
+                        retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+                    )
+                async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    parser.feed(chunk)
+                page = parser.close()
+
+        if parser.error is not None:
+            code, message = parser.error
+            if code == "noRecordsMatch":
+                return OAIPage([])
+            raise OAIError(url, try_index, code, message)
+        return page
 
     async def __try_parse_feed(
         self,
         url: str,
         first_page: bool,
         try_index: int,
-    ) -> feedparser.FeedParserDict:
+    ) -> ParsedFeed:
         """
-        Helper method for _parse_feed that implements rate limiting.
+        Helper method for _parse_feed that implements caching and rate limiting.
         """
-        async with self.rate_limiter.acquire():
+        cached = self.http_cache.get(url) if self.http_cache is not None else None
+        if cached is not None and self.http_cache.is_fresh(url, cached):
+            logger.info("Serving cached page (first: %r): %s", first_page, url)
+            self.http_cache.hits += 1
+            return await self.__parse_content(url, cached.body, first_page, try_index)
+
+        headers = {"user-agent": "aioarxiv/1.1.3"}
+        if cached is not None:
+            headers.update(cached.validators())
+
+        async with self.__acquire(url, first_page):
             logger.info("Requesting page (first: %r, try: %d): %s", first_page, try_index, url)
 
-            async with self._session.get(url, headers={"user-agent": "aioarxiv/1.1.3"}) as resp:
-                if resp.status != 200:
-                    raise HTTPError(url, try_index, resp.status)
+            async with self._session.get(url, headers=headers) as resp:
+                if resp.status == 304 and cached is not None:
+                    logger.info("Cached page not modified: %s", url)
+                    self.http_cache.revalidations += 1
+                    content = cached.body
+                elif resp.status != 200:
+                    raise HTTPError(
+                        url,
+                        try_index,
+                        resp.status,
+                        retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+                    )
+                else:
+                    if self.http_cache is not None:
+                        self.http_cache.misses += 1
+                    content = await resp.content.read()
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
 
-                content = await resp.content.read()
-                feed = feedparser.parse(content)
+        # Parse after releasing the connection and the rate limiter.
+        feed = await self.__parse_content(url, content, first_page, try_index)
 
-                if len(feed.entries) == 0 and not first_page:
-                    raise UnexpectedEmptyPageError(url, try_index, feed)
+        if self.http_cache is not None:
+            self.http_cache.put(
+                url,
+                CachedResponse(
+                    content,
+                    etag=etag or (cached and cached.etag),
+                    last_modified=last_modified or (cached and cached.last_modified),
+                    stored_at=self.http_cache.clock(),
+                ),
+            )
+        return feed
+
+    async def __try_poll_feed(
+        self, url: str, state: Dict[str, str], try_index: int
+    ) -> Optional[ParsedFeed]:
+        """
+        Helper method for _poll_feed that makes a conditional request and only
+        parses content that differs from the last parsed.
+        """
+        headers = {"user-agent": "aioarxiv/1.1.3"}
+        headers.update(
+            CachedResponse(b"", state.get("etag"), state.get("last_modified")).validators()
+        )
+        async with self.__acquire(url, first_page=True):
+            logger.info("Polling feed (try: %d): %s", try_index, url)
 
-                if feed.bozo:
-                    logger.warning(
-                        "Bozo feed; consider handling: %s",
-                        feed.bozo_exception if "bozo_exception" in feed else None,
+            async with self._session.get(url, headers=headers) as resp:
+                if resp.status == 304:
+                    logger.info("Feed not modified: %s", url)
+                    return None
+                if resp.status != 200:
+                    raise HTTPError(
+                        url,
+                        try_index,
+                        resp.status,
+                        retry_after=parse_retry_after(resp.headers.get("Retry-After")),
                     )
+                content = await resp.content.read()
+                for name, header in (("etag", "ETag"), ("last_modified", "Last-Modified")):
+                    if resp.headers.get(header):
+                        state[name] = resp.headers[header]
+
+        # Servers don't always honor validators; skip parsing an unchanged body too.
+        digest = hashlib.sha256(content).hexdigest()
+        if state.get("digest") == digest:
+            logger.info("Feed unchanged: %s", url)
+            return None
+        feed = await self.__parse_content(url, content, True, try_index)
+        state["digest"] = digest
+        return feed
 
-                return feed
+    async def __parse_content(
+        self, url: str, content: bytes, first_page: bool, try_index: int
+    ) -> ParsedFeed:
+        """
+        Parses a fetched page, in `Client.parse_executor` if one is configured,
+        raising an `UnexpectedEmptyPageError` if a page other than the first is
+        empty.
+        """
+        if self.parse_executor is None:
+            feed = self.parser.parse(content)
+        else:
+            loop = asyncio.get_running_loop()
+            feed = await loop.run_in_executor(
+                self.parse_executor, parse_detached, self.parser, content
+            )
+            feed.content = content
+
+        if feed.num_entries == 0 and not first_page:
+            raise UnexpectedEmptyPageError(url, try_index, feed.raw)
+
+        return feed
+
+
+async def _single(results: AsyncGenerator[T, None]) -> T:
+    """
+    Runs `results`, a `Client._with_retries` generator over an awaitable
+    attempt, to completion and returns its one item.
+    """
+    items = [item async for item in results]
+    return items[0]
@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import re
+import time
+from concurrent.futures import Executor
+from contextlib import AsyncExitStack
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, List, Mapping, Optional, Tuple
+
+import aiohttp
+
+from aioarxiv.errors import ArxivError, DownloadError
+from aioarxiv.models.utilities import _classname
+from aioarxiv.rate_limiter import AsyncRateLimiter, RateLimiterRegistry
+
+if TYPE_CHECKING:
+    from aioarxiv.models import BaseResult
+    from aioarxiv.stats import ClientStats
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+"""Bytes read from a download response at a time."""
+
+PART_SUFFIX = ".part"
+"""Suffix of the temporary file a download is written to until it's complete."""
+
+MAX_PENDING_WRITES = 8
+"""Chunks a download may have queued for writing before it stops reading."""
+
+DEFAULT_RATE_LIMITERS = RateLimiterRegistry(default_factory=lambda: AsyncRateLimiter(period=3.0))
+"""
+The per-host limiters for downloads made without a `Client`'s, e.g. by
+`BaseResult.download_pdf`: one request every three seconds per host.
+"""
+
+_CONTENT_RANGE = re.compile(r"bytes (?:(\d+)-\d+|\*)/(\d+|\*)")
+
+
+class DownloadResult(object):
+    """
+    The outcome of downloading one file, e.g. one of `Client.download_many`'s.
+    """
+
+    url: str
+    """The downloaded URL."""
+    path: str
+    """Where the file was (or would have been) saved."""
+    status: str
+    """
+    `"downloaded"`, `"resumed"` (completed from a partial file), `"skipped"`
+    (the file already existed) or `"failed"`.
+    """
+    size: int
+    """Size of the saved file in bytes; 0 if the download failed."""
+    sha256: Optional[str]
+    """Hex SHA-256 digest of the file, if it was downloaded."""
+    error: Optional[Exception]
+    """Why the download failed, if it did."""
+    result: Optional[BaseResult]
+    """The result whose file was downloaded, if any."""
+
+    def __init__(
+        self,
+        url: str,
+        path: str,
+        status: str,
+        size: int = 0,
+        sha256: Optional[str] = None,
+        error: Optional[Exception] = None,
+        result: Optional[BaseResult] = None,
+    ):
+        self.url = url
+        self.path = path
+        self.status = status
+        self.size = size
+        self.sha256 = sha256
+        self.error = error
+        self.result = result
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file is in place."""
+        return self.status != "failed"
+
+    def __repr__(self) -> str:
+        return "{}({}, {}, status={}, size={}, error={})".format(
+            _classname(self),
+            repr(self.url),
+            repr(self.path),
+            repr(self.status),
+            repr(self.size),
+            repr(self.error),
+        )
+
+
+def _parse_content_range(header: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Parses a `Content-Range` header into the range's start and the full size,
+    either of which may be unknown.
+    """
+    match = _CONTENT_RANGE.fullmatch((header or "").strip())
+    if match is None:
+        return None, None
+    start, total = match.groups()
+    return (
+        int(start) if start is not None else None,
+        int(total) if total != "*" else None,
+    )
+
+
+def _hash_file(path: str, digest: "hashlib._Hash"):
+    """
+    Feeds the contents of the file at `path` to `digest`.
+    """
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(block)
+
+
+def _file_size(path: str) -> Optional[int]:
+    """
+    Returns the size of the file at `path`, or `None` if it doesn't exist.
+    """
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return None
+
+
+async def _run(executor: Optional[Executor], fn: Callable[..., Any], *args: Any, **kwargs: Any):
+    """
+    Runs a blocking filesystem call in `executor` (the event loop's default
+    thread pool if `None`).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+class _QueuedFileWriter(object):
+    """
+    Writes chunks to a file in an executor, off the event loop. Up to
+    `max_pending` chunks are queued while a write is in progress; beyond that,
+    `write` waits, so a slow disk slows the download instead of buffering it
+    in memory.
+    """
+
+    def __init__(
+        self,
+        file: IO[bytes],
+        executor: Optional[Executor],
+        stats: Optional[ClientStats],
+        max_pending: int = MAX_PENDING_WRITES,
+    ):
+        self._file = file
+        self._executor = executor
+        self._stats = stats
+        self._error: Optional[BaseException] = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._task = asyncio.ensure_future(self._drain())
+
+    async def _drain(self):
+        while True:
+            chunk = await self._queue.get()
+            if chunk is None:
+                return
+            if self._error is not None:
+                # Keep consuming so a blocked `write` can see the error.
+                continue
+            started = time.monotonic()
+            try:
+                await _run(self._executor, self._file.write, chunk)
+            except Exception as err:
+                self._error = err
+                continue
+            if self._stats is not None:
+                self._stats._record_write(len(chunk), time.monotonic() - started)
+
+    async def write(self, chunk: bytes):
+        """
+        Queues `chunk` for writing, raising any error from an earlier write.
+        """
+        if self._error is not None:
+            raise self._error
+        await self._queue.put(chunk)
+
+    async def close(self):
+        """
+        Waits for queued writes, then closes the file, raising any write error.
+        """
+        try:
+            await self._queue.put(None)
+            await self._task
+        finally:
+            await _run(self._executor, self._file.close)
+        if self._error is not None:
+            raise self._error
+
+    async def abort(self):
+        """
+        Drops queued writes and closes the file.
+        """
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        await _run(self._executor, self._file.close)
+
+
+async def fetch_to_file(
+    session: aiohttp.ClientSession,
+    url: str,
+    path: str,
+    rate_limiters: Optional[RateLimiterRegistry] = None,
+    sha256: Optional[str] = None,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    executor: Optional[Executor] = None,
+    stats: Optional[ClientStats] = None,
+) -> DownloadResult:
+    """
+    Streams `url` to `path` in chunks, without holding the file in memory.
+
+    The body is written to `path + ".part"`, which is renamed over `path` only
+    once it's complete, so `path` never holds a partial file. If a partial file
+    is left by an earlier, interrupted download, the rest is requested with an
+    HTTP `Range` header and appended; servers which ignore the range restart
+    the file.
+
+    The file's size is checked against the response's `Content-Length` or
+    `Content-Range`, and its SHA-256 digest against `sha256` if given.
+
+    Filesystem calls run in `executor` (the event loop's default thread pool
+    if `None`), with at most `MAX_PENDING_WRITES` chunks queued, so a slow disk
+    doesn't block the event loop. Writes are recorded in `stats` if given.
+
+    Raises:
+        DownloadError: If the file is incomplete or fails verification. A
+            truncated partial file is kept so the download can be resumed.
+    """
+    part_path = path + PART_SUFFIX
+    await _run(executor, os.makedirs, os.path.dirname(path) or ".", exist_ok=True)
+    offset = await _run(executor, _file_size, part_path) or 0
+    headers = {"Range": "bytes={}-".format(offset)} if offset else {}
+    digest = hashlib.sha256()
+    expected_size: Optional[int] = None
+    resumed = False
+
+    async with AsyncExitStack() as stack:
+        if rate_limiters is not None:
+            await stack.enter_async_context(rate_limiters.for_url(url).acquire())
+        response = await stack.enter_async_context(session.get(url, headers=headers))
+
+        if offset and response.status == 416:
+            # The partial file may hold the whole file already.
+            _, total = _parse_content_range(response.headers.get("Content-Range"))
+            if total != offset:
+                await _run(executor, os.remove, part_path)
+                raise DownloadError(url, path, "Partial file doesn't match the remote file")
+            await _run(executor, _hash_file, part_path, digest)
+            expected_size, resumed = total, True
+        else:
+            response.raise_for_status()
+            if offset and response.status == 206:
+                start, expected_size = _parse_content_range(response.headers.get("Content-Range"))
+                if start != offset:
+                    await _run(executor, os.remove, part_path)
+                    raise DownloadError(url, path, "Server returned an unexpected range")
+                await _run(executor, _hash_file, part_path, digest)
+                mode, resumed = "ab", True
+            else:
+                mode = "wb"
+                # Decompressed bodies don't match the encoded Content-Length.
+                if response.headers.get("Content-Encoding", "identity") == "identity":
+                    expected_size = response.content_length
+            writer = _QueuedFileWriter(await _run(executor, open, part_path, mode), executor, stats)
+            try:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    await writer.write(chunk)
+                    digest.update(chunk)
+            except BaseException:
+                await writer.abort()
+                raise
+            await writer.close()
+
+    size = await _run(executor, os.path.getsize, part_path)
+    if expected_size is not None and size != expected_size:
+        if size > expected_size:
+            await _run(executor, os.remove, part_path)
+        raise DownloadError(
+            url, path, "Expected {} bytes but received {}".format(expected_size, size)
+        )
+    checksum = digest.hexdigest()
+    if sha256 is not None and checksum != sha256.lower():
+        await _run(executor, os.remove, part_path)
+        raise DownloadError(url, path, "SHA-256 mismatch: got {}".format(checksum))
+
+    await _run(executor, os.replace, part_path, path)
+    return DownloadResult(
+        url, path, "resumed" if resumed else "downloaded", size=size, sha256=checksum
+    )
+
+
+async def download_many(
+    session: aiohttp.ClientSession,
+    results: Iterable[BaseResult],
+    kind: str = "pdf",
+    dest: str = "./",
+    concurrency: int = 4,
+    overwrite: bool = False,
+    checksums: Optional[Mapping[str, str]] = None,
+    rate_limiters: Optional[RateLimiterRegistry] = None,
+    executor: Optional[Executor] = None,
+    stats: Optional[ClientStats] = None,
+) -> List[DownloadResult]:
+    """
+    Downloads the PDF or source of each result into `dest` with
+    `fetch_to_file`, at most `concurrency` at a time. See
+    `Client.download_many`.
+    """
+    if kind not in ("pdf", "source"):
+        raise ValueError("kind must be 'pdf' or 'source', not {!r}".format(kind))
+    await _run(executor, os.makedirs, dest, exist_ok=True)
+    results = list(results)
+    outcomes: List[Optional[DownloadResult]] = [None] * len(results)
+    pending = iter(enumerate(results))
+
+    async def download(result: BaseResult) -> DownloadResult:
+        url = path = ""
+        try:
+            extension = "pdf" if kind == "pdf" else "tar.gz"
+            path = os.path.join(dest, result._get_default_filename(extension))
+            if result.pdf_url is None:
+                raise DownloadError(url, path, "{} has no PDF URL".format(result.entry_id))
+            url = result.pdf_url if kind == "pdf" else result._get_source_url()
+            existing = None if overwrite else await _run(executor, _file_size, path)
+            if existing is not None:
+                return DownloadResult(url, path, "skipped", size=existing)
+            expected = checksums.get(result.get_short_id()) if checksums else None
+            return await fetch_to_file(
+                session,
+                url,
+                path,
+                rate_limiters,
+                sha256=expected,
+                executor=executor,
+                stats=stats,
+            )
+        except (ArxivError, aiohttp.ClientError, asyncio.TimeoutError, OSError) as err:
+            logger.warning("Failed to download %s: %s", url or result, err)
+            return DownloadResult(url, path, "failed", error=err)
+
+    async def worker():
+        for index, result in pending:
+            outcome = await download(result)
+            outcome.result = result
+            outcomes[index] = outcome
+
+    await asyncio.gather(*(worker() for _ in range(max(min(concurrency, len(results)), 1))))
+    return outcomes
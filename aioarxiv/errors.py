@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import feedparser
+from typing import TYPE_CHECKING, List, Optional
 from aioarxiv.models.utilities import _classname
 
+if TYPE_CHECKING:
+    from aioarxiv.stats import AttemptStats
+
 
 class ArxivError(Exception):
     """This package's base Exception class."""
@@ -16,6 +20,11 @@ class ArxivError(Exception):
     """
     message: str
     """Message describing what caused this error."""
+    attempts: List[AttemptStats]
+    """
+    Timing and outcome of every try at the request, oldest first, if this error
+    was raised by `Client` after its retry policy gave up.
+    """
 
     def __init__(self, url: str, retry: int, message: str):
         """
@@ -24,6 +33,7 @@ class ArxivError(Exception):
         self.url = url
         self.retry = retry
         self.message = message
+        self.attempts = []
         super().__init__(self.message)
 
     def __str__(self) -> str:
@@ -70,14 +80,20 @@ class HTTPError(ArxivError):
 
     status: int
     """The HTTP status reported by feedparser."""
+    retry_after: Optional[float]
+    """
+    Seconds the server asked clients to wait before retrying, parsed from the
+    response's `Retry-After` header, if present.
+    """
 
-    def __init__(self, url: str, retry: int, status: int):
+    def __init__(self, url: str, retry: int, status: int, retry_after: Optional[float] = None):
         """
         Constructs an `HTTPError` for the specified status code, encountered for
         the specified API URL after `retry` tries.
         """
         self.url = url
         self.status = status
+        self.retry_after = retry_after
         super().__init__(
             url,
             retry,
@@ -88,3 +104,53 @@ class HTTPError(ArxivError):
         return "{}({}, {}, {})".format(
             _classname(self), repr(self.url), repr(self.retry), repr(self.status)
         )
+
+
+class DownloadError(ArxivError):
+    """
+    An error raised when a downloaded file can't be completed or fails
+    verification.
+
+    See `Client.download_many` for usage.
+    """
+
+    path: str
+    """The path the file was being downloaded to."""
+
+    def __init__(self, url: str, path: str, message: str):
+        """
+        Constructs a `DownloadError` for the download of `url` to `path`.
+        """
+        self.path = path
+        super().__init__(url, 0, message)
+
+    def __repr__(self) -> str:
+        return "{}({}, {}, {})".format(
+            _classname(self), repr(self.url), repr(self.path), repr(self.message)
+        )
+
+
+class OAIError(ArxivError):
+    """
+    An error reported by arXiv's OAI-PMH interface, e.g. an expired
+    resumption token (`badResumptionToken`) or an unknown set
+    (`badArgument`).
+
+    See `Client.oai_records` for usage.
+    """
+
+    code: str
+    """The OAI-PMH error code."""
+
+    def __init__(self, url: str, retry: int, code: str, message: str = ""):
+        """
+        Constructs an `OAIError` with the OAI-PMH error `code`, encountered for
+        the specified URL after `retry` tries.
+        """
+        self.code = code
+        super().__init__(url, retry, "OAI-PMH error {}: {}".format(code, message or code))
+
+    def __repr__(self) -> str:
+        return "{}({}, {}, {}, {})".format(
+            _classname(self), repr(self.url), repr(self.retry), repr(self.code), repr(self.message)
+        )
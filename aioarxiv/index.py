@@ -0,0 +1,488 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from aioarxiv.models import (
+    AnnounceType,
+    BaseResult,
+    OAIResult,
+    RSSResult,
+    SearchQuery,
+    SearchResult,
+    SortCriterion,
+    SortOrder,
+)
+from aioarxiv.models.utilities import _classname, normalize_arxiv_id
+from aioarxiv.query import (
+    And,
+    AndNot,
+    DateRange,
+    Or,
+    QueryNode,
+    _contains_phrase,
+    parse_query,
+)
+
+logger = logging.getLogger(__name__)
+
+IndexedResult = Union[SearchResult, RSSResult]
+
+_MINUTE = timedelta(minutes=1)
+_VERSIONED_ID = re.compile(r"(.+?)(?:v(\d+))?")
+
+# Relative weights of the indexed columns when ranking search matches.
+_RANK = "bm25(papers_fts, 10.0, 1.0, 5.0, 2.0)"
+
+# The full-text columns searched by each search query field.
+_FTS_COLUMNS = {
+    "ti": "title",
+    "abs": "summary",
+    "au": "authors",
+    "cat": "categories",
+    "all": "{title summary authors categories}",
+}
+# Search query fields that aren't in the full-text index, matched by `_text_matches`.
+_DATA_FIELDS = {"co": "$.comment", "jr": "$.journal_ref"}
+_ORDER = {
+    SortCriterion.SubmittedDate: "json_extract(p.data, '$.published')",
+    SortCriterion.LastUpdatedDate: "json_extract(p.data, '$.updated')",
+    # Relevance can't be ranked outside the full-text index; newest first.
+    SortCriterion.Relevance: "json_extract(p.data, '$.published')",
+}
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS papers ("
+    " rowid INTEGER PRIMARY KEY,"
+    " arxiv_id TEXT NOT NULL,"
+    " version INTEGER NOT NULL,"
+    " latest INTEGER NOT NULL DEFAULT 1,"
+    " kind TEXT NOT NULL,"
+    " title TEXT NOT NULL,"
+    " summary TEXT NOT NULL,"
+    " authors TEXT NOT NULL,"
+    " categories TEXT NOT NULL,"
+    " data TEXT NOT NULL,"
+    " stored_at REAL NOT NULL,"
+    " UNIQUE (arxiv_id, version))",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5("
+    " title, summary, authors, categories, content='papers', content_rowid='rowid')",
+    # Keep the external-content full-text index in step with `papers`.
+    "CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN"
+    " INSERT INTO papers_fts (rowid, title, summary, authors, categories)"
+    " VALUES (new.rowid, new.title, new.summary, new.authors, new.categories); END",
+    "CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN"
+    " INSERT INTO papers_fts (papers_fts, rowid, title, summary, authors, categories)"
+    " VALUES ('delete', old.rowid, old.title, old.summary, old.authors, old.categories); END",
+    "CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE OF title, summary, authors, categories"
+    " ON papers BEGIN"
+    " INSERT INTO papers_fts (papers_fts, rowid, title, summary, authors, categories)"
+    " VALUES ('delete', old.rowid, old.title, old.summary, old.authors, old.categories);"
+    " INSERT INTO papers_fts (rowid, title, summary, authors, categories)"
+    " VALUES (new.rowid, new.title, new.summary, new.authors, new.categories); END",
+)
+
+
+def split_version(short_id: str) -> Tuple[str, int]:
+    """
+    Splits a short ID into its unversioned ID and version, e.g.
+    `"2107.05580v2"` into `("2107.05580", 2)`. Unversioned IDs get version 0.
+    """
+    base, version = _VERSIONED_ID.fullmatch(short_id).groups()
+    return base, int(version) if version else 0
+
+
+def _datetime(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _text_matches(text: Optional[str], phrase: str, prefix: int) -> bool:
+    """
+    `Term.matches` for a stored field, registered as an SQL function.
+    """
+    return _contains_phrase(text, phrase.split(" "), bool(prefix))
+
+
+def _compile(node: QueryNode, params: list) -> str:
+    """
+    Compiles a parsed search query to an SQL condition on a `papers` row `p`,
+    appending its parameters to `params`. Words are matched in the full-text
+    index where it covers the field.
+    """
+    if isinstance(node, (And, Or)):
+        operator = " AND " if isinstance(node, And) else " OR "
+        return "({})".format(operator.join(_compile(operand, params) for operand in node.operands))
+    if isinstance(node, AndNot):
+        include = _compile(node.include, params)
+        return "({} AND NOT {})".format(include, _compile(node.exclude, params))
+    if isinstance(node, DateRange):
+        params.extend([node.start.isoformat(), (node.end + _MINUTE).isoformat()])
+        column = "json_extract(p.data, '$.{}')".format(node.attribute)
+        return "({0} >= ? AND {0} < ?)".format(column)
+
+    field = node.field or "all"
+    if field == "id":
+        short_id = normalize_arxiv_id(node.text)
+        if short_id is None:
+            return "0"
+        arxiv_id, version = split_version(short_id)
+        params.append(arxiv_id)
+        if not version:
+            return "p.arxiv_id = ?"
+        params.append(version)
+        return "(p.arxiv_id = ? AND p.version = ?)"
+    if field == "rn" or not node.words:
+        return "0"
+
+    conditions = []
+    if field in _FTS_COLUMNS:
+        phrase = '{} : "{}"{}'.format(
+            _FTS_COLUMNS[field], " ".join(node.words), " *" if node.prefix else ""
+        )
+        params.append(phrase)
+        conditions.append("p.rowid IN (SELECT rowid FROM papers_fts WHERE papers_fts MATCH ?)")
+    if field == "cat":
+        # The index matches the category's words; check the whole category too.
+        if node.prefix:
+            params.append(node.text[:-1].lower().replace("_", "\\_").replace("%", "\\%") + "%")
+            match = "LIKE ? ESCAPE '\\'"
+        else:
+            params.append(node.text.lower())
+            match = "= ?"
+        conditions.append(
+            "EXISTS (SELECT 1 FROM json_each(p.data, '$.categories') WHERE lower(value) {})".format(
+                match
+            )
+        )
+        return "({})".format(" AND ".join(conditions))
+
+    others = []
+    for data_field, path in _DATA_FIELDS.items():
+        if field in (data_field, "all"):
+            params.extend([" ".join(node.words), int(node.prefix)])
+            others.append("text_matches(json_extract(p.data, '{}'), ?, ?)".format(path))
+    return "({})".format(" OR ".join(conditions + others))
+
+
+def _result_data(result: IndexedResult) -> Tuple[str, dict]:
+    """
+    Serializes a result to its kind (`"search"`, `"oai"` or `"rss"`) and a
+    JSON-serializable dict, from which `_restore_result` rebuilds it.
+    """
+    data = {
+        "entry_id": result.entry_id,
+        "title": result.title,
+        "authors": [[a.name, a.institutions] for a in result.authors],
+        "summary": result.summary,
+        "journal_ref": result.journal_ref,
+        "doi": result.doi,
+        "categories": result.categories,
+        "links": [[link.href, link.title, link.rel, link.content_type] for link in result.links],
+    }
+    if isinstance(result, RSSResult):
+        data["announce_type"] = result.announce_type.value if result.announce_type else None
+        data["feed_date"] = _datetime(result.feed_date)
+        return "rss", data
+
+    data["updated"] = _datetime(result.updated)
+    data["published"] = _datetime(result.published)
+    data["comment"] = result.comment
+    data["primary_category"] = result.primary_category
+    if isinstance(result, OAIResult):
+        data["datestamp"] = result.datestamp.isoformat() if result.datestamp else None
+        data["sets"] = result.sets
+        data["deleted"] = result.deleted
+        data["versions"] = result.versions
+        return "oai", data
+    return "search", data
+
+
+def _restore_result(kind: str, data: dict) -> IndexedResult:
+    """
+    Rebuilds a result serialized by `_result_data`.
+    """
+    common = dict(
+        entry_id=data["entry_id"],
+        title=data["title"],
+        authors=[BaseResult.Author(name, institutions) for name, institutions in data["authors"]],
+        summary=data["summary"],
+        journal_ref=data["journal_ref"],
+        doi=data["doi"],
+        categories=data["categories"],
+        links=[BaseResult.Link(*link) for link in data["links"]],
+    )
+    if kind == "rss":
+        announce_type = data["announce_type"]
+        return RSSResult(
+            announce_type=AnnounceType(announce_type) if announce_type else None,
+            feed_date=_parse_datetime(data["feed_date"]),
+            **common,
+        )
+
+    common.update(
+        updated=_parse_datetime(data["updated"]),
+        published=_parse_datetime(data["published"]),
+        comment=data["comment"],
+        primary_category=data["primary_category"],
+    )
+    if kind == "oai":
+        return OAIResult(
+            datestamp=date.fromisoformat(data["datestamp"]) if data["datestamp"] else None,
+            sets=data["sets"],
+            deleted=data["deleted"],
+            versions=data["versions"],
+            **common,
+        )
+    return SearchResult(**common)
+
+
+class LocalIndex(object):
+    """
+    A persistent local store of results, kept in a SQLite database file and
+    keyed by arXiv ID and version, with an SQLite FTS5 full-text index over
+    their titles, summaries, authors and categories.
+
+    Results read back are of the class they were stored as (`SearchResult`,
+    `RSSResult` or `OAIResult`), so metadata fetched once can be served again
+    without rate-limited API requests:
+
+        index = LocalIndex("papers.db")
+        index.add_many([r async for r in client.results(query)])
+        found = index.get_many(ids)
+        missing = [i for i in ids if i not in found]
+    """
+
+    path: str
+    """Path of the database file; `":memory:"` for an index that isn't persisted."""
+    batch_size: int
+    """Number of results written per transaction by `add_many`."""
+    clock: Callable[[], float]
+    """
+    A clock returning seconds since the epoch, recorded when results are
+    stored; `time.time` unless a different clock is injected (e.g. in tests).
+    """
+
+    def __init__(self, path: str, batch_size: int = 1_000, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.batch_size = max(batch_size, 1)
+        self.clock = clock
+        self._db = sqlite3.connect(path)
+        if path != ":memory:":
+            # Readers don't block the batched writes, and commits are cheaper.
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.create_function("text_matches", 3, _text_matches, deterministic=True)
+        with self._db:
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+
+    def add(self, result: IndexedResult):
+        """
+        Stores `result`, replacing a stored result with the same ID and version.
+        """
+        self.add_many([result])
+
+    def add_many(self, results: Iterable[IndexedResult]) -> int:
+        """
+        Stores `results` in transactions of `batch_size` results each,
+        replacing stored results with the same IDs and versions. Returns the
+        number of results stored.
+        """
+        results = iter(results)
+        stored = 0
+        while True:
+            batch = list(islice(results, self.batch_size))
+            if not batch:
+                return stored
+            self._store_batch(batch)
+            stored += len(batch)
+
+    def _store_batch(self, batch: List[IndexedResult]):
+        stored_at = self.clock()
+        rows = []
+        for result in batch:
+            arxiv_id, version = split_version(result.get_short_id())
+            kind, data = _result_data(result)
+            rows.append(
+                (
+                    arxiv_id,
+                    version,
+                    kind,
+                    result.title or "",
+                    result.summary or "",
+                    "; ".join(a.name for a in result.authors),
+                    " ".join(result.categories),
+                    json.dumps(data, separators=(",", ":")),
+                    stored_at,
+                )
+            )
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO papers"
+                " (arxiv_id, version, kind, title, summary, authors, categories, data, stored_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (arxiv_id, version) DO UPDATE SET"
+                " kind = excluded.kind, title = excluded.title, summary = excluded.summary,"
+                " authors = excluded.authors, categories = excluded.categories,"
+                " data = excluded.data, stored_at = excluded.stored_at",
+                rows,
+            )
+            # Mark each paper's newest stored version.
+            self._db.execute(
+                "UPDATE papers SET latest = (version = (SELECT MAX(version) FROM papers AS p"
+                " WHERE p.arxiv_id = papers.arxiv_id))"
+                " WHERE arxiv_id IN (SELECT value FROM json_each(?))",
+                (json.dumps(sorted({row[0] for row in rows})),),
+            )
+
+    def get(self, arxiv_id: str, max_age: Optional[float] = None) -> Optional[IndexedResult]:
+        """
+        Returns the stored result for `arxiv_id`, or `None`. See `get_many`.
+        """
+        return self.get_many([arxiv_id], max_age=max_age).get(arxiv_id)
+
+    def get_many(
+        self, ids: Iterable[str], max_age: Optional[float] = None
+    ) -> Dict[str, IndexedResult]:
+        """
+        Looks up stored results for many IDs at once, returning them keyed by
+        the requested IDs; IDs without a stored result are left out.
+
+        IDs may be short IDs, `arXiv:` IDs, or abs/PDF URLs. A versioned ID
+        matches that version only; an unversioned ID matches the newest
+        version stored.
+
+        Args:
+            ids: The arXiv IDs to look up
+            max_age: If given, results stored more than this many seconds ago
+                are treated as missing, so they can be fetched again
+        """
+        latest: Dict[str, List[str]] = {}
+        versioned: Dict[Tuple[str, int], List[str]] = {}
+        for requested in ids:
+            short_id = normalize_arxiv_id(requested)
+            if short_id is None:
+                continue
+            arxiv_id, version = split_version(short_id)
+            if version:
+                versioned.setdefault((arxiv_id, version), []).append(requested)
+            else:
+                latest.setdefault(arxiv_id, []).append(requested)
+
+        oldest = self.clock() - max_age if max_age is not None else None
+        found: Dict[str, IndexedResult] = {}
+        if latest:
+            rows = self._db.execute(
+                "SELECT arxiv_id, version, kind, data, stored_at FROM papers"
+                " WHERE latest = 1 AND arxiv_id IN (SELECT value FROM json_each(?))",
+                (json.dumps(list(latest)),),
+            )
+            for arxiv_id, _, kind, data, stored_at in rows:
+                if oldest is None or stored_at >= oldest:
+                    result = _restore_result(kind, json.loads(data))
+                    found.update((requested, result) for requested in latest[arxiv_id])
+        if versioned:
+            rows = self._db.execute(
+                "SELECT p.arxiv_id, p.version, p.kind, p.data, p.stored_at"
+                " FROM json_each(?) AS j JOIN papers AS p"
+                " ON p.arxiv_id = json_extract(j.value, '$[0]')"
+                " AND p.version = json_extract(j.value, '$[1]')",
+                (json.dumps(list(versioned)),),
+            )
+            for arxiv_id, version, kind, data, stored_at in rows:
+                if oldest is None or stored_at >= oldest:
+                    result = _restore_result(kind, json.loads(data))
+                    found.update((requested, result) for requested in versioned[arxiv_id, version])
+        return found
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[IndexedResult]:
+        """
+        Searches the stored results' newest versions, best matches first.
+
+        `query` is an [SQLite FTS5 query](https://www.sqlite.org/fts5.html#full_text_query_syntax)
+        over the `title`, `summary`, `authors` and `categories` columns, e.g.
+        `"transformer AND authors:vaswani"` or `'categories:"cs.LG"'`.
+        Title matches rank highest, then authors, categories and summaries.
+
+        Raises:
+            sqlite3.OperationalError: If `query` isn't valid FTS5 syntax.
+        """
+        rows = self._db.execute(
+            "SELECT p.kind, p.data FROM papers_fts JOIN papers AS p ON p.rowid = papers_fts.rowid"
+            " WHERE papers_fts MATCH ? AND p.latest = 1"
+            " ORDER BY {} LIMIT ? OFFSET ?".format(_RANK),
+            (query, limit, offset),
+        )
+        return [_restore_result(kind, json.loads(data)) for kind, data in rows]
+
+    def results(
+        self, query: Union[str, SearchQuery], limit: Optional[int] = None, offset: int = 0
+    ) -> List[IndexedResult]:
+        """
+        Runs a Search API query against the stored results' newest versions,
+        so it can be answered without a request.
+
+        `query` is a `SearchQuery` or its `query` string in the arXiv search
+        syntax (see `parse_query`), e.g. `"au:del_maestro AND ti:checkerboard"`.
+        A `SearchQuery`'s `id_list` and sort order are applied too, and its
+        `max_results` unless `limit` is given. Relevance can't be ranked
+        locally, so it sorts the newest submissions first.
+
+        Raises:
+            QuerySyntaxError: If the query isn't valid search syntax.
+        """
+        if isinstance(query, str):
+            query = SearchQuery(query)
+        params: list = []
+        conditions = ["p.latest = 1"]
+        if query.query:
+            conditions.append(_compile(parse_query(query.query), params))
+        if query.id_list:
+            ids = [normalize_arxiv_id(i) or i for i in query.id_list]
+            params.append(json.dumps([split_version(i)[0] for i in ids]))
+            conditions.append("p.arxiv_id IN (SELECT value FROM json_each(?))")
+        if limit is None:
+            limit = query.max_results
+        order = "ASC" if query.sort_order == SortOrder.Ascending else "DESC"
+        rows = self._db.execute(
+            "SELECT p.kind, p.data FROM papers AS p WHERE {} ORDER BY {} {}, p.arxiv_id {}"
+            " LIMIT ? OFFSET ?".format(
+                " AND ".join(conditions), _ORDER[query.sort_by], order, order
+            ),
+            params + [limit if limit is not None else -1, offset],
+        )
+        return [_restore_result(kind, json.loads(data)) for kind, data in rows]
+
+    def delete(self, arxiv_id: str):
+        """
+        Removes every stored version of `arxiv_id`.
+        """
+        short_id = normalize_arxiv_id(arxiv_id) or arxiv_id
+        with self._db:
+            self._db.execute("DELETE FROM papers WHERE arxiv_id = ?", (split_version(short_id)[0],))
+
+    def __len__(self) -> int:
+        """The number of papers stored, counting each paper's versions once."""
+        return self._db.execute("SELECT COUNT(*) FROM papers WHERE latest = 1").fetchone()[0]
+
+    def __contains__(self, arxiv_id: str) -> bool:
+        return self.get(arxiv_id) is not None
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self._db.close()
+
+    def __repr__(self) -> str:
+        return "{}(path={})".format(_classname(self), repr(self.path))
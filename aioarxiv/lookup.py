@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import AsyncGenerator, Dict, Iterable, List, Optional, Tuple
+
+from aioarxiv.models import SearchResult
+from aioarxiv.models.utilities import _classname, normalize_arxiv_id, strip_arxiv_id_version
+
+
+def dedup_ids(ids: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    Normalizes `ids` with `normalize_arxiv_id`, returning the distinct valid
+    IDs in input order and the inputs which aren't valid IDs.
+    """
+    requested: List[str] = []
+    invalid: List[str] = []
+    seen = set()
+    for raw in ids:
+        arxiv_id = normalize_arxiv_id(raw)
+        if arxiv_id is None:
+            invalid.append(raw)
+        elif arxiv_id not in seen:
+            seen.add(arxiv_id)
+            requested.append(arxiv_id)
+    return requested, invalid
+
+
+def chunk_ids(ids: List[str], max_ids: int, max_chars: int) -> List[List[str]]:
+    """
+    Splits `ids` into chunks of at most `max_ids` IDs whose comma-joined length
+    is at most `max_chars`. An ID longer than `max_chars` gets a chunk of its
+    own.
+    """
+    chunks: List[List[str]] = []
+    chunk: List[str] = []
+    length = 0
+    for arxiv_id in ids:
+        added = len(arxiv_id) + (1 if chunk else 0)
+        if chunk and (len(chunk) >= max_ids or length + added > max_chars):
+            chunks.append(chunk)
+            chunk, length, added = [], 0, len(arxiv_id)
+        chunk.append(arxiv_id)
+        length += added
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def match_ids(chunk: List[str], results: List[SearchResult]) -> Dict[str, SearchResult]:
+    """
+    Maps each requested ID in `chunk` to its result. Unversioned IDs match any
+    version; versioned IDs only match that version.
+    """
+    by_id: Dict[str, SearchResult] = {}
+    for result in results:
+        short_id = result.get_short_id()
+        by_id[short_id] = result
+        by_id.setdefault(strip_arxiv_id_version(short_id), result)
+    return {arxiv_id: by_id[arxiv_id] for arxiv_id in chunk if arxiv_id in by_id}
+
+
+class IdLookup(object):
+    """
+    The results of `Client.get_by_ids`: an async iterator of `SearchResult`s,
+    which also reports the requested IDs arXiv returned no result for.
+
+    `missing` is complete once iteration finishes.
+    """
+
+    requested: List[str]
+    """The distinct normalized IDs requested, in input order."""
+    invalid: List[str]
+    """Inputs which aren't valid arXiv IDs, and so weren't requested."""
+    missing: List[str]
+    """Requested IDs for which arXiv returned no result, in the order found."""
+    _results: Optional[AsyncGenerator[SearchResult, None]]
+
+    def __init__(self, requested: List[str], invalid: List[str]):
+        self.requested = requested
+        self.invalid = invalid
+        self.missing = []
+        self._results = None
+
+    def __aiter__(self) -> AsyncGenerator[SearchResult, None]:
+        return self._results
+
+    async def aclose(self):
+        """
+        Stops the lookup, cancelling outstanding requests.
+        """
+        await self._results.aclose()
+
+    def __repr__(self) -> str:
+        return "{}(<{} requested>, invalid={}, missing={})".format(
+            _classname(self), len(self.requested), repr(self.invalid), repr(self.missing)
+        )
@@ -1,8 +1,9 @@
-"""Models module for aioarxiv. Contains base classes, search models, RSS models, and enums."""
+"""Models module for aioarxiv. Contains base classes, search models, RSS models, OAI-PMH models, and enums."""
 
 from .base import BaseResult, BaseQuery
 from .search import SearchResult, SearchQuery
 from .rss import RSSResult, RSSQuery
+from .oai import OAIResult, OAIQuery
 from .enums import SortCriterion, SortOrder, AnnounceType
 from .utilities import validate_arxiv_url
 
@@ -13,6 +14,8 @@ __all__ = [
     "SearchQuery",
     "RSSResult",
     "RSSQuery",
+    "OAIResult",
+    "OAIQuery",
     "SortCriterion",
     "SortOrder",
     "AnnounceType",
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 import feedparser
 import os
 import re
@@ -10,6 +10,9 @@ import logging
 
 from aioarxiv.models.utilities import validate_arxiv_url
 
+if TYPE_CHECKING:
+    from aioarxiv.rate_limiter import RateLimiterRegistry
+
 logger = logging.getLogger(__name__)
 
 
@@ -114,26 +117,32 @@ class BaseResult(object):
         dirpath: str = "./",
         filename: str = "",
         session: Optional[aiohttp.ClientSession] = None,
+        rate_limiters: Optional[RateLimiterRegistry] = None,
     ) -> str:
         """
         Downloads the PDF for this result to the specified directory.
 
         The filename is generated by calling `to_filename(self)`.
+
+        The request waits on the download host's limiter in `rate_limiters`
+        (e.g. `Client.rate_limiters`), or in `downloads.DEFAULT_RATE_LIMITERS`
+        if none are given.
+
+        Without a `session`, one is opened just for this download; prefer
+        `Client.download_pdf` to reuse the client's pooled connections.
         """
+        from aioarxiv.downloads import DEFAULT_RATE_LIMITERS, fetch_to_file
+
         if not filename:
             filename = self._get_default_filename()
         path = os.path.join(dirpath, filename)
-        os.makedirs(dirpath, exist_ok=True)
 
         # Create a session if not provided
         close_session = session is None
         session = session or aiohttp.ClientSession()
 
         try:
-            async with session.get(self.pdf_url) as response:
-                response.raise_for_status()
-                with open(path, "wb") as f:
-                    f.write(await response.read())
+            await fetch_to_file(session, self.pdf_url, path, rate_limiters or DEFAULT_RATE_LIMITERS)
         finally:
             if close_session:
                 await session.close()
@@ -145,36 +154,48 @@ class BaseResult(object):
         dirpath: str = "./",
         filename: str = "",
         session: Optional[aiohttp.ClientSession] = None,
+        rate_limiters: Optional[RateLimiterRegistry] = None,
     ) -> str:
         """
         Downloads the source tarfile for this result to the specified
         directory.
 
         The filename is generated by calling `to_filename(self)`.
+
+        The request waits on the download host's limiter in `rate_limiters`
+        (e.g. `Client.rate_limiters`), or in `downloads.DEFAULT_RATE_LIMITERS`
+        if none are given.
+
+        Without a `session`, one is opened just for this download; prefer
+        `Client.download_source` to reuse the client's pooled connections.
         """
+        from aioarxiv.downloads import DEFAULT_RATE_LIMITERS, fetch_to_file
+
         if not filename:
             filename = self._get_default_filename("tar.gz")
         path = os.path.join(dirpath, filename)
-        os.makedirs(dirpath, exist_ok=True)
 
-        # Bodge: construct the source URL from the PDF URL.
-        source_url = self.pdf_url.replace("/pdf/", "/src/")
+        source_url = self._get_source_url()
 
         # Create a session if not provided
         close_session = session is None
         session = session or aiohttp.ClientSession()
 
         try:
-            async with session.get(source_url) as response:
-                response.raise_for_status()
-                with open(path, "wb") as f:
-                    f.write(await response.read())
+            await fetch_to_file(session, source_url, path, rate_limiters or DEFAULT_RATE_LIMITERS)
         finally:
             if close_session:
                 await session.close()
 
         return path
 
+    def _get_source_url(self) -> str:
+        """
+        The URL of this result's source tarfile.
+        """
+        # Bodge: construct the source URL from the PDF URL.
+        return self.pdf_url.replace("/pdf/", "/src/")
+
     @staticmethod
     def _get_pdf_url(links: List[Link], entry_id: str) -> Optional[str]:
         """
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Dict, List, Literal, Optional, Union
+
+from aioarxiv.models import BaseResult, BaseQuery
+from aioarxiv.models.search import SearchResult
+from aioarxiv.models.utilities import _classname, _DEFAULT_TIME
+
+MetadataPrefix = Literal["arXiv", "arXivRaw"]
+
+
+def _format_datestamp(value: Union[date, datetime, str]) -> str:
+    """
+    Formats an OAI-PMH datestamp; arXiv's repository has day granularity.
+    """
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+class OAIQuery(BaseQuery):
+    """
+    A specification for a selective harvest of arXiv's metadata over OAI-PMH
+    (a `ListRecords` request).
+
+    To run a query, use `Client.oai_records` with an instantiated client.
+
+    See [arXiv: OAI-PMH Interface](https://info.arxiv.org/help/oa/index.html).
+    """
+
+    metadata_prefix: MetadataPrefix
+    """
+    The metadata format: `"arXiv"` (structured author names, no versions) or
+    `"arXivRaw"` (submission history with every version).
+    """
+    set_spec: Optional[str]
+    """
+    The set to harvest, e.g. `"cs"` or `"physics:hep-th"`; `None` for all of
+    arXiv.
+    """
+    from_date: Optional[Union[date, datetime, str]]
+    """
+    Only harvest records whose metadata changed on or after this day. Note
+    that this is a record's datestamp, not its submission date.
+    """
+    until: Optional[Union[date, datetime, str]]
+    """Only harvest records whose metadata changed on or before this day."""
+
+    def __init__(
+        self,
+        metadata_prefix: MetadataPrefix = "arXiv",
+        set_spec: Optional[str] = None,
+        from_date: Optional[Union[date, datetime, str]] = None,
+        until: Optional[Union[date, datetime, str]] = None,
+        max_results: Optional[int] = None,
+    ):
+        """
+        Constructs an OAI-PMH harvest with the specified criteria.
+        """
+        if metadata_prefix not in ("arXiv", "arXivRaw"):
+            raise ValueError(
+                f"Invalid metadata prefix: {metadata_prefix}. Must be 'arXiv' or 'arXivRaw'."
+            )
+        super().__init__(query="", max_results=max_results, id_list=[])
+        self.metadata_prefix = metadata_prefix
+        self.set_spec = set_spec
+        self.from_date = from_date
+        self.until = until
+
+    def __repr__(self) -> str:
+        return (
+            "{}(metadata_prefix={}, set_spec={}, from_date={}, until={}, max_results={})"
+        ).format(
+            _classname(self),
+            repr(self.metadata_prefix),
+            repr(self.set_spec),
+            repr(self.from_date),
+            repr(self.until),
+            repr(self.max_results),
+        )
+
+    def _url_args(self) -> Dict[str, str]:
+        """
+        Returns a dict of the `ListRecords` parameters for this harvest's
+        first request.
+        """
+        args = {"verb": "ListRecords", "metadataPrefix": self.metadata_prefix}
+        if self.set_spec is not None:
+            args["set"] = self.set_spec
+        if self.from_date is not None:
+            args["from"] = _format_datestamp(self.from_date)
+        if self.until is not None:
+            args["until"] = _format_datestamp(self.until)
+        return args
+
+
+class OAIResult(SearchResult):
+    """
+    A record harvested from arXiv's OAI-PMH interface, or read from its
+    metadata snapshot (see `read_snapshot`). It has the attributes of a
+    `SearchResult`, so it can be used wherever search results are, plus the
+    record's OAI-PMH header.
+
+    Records of the `"arXiv"` format have unversioned entry IDs (their PDF
+    links point at the latest version); `"arXivRaw"` records carry the latest
+    version's ID.
+    """
+
+    datestamp: Optional[date]
+    """When the record's metadata last changed."""
+    sets: List[str]
+    """The OAI-PMH sets the record belongs to, e.g. `["cs"]`."""
+    deleted: bool
+    """Whether the record was withdrawn from the repository; deleted records have no metadata."""
+    versions: List[str]
+    """The paper's versions, e.g. `["v1", "v2"]`; only known for `"arXivRaw"` records."""
+
+    def __init__(
+        self,
+        entry_id: str,
+        updated: datetime = _DEFAULT_TIME,
+        published: datetime = _DEFAULT_TIME,
+        comment: str = "",
+        primary_category: str = "",
+        title: str = "",
+        authors: List[BaseResult.Author] = [],
+        summary: str = "",
+        journal_ref: str = "",
+        doi: str = "",
+        categories: List[str] = [],
+        links: List[BaseResult.Link] = [],
+        datestamp: Optional[date] = None,
+        sets: List[str] = [],
+        deleted: bool = False,
+        versions: List[str] = [],
+    ):
+        """
+        Constructs a harvested arXiv record.
+        """
+        self.datestamp = datestamp
+        self.sets = sets
+        self.deleted = deleted
+        self.versions = versions
+        super().__init__(
+            entry_id=entry_id,
+            updated=updated,
+            published=published,
+            comment=comment,
+            primary_category=primary_category,
+            title=title,
+            authors=authors,
+            summary=summary,
+            journal_ref=journal_ref,
+            doi=doi,
+            categories=categories,
+            links=links,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            "{}(entry_id={}, datestamp={}, sets={}, deleted={}, updated={}, "
+            "published={}, title={}, authors={}, primary_category={}, categories={})"
+        ).format(
+            _classname(self),
+            repr(self.entry_id),
+            repr(self.datestamp),
+            repr(self.sets),
+            repr(self.deleted),
+            repr(self.updated),
+            repr(self.published),
+            repr(self.title),
+            repr(self.authors),
+            repr(self.primary_category),
+            repr(self.categories),
+        )
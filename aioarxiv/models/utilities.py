@@ -1,10 +1,15 @@
 import re
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 import time
 from calendar import timegm
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from xml.etree import ElementTree
 
 _DEFAULT_TIME = datetime.min
 
+_WHITESPACE = re.compile(r"\s+")
+
 
 def _classname(o):
     """A helper function for use in __repr__ methods: aioarxiv.BaseResult.Link."""
@@ -31,3 +36,94 @@ def validate_arxiv_url(url: str) -> bool:
 def strip_arxiv_id_version(arxiv_id: str) -> str:
     """Strip the version from an arXiv ID."""
     return re.sub(r"v\d+$", "", arxiv_id)
+
+
+_ARXIV_ID_PREFIX = re.compile(
+    r"^(?:arxiv:|https?://(?:export\.)?arxiv\.org/(?:abs|pdf)/)", re.IGNORECASE
+)
+_ARXIV_ID = re.compile(r"\d{4}\.\d{4,5}(v\d+)?|[a-z-]+(\.[A-Za-z-]+)?/\d{7}(v\d+)?")
+
+
+def normalize_arxiv_id(arxiv_id: str) -> Optional[str]:
+    """
+    Normalizes an arXiv ID, abs URL or PDF URL to a short ID, e.g.
+    `"arXiv:2107.05580v1"` to `"2107.05580v1"`. Returns `None` if the input
+    isn't a valid arXiv ID.
+    """
+    arxiv_id = _ARXIV_ID_PREFIX.sub("", arxiv_id.strip())
+    if arxiv_id.endswith(".pdf"):
+        arxiv_id = arxiv_id[: -len(".pdf")]
+    return arxiv_id if _ARXIV_ID.fullmatch(arxiv_id) else None
+
+
+def collapse_whitespace(value: str) -> str:
+    """Collapses runs of whitespace, e.g. line breaks in a title, to single spaces."""
+    return _WHITESPACE.sub(" ", value).strip()
+
+
+def optional_text(value: Optional[str]) -> Optional[str]:
+    """
+    Returns a field's text with whitespace collapsed, or `None` for a missing
+    or empty field.
+    """
+    value = collapse_whitespace(value or "")
+    return value or None
+
+
+def element_text(element: ElementTree.Element) -> str:
+    """
+    Returns an XML element's text, including any child elements' text, with
+    surrounding whitespace removed.
+    """
+    if len(element):
+        return "".join(element.itertext()).strip()
+    return (element.text or "").strip()
+
+
+def to_int(value: object) -> Optional[int]:
+    """
+    Converts a parsed count to an int, or `None` if it's missing or malformed.
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_iso_date(value: str) -> datetime:
+    """
+    Parses an ISO 8601 (RFC 3339) timestamp, e.g. an Atom `<updated>`, into a
+    UTC datetime. Returns `_DEFAULT_TIME` if it's malformed.
+    """
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return _DEFAULT_TIME
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_day(value: str) -> Optional[date]:
+    """
+    Parses a date starting `YYYY-MM-DD`, e.g. an OAI-PMH datestamp. Returns
+    `None` if it's malformed.
+    """
+    try:
+        return date.fromisoformat(value.strip()[:10])
+    except ValueError:
+        return None
+
+
+def parse_rfc822_date(value: str) -> datetime:
+    """
+    Parses an RFC 822 timestamp, e.g. `"Mon, 2 Apr 2007 19:18:42 GMT"`, into a
+    UTC datetime. Returns `_DEFAULT_TIME` if it's malformed.
+    """
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return _DEFAULT_TIME
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
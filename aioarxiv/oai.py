@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+from xml.etree import ElementTree
+
+from aioarxiv.models import BaseResult, OAIResult, RSSResult
+from aioarxiv.models.utilities import (
+    _DEFAULT_TIME,
+    _classname,
+    collapse_whitespace,
+    element_text,
+    optional_text,
+    parse_day,
+    parse_rfc822_date,
+    to_int,
+)
+
+logger = logging.getLogger(__name__)
+
+_OAI = "{http://www.openarchives.org/OAI/2.0/}"
+_ARXIV = "{http://arxiv.org/OAI/arXiv/}"
+_ARXIV_RAW = "{http://arxiv.org/OAI/arXivRaw/}"
+
+# "A, B and C", without splitting affiliations in parentheses.
+_AUTHOR_AND = re.compile(r",?\s+and\s+(?![^()]*\))")
+
+ABS_URL = "http://arxiv.org/abs/"
+"""The prefix of a paper's abstract page URL, which is also its `entry_id`."""
+PDF_URL = "http://arxiv.org/pdf/"
+"""The prefix of a paper's PDF URL."""
+
+
+class OAIPage(object):
+    """
+    The outcome of one OAI-PMH `ListRecords` response.
+    """
+
+    results: List[OAIResult]
+    """The page's records, in response order."""
+    resumption_token: Optional[str]
+    """The token requesting the next page; `None` on the last page."""
+    complete_list_size: Optional[int]
+    """The number of records in the whole list, if the repository reported it."""
+    cursor: Optional[int]
+    """The position of this page's first record in the whole list, if reported."""
+
+    def __init__(
+        self,
+        results: List[OAIResult],
+        resumption_token: Optional[str] = None,
+        complete_list_size: Optional[int] = None,
+        cursor: Optional[int] = None,
+    ):
+        self.results = results
+        self.resumption_token = resumption_token
+        self.complete_list_size = complete_list_size
+        self.cursor = cursor
+
+    def __repr__(self) -> str:
+        return "{}(<{} results>, resumption_token={}, complete_list_size={}, cursor={})".format(
+            _classname(self),
+            len(self.results),
+            repr(self.resumption_token),
+            repr(self.complete_list_size),
+            repr(self.cursor),
+        )
+
+
+class OAIStreamParser(object):
+    """
+    An incremental parser for OAI-PMH `ListRecords` responses in the `arXiv`
+    and `arXivRaw` metadata formats.
+
+    Bytes are fed in as they arrive with `feed`; each record is converted to
+    an `OAIResult` and dropped from the tree as soon as it's complete, so a
+    large page is never held in memory as XML. `close` returns the page.
+    """
+
+    error: Optional[Tuple[str, str]]
+    """The OAI-PMH error code and message in the response, if any."""
+
+    def __init__(self):
+        self.error = None
+        self._parser = ElementTree.XMLPullParser(events=("start", "end"))
+        self._list: Optional[ElementTree.Element] = None
+        self._page = OAIPage([])
+
+    def feed(self, chunk: bytes):
+        """
+        Parses the next chunk of the response body.
+
+        Raises:
+            xml.etree.ElementTree.ParseError: If the body isn't well-formed XML.
+        """
+        self._parser.feed(chunk)
+        self._handle_events()
+
+    def close(self) -> OAIPage:
+        """
+        Finishes parsing and returns the page.
+
+        Raises:
+            xml.etree.ElementTree.ParseError: If the body was incomplete.
+        """
+        self._parser.close()
+        self._handle_events()
+        return self._page
+
+    def _handle_events(self):
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if element.tag == _OAI + "ListRecords":
+                    self._list = element
+                continue
+            if element.tag == _OAI + "record":
+                try:
+                    self._page.results.append(record_to_result(element))
+                except OAIResult.MissingFieldError as e:
+                    logger.warning("Skipping partial OAIResult: %s", e)
+                if self._list is not None:
+                    self._list.remove(element)
+            elif element.tag == _OAI + "resumptionToken":
+                self._page.resumption_token = (element.text or "").strip() or None
+                self._page.complete_list_size = to_int(element.get("completeListSize"))
+                self._page.cursor = to_int(element.get("cursor"))
+            elif element.tag == _OAI + "error":
+                self.error = (element.get("code", ""), (element.text or "").strip())
+
+    def __repr__(self) -> str:
+        return "{}()".format(_classname(self))
+
+
+def record_to_result(record: ElementTree.Element) -> OAIResult:
+    """
+    Builds an `OAIResult` from an OAI-PMH `<record>` in the `arXiv` or
+    `arXivRaw` metadata format.
+    """
+    header = record.find(_OAI + "header")
+    if header is None:
+        raise OAIResult.MissingFieldError("header")
+    identifier = header.findtext(_OAI + "identifier", "").strip()
+    datestamp = parse_day(header.findtext(_OAI + "datestamp", ""))
+    sets = [element_text(s) for s in header.iterfind(_OAI + "setSpec")]
+    deleted = header.get("status") == "deleted"
+
+    metadata = record.find(_OAI + "metadata")
+    arxiv = raw = None
+    if metadata is not None:
+        arxiv = metadata.find(_ARXIV + "arXiv")
+        raw = metadata.find(_ARXIV_RAW + "arXivRaw")
+    if arxiv is not None:
+        return _arxiv_result(arxiv, datestamp, sets, deleted)
+    if raw is not None:
+        return _arxiv_raw_result(raw, datestamp, sets, deleted)
+    if not deleted:
+        raise OAIResult.MissingFieldError("metadata")
+
+    # Deleted records only have a header, e.g. "oai:arXiv.org:2401.00001".
+    short_id = identifier.rsplit(":", 1)[-1]
+    if not short_id:
+        raise OAIResult.MissingFieldError("identifier")
+    return OAIResult(
+        entry_id=ABS_URL + short_id,
+        links=paper_links(short_id),
+        datestamp=datestamp,
+        sets=sets,
+        deleted=True,
+    )
+
+
+def _arxiv_result(
+    metadata: ElementTree.Element, datestamp: Optional[date], sets: List[str], deleted: bool
+) -> OAIResult:
+    """
+    Builds an `OAIResult` from `arXiv`-format metadata.
+    """
+    short_id = metadata.findtext(_ARXIV + "id", "").strip()
+    if not short_id:
+        raise OAIResult.MissingFieldError("id")
+    published = _parse_iso_day(metadata.findtext(_ARXIV + "created", ""))
+    updated = _parse_iso_day(metadata.findtext(_ARXIV + "updated", "")) or published
+
+    authors = []
+    for author in metadata.iterfind(_ARXIV + "authors/" + _ARXIV + "author"):
+        name = " ".join(
+            part
+            for part in (
+                author.findtext(_ARXIV + "forenames", "").strip(),
+                author.findtext(_ARXIV + "keyname", "").strip(),
+                author.findtext(_ARXIV + "suffix", "").strip(),
+            )
+            if part
+        )
+        affiliations = [
+            element_text(a) for a in author.iterfind(_ARXIV + "affiliation") if element_text(a)
+        ]
+        authors.append(BaseResult.Author(name, ", ".join(affiliations) or None))
+
+    categories = metadata.findtext(_ARXIV + "categories", "").split()
+    return OAIResult(
+        entry_id=ABS_URL + short_id,
+        updated=updated or _DEFAULT_TIME,
+        published=published or _DEFAULT_TIME,
+        title=collapse_whitespace(metadata.findtext(_ARXIV + "title", "")),
+        authors=authors,
+        summary=metadata.findtext(_ARXIV + "abstract", "").strip(),
+        comment=optional_text(metadata.findtext(_ARXIV + "comments")),
+        journal_ref=optional_text(metadata.findtext(_ARXIV + "journal-ref")),
+        doi=optional_text(metadata.findtext(_ARXIV + "doi")),
+        primary_category=categories[0] if categories else "",
+        categories=categories,
+        links=paper_links(short_id),
+        datestamp=datestamp,
+        sets=sets,
+        deleted=deleted,
+    )
+
+
+def _arxiv_raw_result(
+    metadata: ElementTree.Element, datestamp: Optional[date], sets: List[str], deleted: bool
+) -> OAIResult:
+    """
+    Builds an `OAIResult` from `arXivRaw`-format metadata, identified by its
+    latest version.
+    """
+    short_id = metadata.findtext(_ARXIV_RAW + "id", "").strip()
+    if not short_id:
+        raise OAIResult.MissingFieldError("id")
+    versions = []
+    dates = []
+    for version in metadata.iterfind(_ARXIV_RAW + "version"):
+        versions.append(version.get("version", ""))
+        dates.append(parse_rfc822_date(version.findtext(_ARXIV_RAW + "date", "")))
+    if versions:
+        short_id += versions[-1]
+
+    categories = metadata.findtext(_ARXIV_RAW + "categories", "").split()
+    authors = metadata.findtext(_ARXIV_RAW + "authors", "")
+    return OAIResult(
+        entry_id=ABS_URL + short_id,
+        updated=dates[-1] if dates else _DEFAULT_TIME,
+        published=dates[0] if dates else _DEFAULT_TIME,
+        title=collapse_whitespace(metadata.findtext(_ARXIV_RAW + "title", "")),
+        authors=parse_author_string(authors),
+        summary=metadata.findtext(_ARXIV_RAW + "abstract", "").strip(),
+        comment=optional_text(metadata.findtext(_ARXIV_RAW + "comments")),
+        journal_ref=optional_text(metadata.findtext(_ARXIV_RAW + "journal-ref")),
+        doi=optional_text(metadata.findtext(_ARXIV_RAW + "doi")),
+        primary_category=categories[0] if categories else "",
+        categories=categories,
+        links=paper_links(short_id),
+        datestamp=datestamp,
+        sets=sets,
+        deleted=deleted,
+        versions=versions,
+    )
+
+
+def paper_links(short_id: str) -> List[BaseResult.Link]:
+    """
+    The abstract page and PDF links for the paper `short_id`, like the Search
+    API's.
+    """
+    return [
+        BaseResult.Link(ABS_URL + short_id, rel="alternate", content_type="text/html"),
+        BaseResult.Link(
+            PDF_URL + short_id, title="pdf", rel="related", content_type="application/pdf"
+        ),
+    ]
+
+
+def parse_author_string(authors: str) -> List[BaseResult.Author]:
+    """
+    Parses an author list like `"A. Author (Univ), B. Author and C. Author"`,
+    as in `arXivRaw` metadata and the metadata snapshot.
+    """
+    authors = collapse_whitespace(authors)
+    if not authors:
+        return []
+    return RSSResult._parse_authors(_AUTHOR_AND.sub(", ", authors))
+
+
+def _parse_iso_day(value: str) -> Optional[datetime]:
+    """
+    Parses a `YYYY-MM-DD` metadata date into a UTC datetime.
+    """
+    day = parse_day(value)
+    if day is None:
+        return None
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import logging
+from typing import List, Optional, Union
+from xml.etree import ElementTree
+
+import feedparser
+
+from aioarxiv.models import AnnounceType, BaseResult, RSSResult, SearchResult
+from aioarxiv.models.utilities import (
+    _DEFAULT_TIME,
+    _classname,
+    collapse_whitespace,
+    element_text,
+    parse_iso_date,
+    parse_rfc822_date,
+    to_int,
+)
+
+logger = logging.getLogger(__name__)
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ARXIV = "{http://arxiv.org/schemas/atom}"
+_OPENSEARCH = "{http://a9.com/-/spec/opensearch/1.1/}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+
+
+class ParsedFeed(object):
+    """
+    The results parsed from a feed response body.
+
+    `entries` and `feed` proxy the output of `feedparser.parse`, which is
+    computed on first access if the feed was parsed by another parser.
+    """
+
+    results: List[Union[SearchResult, RSSResult]]
+    """The feed's results, in feed order."""
+    num_entries: int
+    """
+    Number of entries in the feed, including partial entries which couldn't be
+    parsed into results.
+    """
+    total_results: Optional[int]
+    """The total number of results reported by the feed (`opensearch:totalResults`), if any."""
+    content: Optional[bytes]
+    """The response body the feed was parsed from."""
+
+    def __init__(
+        self,
+        results: List[Union[SearchResult, RSSResult]],
+        num_entries: int,
+        total_results: Optional[int] = None,
+        raw: Optional[feedparser.FeedParserDict] = None,
+        content: Optional[bytes] = None,
+    ):
+        self.results = results
+        self.num_entries = num_entries
+        self.total_results = total_results
+        self.content = content
+        self._raw = raw
+
+    @property
+    def raw(self) -> Optional[feedparser.FeedParserDict]:
+        """
+        The output of `feedparser.parse` for this feed, if it was parsed by
+        feedparser or its `content` is known.
+        """
+        if self._raw is None and self.content is not None:
+            self._raw = feedparser.parse(self.content)
+        return self._raw
+
+    @property
+    def entries(self) -> List[feedparser.FeedParserDict]:
+        """The feed's entries, as parsed by feedparser."""
+        return self.raw.entries if self.raw is not None else []
+
+    @property
+    def feed(self) -> feedparser.FeedParserDict:
+        """The feed's metadata, as parsed by feedparser."""
+        return self.raw.feed if self.raw is not None else feedparser.FeedParserDict()
+
+    def __repr__(self) -> str:
+        return "{}(<{} results>, num_entries={}, total_results={})".format(
+            _classname(self),
+            len(self.results),
+            repr(self.num_entries),
+            repr(self.total_results),
+        )
+
+
+class BaseParser(object):
+    """
+    A base class for parsers which turn arXiv API (Atom) and RSS feed response
+    bodies into results. Pass one to `Client` as `parser`.
+
+    Subclasses implement `parse`.
+    """
+
+    def parse(self, content: bytes) -> ParsedFeed:
+        """
+        Parses a feed response body. Entries missing required fields are
+        logged and skipped.
+        """
+        raise NotImplementedError
+
+
+class FeedparserParser(BaseParser):
+    """
+    Parses feeds with the general-purpose `feedparser` library, which tolerates
+    malformed ("bozo") documents.
+    """
+
+    def parse(self, content: bytes) -> ParsedFeed:
+        feed = feedparser.parse(content)
+        if feed.bozo:
+            logger.warning(
+                "Bozo feed; consider handling: %s",
+                feed.bozo_exception if "bozo_exception" in feed else None,
+            )
+
+        is_rss = feed.get("version", "").startswith("rss")
+        results = []
+        for entry in feed.entries:
+            # arXiv's Atom RSS feeds are Atom documents, but their entries are
+            # announcements; the Search API never sets `arxiv:announce_type`.
+            rss_entry = is_rss or "arxiv_announce_type" in entry
+            result_type = RSSResult if rss_entry else SearchResult
+            try:
+                results.append(result_type._from_feed_entry(entry))
+            except result_type.MissingFieldError as e:
+                logger.warning("Skipping partial %s: %s", result_type.__name__, e)
+
+        return ParsedFeed(
+            results,
+            num_entries=len(feed.entries),
+            total_results=to_int(feed.feed.get("opensearch_totalresults")),
+            raw=feed,
+            content=content,
+        )
+
+    def __repr__(self) -> str:
+        return "{}()".format(_classname(self))
+
+
+class ArxivParser(BaseParser):
+    """
+    A parser specialized for the fixed schemas of arXiv's API (Atom) and RSS
+    feeds, which builds results directly from the XML tree without
+    `feedparser`'s sanitizing and date guessing.
+
+    Documents which aren't well-formed XML, or aren't arXiv feeds, are handed
+    to `fallback`.
+
+    Unlike `feedparser`, RSS abstracts aren't sanitized as HTML, so inline math
+    such as `$1<p<2$` is kept intact. Results built by this parser have no
+    `_raw` feedparser entry.
+    """
+
+    fallback: BaseParser
+    """The parser for documents this parser can't handle."""
+
+    def __init__(self, fallback: Optional[BaseParser] = None):
+        self.fallback = fallback or FeedparserParser()
+
+    def parse(self, content: bytes) -> ParsedFeed:
+        try:
+            root = ElementTree.fromstring(content)
+        except ElementTree.ParseError as e:
+            logger.debug("Malformed feed; falling back to %r: %s", self.fallback, e)
+            return self.fallback.parse(content)
+
+        if root.tag == _ATOM + "feed":
+            parsed = self._parse_atom(root)
+        elif root.tag == "rss":
+            parsed = self._parse_rss(root)
+        else:
+            logger.debug("Unrecognized feed root %s; falling back to %r", root.tag, self.fallback)
+            return self.fallback.parse(content)
+        parsed.content = content
+        return parsed
+
+    def _parse_atom(self, root: ElementTree.Element) -> ParsedFeed:
+        results = []
+        num_entries = 0
+        for entry in root.iterfind(_ATOM + "entry"):
+            num_entries += 1
+            if entry.find(_ARXIV + "announce_type") is not None:
+                # An entry of an Atom RSS feed (`RSSQuery(feed="ATOM")`).
+                try:
+                    results.append(self._rss_result(entry))
+                except RSSResult.MissingFieldError as e:
+                    logger.warning("Skipping partial RSSResult: %s", e)
+                continue
+            try:
+                results.append(entry_to_result(entry))
+            except SearchResult.MissingFieldError as e:
+                logger.warning("Skipping partial SearchResult: %s", e)
+
+        return ParsedFeed(
+            results,
+            num_entries=num_entries,
+            total_results=to_int(root.findtext(_OPENSEARCH + "totalResults")),
+        )
+
+    def _parse_rss(self, root: ElementTree.Element) -> ParsedFeed:
+        results = []
+        num_entries = 0
+        for item in root.iterfind("channel/item"):
+            num_entries += 1
+            try:
+                results.append(self._rss_result(item))
+            except RSSResult.MissingFieldError as e:
+                logger.warning("Skipping partial RSSResult: %s", e)
+        return ParsedFeed(results, num_entries=num_entries)
+
+    @staticmethod
+    def _rss_result(item: ElementTree.Element) -> RSSResult:
+        """
+        Builds an `RSSResult` from an RSS `<item>`, or an Atom `<entry>` of an
+        Atom RSS feed, matching `RSSResult._from_feed_entry`.
+        """
+        title = summary = creator = announce_type = None
+        feed_date = _DEFAULT_TIME
+        journal_ref = doi = None
+        categories: List[str] = []
+        links: List[BaseResult.Link] = []
+
+        for child in item:
+            tag = child.tag
+            if tag in ("title", _ATOM + "title"):
+                title = element_text(child)
+            elif tag in ("description", _ATOM + "summary"):
+                summary = element_text(child)
+            elif tag == "pubDate":
+                feed_date = parse_rfc822_date(element_text(child))
+            elif tag == _ATOM + "published":
+                feed_date = parse_iso_date(element_text(child))
+            elif tag == "link":
+                links.append(_link({"href": element_text(child)}))
+            elif tag == _ATOM + "link":
+                if "href" in child.attrib:
+                    links.append(_link(child.attrib))
+            elif tag == "category":
+                categories.append(element_text(child))
+            elif tag == _ATOM + "category":
+                categories.append(child.get("term"))
+            elif tag == _DC + "creator":
+                if creator is None:
+                    creator = element_text(child)
+            elif tag.startswith(_ARXIV):
+                name = tag[len(_ARXIV) :].lower()
+                if name == "announce_type":
+                    announce_type = element_text(child)
+                elif name == "journal_ref":
+                    journal_ref = element_text(child)
+                elif name == "doi":
+                    doi = element_text(child)
+
+        if summary is None:
+            raise RSSResult.MissingFieldError("summary")
+        if creator is None:
+            raise RSSResult.MissingFieldError("authors")
+        if announce_type is None:
+            raise RSSResult.MissingFieldError("arxiv_announce_type")
+
+        short_id = summary.split(" ", 1)[0]
+        if "arxiv:" in summary.lower():
+            short_id = short_id[6:]
+        if title is None:
+            logger.warning("Result %s is missing title attribute; defaulting to '0'", short_id)
+            title = "0"
+        return RSSResult(
+            entry_id="https://arxiv.org/abs/" + short_id,
+            feed_date=feed_date,
+            title=collapse_whitespace(title),
+            authors=RSSResult._parse_authors(creator),
+            summary=summary.split("Abstract: ", 1)[-1],
+            announce_type=AnnounceType(announce_type),
+            journal_ref=journal_ref,
+            doi=doi,
+            categories=categories,
+            links=links,
+        )
+
+    def __repr__(self) -> str:
+        return "{}(fallback={})".format(_classname(self), repr(self.fallback))
+
+
+def entry_to_result(entry: ElementTree.Element) -> SearchResult:
+    """
+    Builds a `SearchResult` from an arXiv API Atom `<entry>`, matching
+    `SearchResult._from_feed_entry`. Shared by `ArxivParser` and
+    `AtomStreamParser`.
+
+    Raises:
+        SearchResult.MissingFieldError: If the entry has no `id`.
+    """
+    entry_id = title = None
+    summary = ""
+    updated = published = _DEFAULT_TIME
+    comment = journal_ref = doi = primary_category = None
+    authors: List[BaseResult.Author] = []
+    categories: List[str] = []
+    links: List[BaseResult.Link] = []
+
+    for child in entry:
+        tag = child.tag
+        if tag == _ATOM + "id":
+            entry_id = element_text(child)
+        elif tag == _ATOM + "title":
+            title = element_text(child)
+        elif tag == _ATOM + "summary":
+            summary = element_text(child)
+        elif tag == _ATOM + "updated":
+            updated = parse_iso_date(element_text(child))
+        elif tag == _ATOM + "published":
+            published = parse_iso_date(element_text(child))
+        elif tag == _ATOM + "author":
+            name = child.findtext(_ATOM + "name")
+            if name is not None:
+                authors.append(BaseResult.Author(name.strip()))
+        elif tag == _ATOM + "link":
+            if "href" in child.attrib:
+                links.append(_link(child.attrib))
+        elif tag == _ATOM + "category":
+            categories.append(child.get("term"))
+        elif tag.startswith(_ARXIV):
+            # Like feedparser, match arXiv extension elements case-insensitively.
+            name = tag[len(_ARXIV) :].lower()
+            if name == "primary_category":
+                primary_category = child.get("term")
+            elif name == "comment":
+                comment = element_text(child)
+            elif name == "journal_ref":
+                journal_ref = element_text(child)
+            elif name == "doi":
+                doi = element_text(child)
+
+    if entry_id is None:
+        raise SearchResult.MissingFieldError("id")
+    if title is None:
+        logger.warning("Result %s is missing title attribute; defaulting to '0'", entry_id)
+        title = "0"
+    return SearchResult(
+        entry_id=entry_id,
+        updated=updated,
+        published=published,
+        title=collapse_whitespace(title),
+        authors=authors,
+        summary=summary,
+        comment=comment,
+        journal_ref=journal_ref,
+        doi=doi,
+        primary_category=primary_category,
+        categories=categories,
+        links=links,
+    )
+
+
+def parse_detached(parser: BaseParser, content: bytes) -> ParsedFeed:
+    """
+    Parses `content` with `parser`, dropping the response body and any
+    feedparser output from the returned feed so that it's cheap to pickle back
+    from a worker process. `ParsedFeed.raw` is recomputed on demand once the
+    caller restores `ParsedFeed.content`.
+    """
+    parsed = parser.parse(content)
+    parsed.content = None
+    parsed._raw = None
+    return parsed
+
+
+def _link(attrib: dict) -> BaseResult.Link:
+    """
+    Builds a `Link` from link attributes, matching `Link._from_feed_link`.
+    """
+    return BaseResult.Link(
+        href=attrib["href"], title=attrib.get("title"), rel=attrib.get("rel", "alternate")
+    )
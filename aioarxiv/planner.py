@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, AsyncGenerator, List, Optional
+
+from aioarxiv.checkpoint import CheckpointStore, load_checkpoint, query_fingerprint
+from aioarxiv.models import SearchQuery, SearchResult, SortCriterion, SortOrder
+from aioarxiv.models.utilities import _classname, strip_arxiv_id_version
+
+if TYPE_CHECKING:
+    from aioarxiv.client import Client
+
+logger = logging.getLogger(__name__)
+
+# arXiv's `submittedDate` ranges have minute resolution and include both ends.
+_MINUTE = timedelta(minutes=1)
+_DATE_FORMAT = "%Y%m%d%H%M"
+
+ARXIV_EPOCH = datetime(1991, 8, 1, tzinfo=timezone.utc)
+"""The earliest submission date in arXiv."""
+
+
+def _floor_minute(dt: datetime) -> datetime:
+    """
+    Truncates `dt` to the minute, treating naive datetimes as UTC.
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.replace(second=0, microsecond=0)
+
+
+def date_window_query(query: str, start: datetime, end: datetime) -> str:
+    """
+    Restricts a search query to submissions between `start` and `end`
+    (inclusive, to the minute, in UTC).
+    """
+    window = "submittedDate:[{} TO {}]".format(
+        start.astimezone(timezone.utc).strftime(_DATE_FORMAT),
+        end.astimezone(timezone.utc).strftime(_DATE_FORMAT),
+    )
+    return "({}) AND {}".format(query, window) if query else window
+
+
+def _shard_query(query: SearchQuery, start: datetime, end: datetime) -> SearchQuery:
+    """
+    Restricts `query` to a shard's window, sorted so it pages in a stable order.
+    """
+    return SearchQuery(
+        query=date_window_query(query.query, start, end),
+        sort_by=SortCriterion.SubmittedDate,
+        sort_order=SortOrder.Ascending,
+    )
+
+
+class Shard(object):
+    """
+    A date window of a planned query, small enough to paginate shallowly.
+    """
+
+    query: SearchQuery
+    """The query restricted to this shard's window."""
+    start: datetime
+    """The first minute of the window."""
+    end: datetime
+    """The last minute of the window (inclusive)."""
+    count: int
+    """The number of results in the window when it was planned."""
+    estimated: bool
+    """
+    Whether `count` was inferred from the enclosing window's count rather than
+    probed directly.
+    """
+
+    def __init__(
+        self, query: SearchQuery, start: datetime, end: datetime, count: int, estimated: bool
+    ):
+        self.query = query
+        self.start = start
+        self.end = end
+        self.count = count
+        self.estimated = estimated
+
+    def __repr__(self) -> str:
+        return "{}(start={}, end={}, count={}, estimated={})".format(
+            _classname(self),
+            repr(self.start),
+            repr(self.end),
+            repr(self.count),
+            repr(self.estimated),
+        )
+
+
+class QueryPlanner(object):
+    """
+    Splits a broad search into `submittedDate` windows ("shards") of at most
+    `max_shard_size` results each, so it can be harvested past the API's
+    300,000-result ceiling without deep, slow and flaky offsets.
+
+    Windows are bisected until they're small enough, sized with one-result
+    "count probes" that read `opensearch:totalResults`. Only the earlier half
+    of each split is probed; the later half's count is inferred from the
+    enclosing window's. Probes pass through the client's rate limiter like any
+    other request.
+    """
+
+    client: Client
+    """The client used for probes and for fetching shards."""
+    max_shard_size: int
+    """Target maximum number of results per shard."""
+
+    def __init__(self, client: Client, max_shard_size: int = 10_000):
+        self.client = client
+        self.max_shard_size = max_shard_size
+
+    async def count(self, query: str, start: datetime, end: datetime) -> int:
+        """
+        Returns the number of results for `query` submitted between `start`
+        and `end`.
+        """
+        probe = SearchQuery(query=date_window_query(query, start, end))
+        url = self.client._format_url(probe, 0, 1)
+        page = await self.client._fetch_page(url, first_page=True)
+        return page.total_results or 0
+
+    async def plan(
+        self,
+        query: SearchQuery,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Shard]:
+        """
+        Splits `query` into shards covering submissions between `start`
+        (default: arXiv's first submission) and `end` (default: now), in
+        chronological order. Empty windows are dropped.
+
+        A single minute holding more than `max_shard_size` results can't be
+        split further, and becomes an oversized shard.
+        """
+        if not query.query:
+            raise ValueError("Only `query` searches can be planned; use get_by_ids for ID lists")
+        start = _floor_minute(start or ARXIV_EPOCH)
+        end = _floor_minute(end or datetime.now(timezone.utc))
+        total = await self.count(query.query, start, end)
+        shards = await self._split(query, start, end, total, estimated=False)
+        logger.info("Planned %d shards for %d results: %s", len(shards), total, query.query)
+        return shards
+
+    async def _split(
+        self, query: SearchQuery, start: datetime, end: datetime, count: int, estimated: bool
+    ) -> List[Shard]:
+        if count == 0 and not estimated:
+            return []
+        if count <= self.max_shard_size or start >= end:
+            if count > self.max_shard_size:
+                logger.warning("Window %s holds %d results; can't split it further", start, count)
+            return [Shard(_shard_query(query, start, end), start, end, count, estimated)]
+
+        mid = _floor_minute(start + (end - start) / 2)
+        left_count = await self.count(query.query, start, mid)
+        right_count = max(count - left_count, 0)
+        left, right = await asyncio.gather(
+            self._split(query, start, mid, left_count, estimated=False),
+            self._split(query, mid + _MINUTE, end, right_count, estimated=True),
+        )
+        return left + right
+
+    async def results(
+        self,
+        query: SearchQuery,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> AsyncGenerator[SearchResult, None]:
+        """
+        Plans `query` and fetches its shards one after another, yielding their
+        results as one stream in submission order. Results are deduplicated by
+        unversioned ID, and `query.max_results` is respected.
+        """
+        shards = await self.plan(query, start, end)
+        seen = set()
+        remaining = query.max_results
+        for shard in shards:
+            results = self.client.results(shard.query)
+            try:
+                async for result in results:
+                    key = strip_arxiv_id_version(result.get_short_id())
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield result
+                    if remaining is not None:
+                        remaining -= 1
+                        if remaining <= 0:
+                            return
+            finally:
+                await results.aclose()
+
+    async def harvest(
+        self,
+        query: SearchQuery,
+        store: CheckpointStore,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        key: Optional[str] = None,
+    ) -> AsyncGenerator[SearchResult, None]:
+        """
+        Like `results`, but resumable: the plan and a cursor into it are saved
+        to `store`, as in `Client.harvest`. A resumed harvest keeps its
+        original plan, so results submitted after it was planned are excluded.
+        """
+        fingerprint = query_fingerprint(query, start, end)
+        key = key or fingerprint
+        checkpoint = load_checkpoint(store, key, fingerprint)
+        if checkpoint.shards is None:
+            shards = await self.plan(query, start, end)
+            checkpoint.shards = [(shard.start, shard.end) for shard in shards]
+            store.save(key, checkpoint)
+
+        queries = [_shard_query(query, start, end) for start, end in checkpoint.shards]
+        harvest = self.client._harvest(queries, query.max_results, checkpoint, store, key)
+        try:
+            async for result in harvest:
+                yield result
+        finally:
+            await harvest.aclose()
+
+    def __repr__(self) -> str:
+        return "{}(max_shard_size={})".format(_classname(self), repr(self.max_shard_size))
@@ -0,0 +1,541 @@
+from __future__ import annotations
+
+import functools
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Sequence, Tuple, cast
+
+from aioarxiv.models import BaseResult
+from aioarxiv.models.utilities import (
+    _DEFAULT_TIME,
+    _classname,
+    normalize_arxiv_id,
+    strip_arxiv_id_version,
+)
+
+TEXT_FIELDS = ("ti", "au", "abs", "co", "jr", "cat", "rn", "id", "all")
+"""The search query field prefixes that match text, e.g. `ti:electron`."""
+
+DATE_FIELDS = ("submittedDate", "lastUpdatedDate")
+"""The search query fields that match date ranges, e.g. `submittedDate:[... TO ...]`."""
+
+# Fields matched verbatim (apart from case) rather than as words.
+_EXACT_FIELDS = ("cat", "id")
+# The result attributes matched by each date field.
+_DATE_ATTRIBUTES = {"submittedDate": "published", "lastUpdatedDate": "updated"}
+_OPERATORS = ("AND", "OR", "ANDNOT")
+
+_MINUTE = timedelta(minutes=1)
+_DATE_FORMAT = "%Y%m%d%H%M"
+
+_SPACE = re.compile(r"\s+")
+_FIELD = re.compile(r"([A-Za-z]+):")
+_BARE = re.compile(r'[^\s()"]+')
+_PHRASE = re.compile(r'"([^"]*)"')
+_RANGE = re.compile(r"\[\s*(\d{12})\s+TO\s+(\d{12})\s*\]")
+_WORD = re.compile(r"[^\W_]+")
+_FIELD_NAMES = {name.lower(): name for name in TEXT_FIELDS + DATE_FIELDS}
+
+
+class QuerySyntaxError(ValueError):
+    """
+    Raised by `parse_query` for a search query that isn't valid arXiv search
+    syntax.
+    """
+
+    query: str
+    """The query that couldn't be parsed."""
+    position: int
+    """The offset in `query` at which parsing failed."""
+
+    def __init__(self, query: str, position: int, message: str):
+        self.query = query
+        self.position = position
+        super().__init__("{} at position {}: {!r}".format(message, position, query))
+
+
+def _fold(text: str) -> str:
+    """
+    Lowercases `text` and strips its accents, so `"Schrödinger"` matches
+    `"schrodinger"`.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def _words(text: str) -> List[str]:
+    """
+    Splits `text` into folded words, treating punctuation (including `_`, as
+    in `au:del_maestro`) as a separator, like SQLite's `unicode61` tokenizer.
+    """
+    return _WORD.findall(_fold(text))
+
+
+def _contains_phrase(text: Optional[str], phrase: Sequence[str], prefix: bool) -> bool:
+    """
+    Whether the words of `text` include `phrase` as a run of consecutive
+    words, with the last word of `phrase` only a prefix if `prefix`.
+    """
+    if not text or not phrase:
+        return False
+    words = _words(text)
+    *head, last = phrase
+    for i in range(len(words) - len(phrase) + 1):
+        word = words[i + len(head)]
+        if (word.startswith(last) if prefix else word == last) and words[i : i + len(head)] == head:
+            return True
+    return False
+
+
+class QueryNode(object):
+    """
+    A node of a parsed search query; see `parse_query`.
+
+    Nodes are normalized as they're built, so equivalent queries compare equal
+    and render to the same canonical string with `str`.
+    """
+
+    def matches(self, result: BaseResult) -> bool:
+        """
+        Evaluates the query against a result held locally.
+        """
+        raise NotImplementedError
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self) and str(other) == str(self)
+
+    def __hash__(self) -> int:
+        return hash((type(self), str(self)))
+
+    def __repr__(self) -> str:
+        return "{}({})".format(_classname(self), repr(str(self)))
+
+
+class Term(QueryNode):
+    """
+    A word or quoted phrase, optionally restricted to a field, e.g.
+    `ti:"quantum criticality"`. A trailing `*` on an unquoted term matches
+    words by prefix.
+    """
+
+    field: Optional[str]
+    """The field prefix, e.g. `"ti"`; `None` for a bare term."""
+    text: str
+    """The term's text, lowercased unless it's an exact (`cat` or `id`) term."""
+    phrase: bool
+    """Whether the term is a quoted phrase."""
+    prefix: bool
+    """Whether the term's last word is a prefix, e.g. `electr*`."""
+    words: Tuple[str, ...]
+    """The term's words, folded for matching."""
+
+    def __init__(self, field: Optional[str], text: str, phrase: bool = False):
+        text = _SPACE.sub(" ", text).strip()
+        self.field = field
+        self.text = text if field in _EXACT_FIELDS else text.lower()
+        self.prefix = not phrase and text.endswith("*")
+        # A quoted single word is the same as an unquoted one.
+        self.phrase = phrase and not (_BARE.fullmatch(text) and not text.endswith("*"))
+        self.words = tuple(_words(self.text))
+
+    def matches(self, result: BaseResult) -> bool:
+        field = self.field or "all"
+        if field == "id":
+            short_id = normalize_arxiv_id(self.text)
+            if short_id is None:
+                return False
+            result_id = result.get_short_id()
+            if short_id == strip_arxiv_id_version(short_id):
+                result_id = strip_arxiv_id_version(result_id)
+            return result_id == short_id
+        if field == "cat":
+            return any(self._matches_category(c) for c in result.categories)
+        if field == "rn":
+            # Report numbers aren't part of results.
+            return False
+        values = []
+        if field in ("ti", "all"):
+            values.append(result.title)
+        if field in ("au", "all"):
+            values.extend(author.name for author in result.authors)
+        if field in ("abs", "all"):
+            values.append(result.summary)
+        if field in ("co", "all"):
+            values.append(getattr(result, "comment", None))
+        if field in ("jr", "all"):
+            values.append(result.journal_ref)
+        if field == "all":
+            values.extend(result.categories)
+        return any(_contains_phrase(value, self.words, self.prefix) for value in values)
+
+    def _matches_category(self, category: str) -> bool:
+        if self.prefix:
+            return category.lower().startswith(self.text[:-1].lower())
+        return category.lower() == self.text.lower()
+
+    def __str__(self) -> str:
+        text = self.text
+        if self.phrase or text in _OPERATORS:
+            text = '"{}"'.format(text)
+        return "{}:{}".format(self.field, text) if self.field else text
+
+
+class DateRange(QueryNode):
+    """
+    A date field restricted to a range, e.g. `submittedDate:[202401010000 TO
+    202401312359]`. Both ends are inclusive, to the minute, in UTC.
+    """
+
+    field: str
+    """The date field, `"submittedDate"` or `"lastUpdatedDate"`."""
+    start: datetime
+    """The first minute of the range."""
+    end: datetime
+    """The last minute of the range."""
+
+    def __init__(self, field: str, start: datetime, end: datetime):
+        self.field = field
+        self.start = start
+        self.end = end
+
+    @property
+    def attribute(self) -> str:
+        """The result attribute the range applies to, e.g. `"published"`."""
+        return _DATE_ATTRIBUTES[self.field]
+
+    def matches(self, result: BaseResult) -> bool:
+        value = getattr(result, self.attribute, None)
+        if value is None or value == _DEFAULT_TIME:
+            return False
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return self.start <= value < self.end + _MINUTE
+
+    def __str__(self) -> str:
+        return "{}:[{} TO {}]".format(
+            self.field, self.start.strftime(_DATE_FORMAT), self.end.strftime(_DATE_FORMAT)
+        )
+
+
+class And(QueryNode):
+    """
+    Matches results matching every operand.
+    """
+
+    operands: List[QueryNode]
+    """The operands, in canonical order."""
+
+    def __init__(self, operands: Iterable[QueryNode]):
+        self.operands = list(operands)
+
+    def matches(self, result: BaseResult) -> bool:
+        return all(operand.matches(result) for operand in self.operands)
+
+    def __str__(self) -> str:
+        return " AND ".join(_group(operand) for operand in self.operands)
+
+
+class Or(QueryNode):
+    """
+    Matches results matching any operand.
+    """
+
+    operands: List[QueryNode]
+    """The operands, in canonical order."""
+
+    def __init__(self, operands: Iterable[QueryNode]):
+        self.operands = list(operands)
+
+    def matches(self, result: BaseResult) -> bool:
+        return any(operand.matches(result) for operand in self.operands)
+
+    def __str__(self) -> str:
+        return " OR ".join(_group(operand) for operand in self.operands)
+
+
+class AndNot(QueryNode):
+    """
+    Matches results matching `include` but not `exclude`.
+    """
+
+    include: QueryNode
+    """The query results must match."""
+    exclude: QueryNode
+    """The query results must not match."""
+
+    def __init__(self, include: QueryNode, exclude: QueryNode):
+        self.include = include
+        self.exclude = exclude
+
+    def matches(self, result: BaseResult) -> bool:
+        return self.include.matches(result) and not self.exclude.matches(result)
+
+    def __str__(self) -> str:
+        return "{} ANDNOT {}".format(_group(self.include), _group(self.exclude))
+
+
+def _group(node: QueryNode) -> str:
+    """
+    Renders an operand, parenthesized if it's itself an operation.
+    """
+    if isinstance(node, (Term, DateRange)):
+        return str(node)
+    return "({})".format(node)
+
+
+def _combine(cls: type, operands: List[QueryNode]) -> QueryNode:
+    """
+    Builds an `And` or `Or`, flattening nested operations of the same kind
+    and dropping duplicate operands, in a canonical order.
+    """
+    flat = {}
+    for operand in operands:
+        for node in operand.operands if isinstance(operand, cls) else [operand]:
+            flat[str(node)] = node
+    if len(flat) == 1:
+        return next(iter(flat.values()))
+    return cls(flat[key] for key in sorted(flat))
+
+
+def _tokenize(query: str) -> List[Tuple[str, object, int]]:
+    """
+    Splits a query into `(kind, value, position)` tokens: `"("`, `")"`,
+    `"op"`, `"field"` (a field prefix before a parenthesized group), `"term"`
+    and `"range"`.
+    """
+    tokens = []
+    position = 0
+    while True:
+        while position < len(query) and query[position].isspace():
+            position += 1
+        if position == len(query):
+            return tokens
+        start = position
+        char = query[position]
+        if char in "()":
+            tokens.append((char, None, start))
+            position += 1
+            continue
+
+        field = None
+        match = _FIELD.match(query, position)
+        if match:
+            field = _FIELD_NAMES.get(match.group(1).lower())
+            if field is None:
+                raise QuerySyntaxError(query, start, "Unknown field {!r}".format(match.group(1)))
+            position = match.end()
+
+        if field in DATE_FIELDS:
+            match = _RANGE.match(query, position)
+            if match is None:
+                raise QuerySyntaxError(
+                    query,
+                    position,
+                    "Expected [YYYYMMDDTTTT TO YYYYMMDDTTTT] after {}:".format(field),
+                )
+            start_date, end_date = (_parse_minute(query, position, m) for m in match.groups())
+            tokens.append(("range", DateRange(field, start_date, end_date), start))
+            position = match.end()
+        elif query.startswith("(", position) and field:
+            tokens.append(("field", field, start))
+        elif query.startswith('"', position):
+            match = _PHRASE.match(query, position)
+            if match is None:
+                raise QuerySyntaxError(query, position, "Unterminated phrase")
+            tokens.append(("term", (field, match.group(1), True), start))
+            position = match.end()
+        else:
+            match = _BARE.match(query, position)
+            if match is None:
+                raise QuerySyntaxError(query, position, "Expected a term")
+            word = match.group()
+            if field is None and word in _OPERATORS:
+                tokens.append(("op", word, start))
+            else:
+                tokens.append(("term", (field, word, False), start))
+            position = match.end()
+
+
+def _parse_minute(query: str, position: int, value: str) -> datetime:
+    try:
+        return datetime.strptime(value, _DATE_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise QuerySyntaxError(query, position, "Invalid date {!r}".format(value)) from None
+
+
+class _Parser(object):
+    """
+    A recursive-descent parser over `_tokenize`'s tokens. `AND` and `ANDNOT`
+    bind tighter than `OR`; adjacent terms without an operator are ANDed.
+    """
+
+    def __init__(self, query: str):
+        self.query = query
+        self.tokens = _tokenize(query)
+        self.position = 0
+
+    def parse(self) -> QueryNode:
+        if not self.tokens:
+            raise QuerySyntaxError(self.query, 0, "Empty query")
+        node = self._or(None)
+        if self.position < len(self.tokens):
+            raise self._error("Unexpected {!r}".format(self._peek()[0]))
+        return node
+
+    def _peek(self) -> Optional[Tuple[str, object, int]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _error(self, message: str) -> QuerySyntaxError:
+        token = self._peek()
+        return QuerySyntaxError(self.query, token[2] if token else len(self.query), message)
+
+    def _or(self, field: Optional[str]) -> QueryNode:
+        operands = [self._and(field)]
+        while self._peek() is not None and self._peek()[:2] == ("op", "OR"):
+            self.position += 1
+            operands.append(self._and(field))
+        return _combine(Or, operands)
+
+    def _and(self, field: Optional[str]) -> QueryNode:
+        node = self._operand(field)
+        while True:
+            token = self._peek()
+            if token is None or token[0] == ")" or token[:2] == ("op", "OR"):
+                return node
+            if token[:2] == ("op", "ANDNOT"):
+                self.position += 1
+                node = AndNot(node, self._operand(field))
+                continue
+            if token[:2] == ("op", "AND"):
+                self.position += 1
+            node = _combine(And, [node, self._operand(field)])
+
+    def _operand(self, field: Optional[str]) -> QueryNode:
+        token = self._peek()
+        if token is None:
+            raise self._error("Unexpected end of query")
+        kind, value, _ = token
+        self.position += 1
+        if kind == "term":
+            term_field, text, phrase = value
+            return Term(term_field or field, text, phrase)
+        if kind == "range":
+            return value
+        if kind == "field":
+            # A field applied to a group, e.g. `ti:(quantum OR classical)`.
+            self.position += 1
+            return self._group(value)
+        if kind == "(":
+            return self._group(field)
+        self.position -= 1
+        raise self._error("Unexpected {!r}".format(value or kind))
+
+    def _group(self, field: Optional[str]) -> QueryNode:
+        node = self._or(field)
+        token = self._peek()
+        if token is None or token[0] != ")":
+            raise self._error("Expected ')'")
+        self.position += 1
+        return node
+
+
+def parse_query(query: str) -> QueryNode:
+    """
+    Parses a `SearchQuery.query` in the [arXiv search query
+    syntax](https://info.arxiv.org/help/api/user-manual.html#query_details)
+    into a tree of `QueryNode`s, e.g.
+
+        parse_query('au:del_maestro AND (ti:checkerboard OR abs:"spin liquid")')
+
+    Supports the `ti`, `au`, `abs`, `co`, `jr`, `cat`, `rn`, `id` and `all`
+    field prefixes, `submittedDate` and `lastUpdatedDate` ranges, `AND`,
+    `OR` and `ANDNOT`, parentheses and quoted phrases. `AND` and `ANDNOT`
+    bind tighter than `OR`, and adjacent terms are ANDed.
+
+    The tree can be evaluated against results held locally with
+    `QueryNode.matches`, or run against a `LocalIndex` with
+    `LocalIndex.results`. Local matching is by whole words (or `*` prefixes),
+    without the stemming arXiv's search applies.
+
+    Raises:
+        QuerySyntaxError: If `query` isn't valid search syntax.
+    """
+    return _Parser(query).parse()
+
+
+@functools.lru_cache(maxsize=1024)
+def canonical_query(query: str) -> str:
+    """
+    Returns a canonical form of a search query, so query strings which are
+    certain to mean the same to arXiv share cache keys. An empty query stays
+    empty.
+
+    Only lossless rewrites are made: whitespace is collapsed, parentheses
+    around a single operand are dropped, and the operands of a group joined
+    by one explicit `AND` or `OR` throughout are sorted. arXiv doesn't
+    document how adjacent terms combine or how mixed operators bind, so
+    those are left as written, as is the text of each term. Unlike
+    `parse_query`, `ti:quantum computing` and `ti:quantum AND computing`
+    have different canonical forms.
+
+    Raises:
+        QuerySyntaxError: If `query` isn't valid search syntax.
+    """
+    if not query.strip():
+        return ""
+    parse_query(query)
+    text, _, _ = _canonical_group(query, _tokenize(query), 0)
+    return text
+
+
+def _canonical_group(
+    query: str, tokens: List[Tuple[str, object, int]], position: int
+) -> Tuple[str, bool, int]:
+    """
+    Renders the operands and operators of a well-formed query from
+    `tokens[position]` up to the group's closing parenthesis (or the end).
+    Returns the rendered group, whether it must be parenthesized as an
+    operand, and the position of the closing parenthesis.
+    """
+    operands: List[Tuple[str, bool]] = []
+    operators: List[str] = []
+    while position < len(tokens) and tokens[position][0] != ")":
+        kind, value, start = tokens[position]
+        if kind == "op":
+            operators.append(cast(str, value))
+            position += 1
+            continue
+        if len(operators) < len(operands):
+            operators.append("")  # Adjacent operands, without an operator.
+        if kind == "(":
+            text, grouped, position = _canonical_group(query, tokens, position + 1)
+            operands.append((text, grouped))
+        elif kind == "field":
+            # A field applied to a group, e.g. `ti:(quantum OR classical)`.
+            field = query[start : tokens[position + 1][2]]
+            text, _, position = _canonical_group(query, tokens, position + 2)
+            operands.append(("{}({})".format(field, text), False))
+        else:
+            end = tokens[position + 1][2] if position + 1 < len(tokens) else len(query)
+            text = query[start:end].strip()
+            if kind == "range":
+                date_range = cast(DateRange, value)
+                text = "{}:[{} TO {}]".format(
+                    text.split(":", 1)[0],
+                    date_range.start.strftime(_DATE_FORMAT),
+                    date_range.end.strftime(_DATE_FORMAT),
+                )
+            operands.append((_SPACE.sub(" ", text), False))
+        position += 1
+
+    if len(operands) == 1:
+        text, grouped = operands[0]
+        return text, grouped, position
+    rendered = ["({})".format(text) if grouped else text for text, grouped in operands]
+    if len(set(operators)) == 1 and operators[0] in ("AND", "OR"):
+        rendered.sort()
+    text = rendered[0]
+    for operator, operand in zip(operators, rendered[1:]):
+        text += " {} {}".format(operator, operand) if operator else " " + operand
+    return text, True, position
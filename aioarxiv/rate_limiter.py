@@ -2,21 +2,202 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import struct
+import time
 from contextlib import asynccontextmanager
-from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
+
+from yarl import URL
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
 
-class AsyncRateLimiter:
-    """A rate limiter for async contexts."""
+class BaseRateLimiter(object):
+    """
+    A base class for rate limiters usable by `Client` and the download methods.
+
+    Subclasses implement `acquire` as an async context manager which returns
+    once the caller may start its request.
+    """
+
+    def acquire(self):
+        """
+        Acquires the rate limiter, waiting if necessary.
+        Usage:
+            async with rate_limiter.acquire():
+                # do rate-limited work here
+        """
+        raise NotImplementedError
+
+
+class AsyncRateLimiter(BaseRateLimiter):
+    """
+    A rate limiter for async contexts.
 
-    def __init__(self, calls: int = 1, period: float = 3.0):
+    Rather than holding a lock for the duration of a request, the limiter hands
+    out request start times ("slots") spaced `period / calls` seconds apart on a
+    monotonic clock. A caller waits for its slot and is then released at once,
+    so slow requests may overlap in flight while their start times stay
+    compliant.
+    """
+
+    calls: int
+    """Number of requests allowed to start per `period`."""
+    period: float
+    """Length of the rate-limiting window, in seconds."""
+    clock: Callable[[], float]
+    """
+    A monotonic clock returning seconds; `time.monotonic` unless a different
+    clock is injected (e.g. in tests).
+    """
+
+    def __init__(
+        self, calls: int = 1, period: float = 3.0, clock: Callable[[], float] = time.monotonic
+    ):
         self.calls = calls
         self.period = period
-        self.lock = asyncio.Lock()
-        self._last_request_dt: Optional[datetime] = None
+        self.clock = clock
+        self._last_slot: Optional[float] = None
+
+    @property
+    def interval(self) -> float:
+        """Minimum number of seconds between consecutive request starts."""
+        return self.period / self.calls
+
+    def _reserve(self) -> float:
+        """
+        Reserves the next free start slot and returns it.
+        """
+        now = self.clock()
+        if self._last_slot is None:
+            slot = now
+        else:
+            slot = max(now, self._last_slot + self.interval)
+        self._last_slot = slot
+        return slot
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Acquires the rate limiter, waiting if necessary.
+        Usage:
+            async with rate_limiter.acquire():
+                # do rate-limited work here
+        """
+        previous_slot = self._last_slot
+        slot = self._reserve()
+        to_sleep = slot - self.clock()
+        if to_sleep > 0:
+            logger.info("Sleeping: %f seconds", to_sleep)
+            try:
+                await asyncio.sleep(to_sleep)
+            except asyncio.CancelledError:
+                # Hand the slot back if nobody has reserved one after it.
+                if self._last_slot == slot:
+                    self._last_slot = previous_slot
+                raise
+        yield
+
+
+class SharedRateLimiter(BaseRateLimiter):
+    """
+    A rate limiter shared by every process on a machine that points it at the
+    same file.
+
+    Like `AsyncRateLimiter`, it hands out request start slots spaced
+    `period / calls` seconds apart, but the last reserved slot lives in a small
+    file guarded by an exclusive `flock`, so worker processes with separate
+    `Client`s together stay within one budget. The file lock is held only while
+    a slot is reserved, never while waiting or during the request.
+
+    Only available on POSIX platforms.
+    """
+
+    path: str
+    """Path of the file holding the shared state; created if missing."""
+    calls: int
+    """Number of requests allowed to start per `period`, across all processes."""
+    period: float
+    """Length of the rate-limiting window, in seconds."""
+    clock: Callable[[], float]
+    """
+    A clock returning seconds that is shared by every process; `time.time`
+    unless a different clock is injected (e.g. in tests). `time.monotonic`
+    isn't used because its reference point may differ between processes.
+    """
+
+    _SLOT = struct.Struct(">d")
+
+    def __init__(
+        self,
+        path: str,
+        calls: int = 1,
+        period: float = 3.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        if fcntl is None:
+            raise RuntimeError("SharedRateLimiter requires fcntl (POSIX platforms only)")
+        self.path = path
+        self.calls = calls
+        self.period = period
+        self.clock = clock
+
+    @property
+    def interval(self) -> float:
+        """Minimum number of seconds between consecutive request starts."""
+        return self.period / self.calls
+
+    def _update(self, update: Callable[[Optional[float]], Optional[float]]) -> Optional[float]:
+        """
+        Calls `update` with the last reserved slot while holding the file lock,
+        stores the slot it returns, and returns the previously stored slot.
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.pread(fd, self._SLOT.size, 0)
+            previous = self._SLOT.unpack(raw)[0] if len(raw) == self._SLOT.size else None
+            slot = update(previous)
+            if slot is not None:
+                os.pwrite(fd, self._SLOT.pack(slot), 0)
+            return previous
+        finally:
+            # Closing the descriptor releases the lock.
+            os.close(fd)
+
+    def _reserve(self) -> Tuple[Optional[float], float]:
+        """
+        Reserves the next free start slot across processes, returning the
+        previously reserved slot and the new one.
+        """
+        reserved = []
+
+        def next_slot(previous: Optional[float]) -> float:
+            now = self.clock()
+            slot = now if previous is None else max(now, previous + self.interval)
+            reserved.append(slot)
+            return slot
+
+        previous = self._update(next_slot)
+        return previous, reserved[0]
+
+    def _release(self, previous: Optional[float], slot: float):
+        """
+        Hands `slot` back if no other process has reserved a later one.
+        """
+
+        def restore(current: Optional[float]) -> Optional[float]:
+            if current != slot:
+                return None
+            return previous if previous is not None else float("-inf")
+
+        self._update(restore)
 
     @asynccontextmanager
     async def acquire(self):
@@ -26,15 +207,171 @@ class AsyncRateLimiter:
             async with rate_limiter.acquire():
                 # do rate-limited work here
         """
-        async with self.lock:
-            if self._last_request_dt is not None:
-                required = timedelta(seconds=self.period)
-                since_last_request = datetime.now() - self._last_request_dt
-                if since_last_request < required:
-                    to_sleep = (required - since_last_request).total_seconds()
-                    logger.info("Sleeping: %f seconds", to_sleep)
-                    await asyncio.sleep(to_sleep)
+        loop = asyncio.get_running_loop()
+        previous, slot = await loop.run_in_executor(None, self._reserve)
+        to_sleep = slot - self.clock()
+        if to_sleep > 0:
+            logger.info("Sleeping: %f seconds", to_sleep)
             try:
-                yield
+                await asyncio.sleep(to_sleep)
+            except asyncio.CancelledError:
+                await loop.run_in_executor(None, self._release, previous, slot)
+                raise
+        yield
+
+
+class TokenBucketRateLimiter(BaseRateLimiter):
+    """
+    A token-bucket rate limiter for async contexts.
+
+    The bucket holds up to `burst` tokens and refills at `rate` tokens per
+    second; each request consumes one token. Requests arriving at an empty
+    bucket reserve a future token and wait for it, so at most `rate` requests
+    start per second on average with bursts of up to `burst`.
+    """
+
+    rate: float
+    """Number of tokens added to the bucket per second."""
+    burst: int
+    """Capacity of the bucket: the largest burst of back-to-back requests."""
+    max_queue: Optional[int]
+    """
+    Maximum number of callers allowed to wait for a token at once; further
+    callers get a `TokenBucketRateLimiter.QueueFullError`. `None` for no limit.
+    """
+    clock: Callable[[], float]
+    """
+    A monotonic clock returning seconds; `time.monotonic` unless a different
+    clock is injected (e.g. in tests).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        max_queue: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.max_queue = max_queue
+        self.clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._waiting = 0
+        # Number of tokens taken so far, identifying the latest reservation.
+        self._reservations = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for a token."""
+        return self._waiting
+
+    def _reserve(self) -> float:
+        """
+        Takes a token from the bucket, going into debt if it is empty, and
+        returns the number of seconds until that token is available.
+        """
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        self._reservations += 1
+        return max(0.0, -self._tokens / self.rate)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Acquires a token, waiting if necessary.
+        Usage:
+            async with rate_limiter.acquire():
+                # do rate-limited work here
+
+        Raises a `TokenBucketRateLimiter.QueueFullError` without waiting if
+        `max_queue` callers are already waiting.
+        """
+        to_sleep = self._reserve()
+        reservation = self._reservations
+        if to_sleep > 0:
+            if self.max_queue is not None and self._waiting >= self.max_queue:
+                self._tokens += 1
+                raise self.QueueFullError(self.max_queue)
+            logger.info("Sleeping: %f seconds", to_sleep)
+            self._waiting += 1
+            try:
+                await asyncio.sleep(to_sleep)
+            except asyncio.CancelledError:
+                # Return the reserved token to the bucket if nobody has
+                # reserved one after it: later waiters' wake-up times already
+                # count it, and a refund would hand theirs out again.
+                if self._reservations == reservation:
+                    self._tokens += 1
+                raise
             finally:
-                self._last_request_dt = datetime.now()
+                self._waiting -= 1
+        yield
+
+    class QueueFullError(Exception):
+        """
+        An error raised when a request would exceed a limiter's `max_queue`.
+        """
+
+        max_queue: int
+        """The queue depth that was exceeded."""
+        message: str
+        """Message describing what caused this error."""
+
+        def __init__(self, max_queue: int):
+            self.max_queue = max_queue
+            self.message = "Rate limiter queue is full ({} waiting)".format(max_queue)
+            super().__init__(self.message)
+
+
+class RateLimiterRegistry(object):
+    """
+    A set of rate limiters keyed by host, so that requests to different arXiv
+    endpoints (the query API, RSS feeds, PDF and source downloads) draw from
+    separate budgets.
+
+    Hosts without a registered limiter get one from `default_factory` on first
+    use.
+    """
+
+    default_factory: Callable[[], BaseRateLimiter]
+    """Builds the limiter for a host that has none registered."""
+
+    def __init__(
+        self,
+        default_factory: Callable[[], BaseRateLimiter],
+        limiters: Optional[Dict[str, BaseRateLimiter]] = None,
+    ):
+        self.default_factory = default_factory
+        self._limiters: Dict[str, BaseRateLimiter] = dict(limiters or {})
+
+    def register(self, host: str, limiter: BaseRateLimiter):
+        """
+        Uses `limiter` for every request to `host`, e.g. `"export.arxiv.org"`.
+        """
+        self._limiters[host.lower()] = limiter
+
+    def get(self, host: str) -> BaseRateLimiter:
+        """
+        Returns the limiter for `host`, creating it if necessary.
+        """
+        host = host.lower()
+        if host not in self._limiters:
+            self._limiters[host] = self.default_factory()
+        return self._limiters[host]
+
+    def for_url(self, url: str) -> BaseRateLimiter:
+        """
+        Returns the limiter for the host of `url`.
+        """
+        return self.get(URL(str(url)).host or "")
+
+    def __contains__(self, host: str) -> bool:
+        return host.lower() in self._limiters
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Mapping, Optional
+
+from aioarxiv.errors import HTTPError
+from aioarxiv.models.utilities import _classname
+
+DEFAULT_STATUS_RULES: Dict[int, Optional[float]] = {400: None, 404: None}
+"""
+Default `RetryPolicy.status_rules`: malformed queries (400) and missing
+resources (404) fail the same way on every try, so they aren't retried.
+"""
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Parses a `Retry-After` header into a number of seconds to wait.
+
+    The header holds either a number of seconds or an HTTP date. Returns `None`
+    if the header is absent or unparseable.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (retry_at - now).total_seconds())
+
+
+class RetryPolicy(object):
+    """
+    Decides whether, and after how long, `Client` retries a failed request.
+
+    The delay before retry `n` (1 for the first retry) is
+    `backoff_base * backoff_factor ** (n - 1)`, capped at `backoff_max` and
+    randomly shortened by up to `jitter` of its length so that concurrent
+    clients don't retry in lockstep. A `Retry-After` header on the failed
+    response raises the delay to at least the time the server asked for.
+
+    The delay comes on top of the client's rate limiting: a retry never starts
+    sooner than `Client.delay_seconds` after the previous request.
+    """
+
+    max_retries: int
+    """
+    Number of times to retry a failing request before raising an Exception.
+    """
+    backoff_base: float
+    """Delay before the first retry, in seconds."""
+    backoff_factor: float
+    """Factor by which the delay grows with each further retry."""
+    backoff_max: float
+    """Upper bound on the computed backoff delay, in seconds."""
+    jitter: float
+    """
+    Fraction of each delay which is randomized: `0` for fixed delays, `1` to
+    draw each delay uniformly between zero and its computed length.
+    """
+    max_retry_time: Optional[float]
+    """
+    Upper bound on the time spent on one request across all tries, in seconds.
+    A retry which would start after this much time has passed is not made.
+    `None` for no bound.
+    """
+    status_rules: Dict[int, Optional[float]]
+    """
+    Per-status overrides for `HTTPError`s, keyed by HTTP status. A number
+    replaces `backoff_base` for that status; `None` marks the status as not
+    retryable. Rules passed to the constructor extend `DEFAULT_STATUS_RULES`.
+    """
+    respect_retry_after: bool
+    """Whether to wait at least as long as a `Retry-After` header asks."""
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 3.0,
+        backoff_factor: float = 2.0,
+        backoff_max: float = 60.0,
+        jitter: float = 0.5,
+        max_retry_time: Optional[float] = None,
+        status_rules: Optional[Mapping[int, Optional[float]]] = None,
+        respect_retry_after: bool = True,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        Constructs a retry policy with the specified options.
+        """
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.max_retry_time = max_retry_time
+        self.status_rules = dict(DEFAULT_STATUS_RULES)
+        self.status_rules.update(status_rules or {})
+        self.respect_retry_after = respect_retry_after
+        self._rng = rng
+
+    def __repr__(self) -> str:
+        return (
+            "{}(max_retries={}, backoff_base={}, backoff_factor={}, backoff_max={}, "
+            "jitter={}, max_retry_time={}, status_rules={}, respect_retry_after={})"
+        ).format(
+            _classname(self),
+            repr(self.max_retries),
+            repr(self.backoff_base),
+            repr(self.backoff_factor),
+            repr(self.backoff_max),
+            repr(self.jitter),
+            repr(self.max_retry_time),
+            repr(self.status_rules),
+            repr(self.respect_retry_after),
+        )
+
+    def delay(self, err: Exception, retry: int, elapsed: float = 0.0) -> Optional[float]:
+        """
+        Returns the number of seconds to wait before retry number `retry` (1
+        for the first retry) after `err`, or `None` if the request should not
+        be retried.
+
+        `elapsed` is the time already spent on the request across all tries.
+        """
+        if retry > self.max_retries:
+            return None
+
+        base = self.backoff_base
+        if isinstance(err, HTTPError) and err.status in self.status_rules:
+            base = self.status_rules[err.status]
+            if base is None:
+                return None
+
+        delay = min(self.backoff_max, base * self.backoff_factor ** (retry - 1))
+        delay -= delay * self.jitter * self._rng()
+
+        retry_after = getattr(err, "retry_after", None)
+        if self.respect_retry_after and retry_after is not None:
+            delay = max(delay, retry_after)
+
+        if self.max_retry_time is not None and elapsed + delay > self.max_retry_time:
+            return None
+        return delay
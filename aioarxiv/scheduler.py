@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from aioarxiv.models.utilities import _classname
+from aioarxiv.rate_limiter import BaseRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """
+    A request's priority class in a `FairScheduler`. Requests of a lower value
+    are always started before waiting requests of a higher value.
+    """
+
+    Interactive = 0
+    """Requests someone is waiting on, e.g. the first page of a query."""
+    Bulk = 1
+    """Background requests, e.g. later pages of a long pagination or a backfill."""
+
+
+class RequestTag(object):
+    """
+    How a `FairScheduler` queues requests made in a `request_tag` context.
+    """
+
+    priority: Optional[Priority]
+    """The requests' priority class."""
+    stream: Optional[str]
+    """The query stream the requests belong to; streams share a class fairly."""
+    weight: Optional[float]
+    """The stream's share of its class's requests, relative to other streams."""
+
+    def __init__(
+        self,
+        priority: Optional[Priority] = None,
+        stream: Optional[str] = None,
+        weight: Optional[float] = None,
+    ):
+        self.priority = priority
+        self.stream = stream
+        self.weight = weight
+
+    def __repr__(self) -> str:
+        return "{}(priority={}, stream={}, weight={})".format(
+            _classname(self), repr(self.priority), repr(self.stream), repr(self.weight)
+        )
+
+
+_current_tag: ContextVar[RequestTag] = ContextVar("aioarxiv_request_tag", default=RequestTag())
+
+
+@contextmanager
+def request_tag(
+    priority: Optional[Priority] = None,
+    stream: Optional[str] = None,
+    weight: Optional[float] = None,
+    fallback: bool = False,
+) -> Iterator[RequestTag]:
+    """
+    Tags the requests made in this context (including in tasks it starts) for
+    a `FairScheduler`. Fields left `None` are inherited from an enclosing
+    context.
+
+    `Client` tags each request it makes as a fallback: first pages are
+    `Priority.Interactive`, later pages `Priority.Bulk`, and each query is its
+    own stream. Fields set by callers take precedence, e.g.
+    `with request_tag(priority=Priority.Bulk): ...` around a backfill.
+    """
+    outer = _current_tag.get()
+    if fallback:
+        priority, stream, weight = (
+            outer.priority if outer.priority is not None else priority,
+            outer.stream if outer.stream is not None else stream,
+            outer.weight if outer.weight is not None else weight,
+        )
+    tag = RequestTag(
+        priority if priority is not None else outer.priority,
+        stream if stream is not None else outer.stream,
+        weight if weight is not None else outer.weight,
+    )
+    token = _current_tag.set(tag)
+    try:
+        yield tag
+    finally:
+        _current_tag.reset(token)
+
+
+class ClassStats(object):
+    """
+    Queueing statistics of one priority class in a `FairScheduler`.
+    """
+
+    queue_depth: int
+    """Number of requests currently waiting."""
+    max_queue_depth: int
+    """The largest number of requests that have waited at once."""
+    started: int
+    """Number of requests released to start."""
+    wait_seconds: float
+    """Total seconds released requests spent waiting."""
+    max_wait_seconds: float
+    """The longest wait of a released request, in seconds."""
+
+    def __init__(self):
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.started = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        """The mean wait of released requests, in seconds."""
+        return self.wait_seconds / self.started if self.started else 0.0
+
+    def __repr__(self) -> str:
+        return "{}(queue_depth={}, started={}, mean_wait_seconds={}, max_wait_seconds={})".format(
+            _classname(self),
+            repr(self.queue_depth),
+            repr(self.started),
+            repr(self.mean_wait_seconds),
+            repr(self.max_wait_seconds),
+        )
+
+
+class _Waiter(object):
+    """
+    A request queued in a `FairScheduler`.
+    """
+
+    def __init__(self, priority: Priority, future: asyncio.Future, enqueued: float):
+        self.priority = priority
+        self.future = future
+        self.enqueued = enqueued
+
+
+class FairScheduler(BaseRateLimiter):
+    """
+    Orders the requests waiting on another rate limiter, so that one client
+    can serve interactive queries and bulk harvests at once without the bulk
+    requests monopolizing its budget.
+
+    Waiting requests are kept in priority classes (see `Priority`, set with
+    `request_tag`), and each class is served strictly before lower ones.
+    Within a class, query streams share requests by weighted fair queuing:
+    a stream of weight 2 gets twice the requests of a stream of weight 1
+    while both are waiting, however many requests each has queued.
+
+    Requests are released one at a time through `limiter`, which keeps
+    spacing them; which request a slot goes to is decided only once the slot
+    arrives, so a new interactive request overtakes everything already queued
+    behind lower classes. `limiter` is released as soon as the request starts,
+    which suits the slot and token limiters in this package.
+
+    Pass it as `Client.rate_limiter`, e.g.
+    `Client(rate_limiter=FairScheduler(AsyncRateLimiter(period=3.0)))`.
+    """
+
+    limiter: BaseRateLimiter
+    """The limiter spacing the requests."""
+    default_weight: float
+    """The weight of streams whose requests aren't tagged with one."""
+    stats: Dict[Priority, ClassStats]
+    """Queueing statistics per priority class."""
+    clock: Callable[[], float]
+    """
+    A monotonic clock returning seconds for wait times; `time.monotonic` unless
+    a different clock is injected (e.g. in tests).
+    """
+
+    def __init__(
+        self,
+        limiter: BaseRateLimiter,
+        default_weight: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limiter = limiter
+        self.default_weight = default_weight
+        self.clock = clock
+        self.stats = {priority: ClassStats() for priority in Priority}
+        # Waiters ordered by (class, virtual finish time, arrival).
+        self._queue: List[Tuple[int, float, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._virtual_time: Dict[Priority, float] = {priority: 0.0 for priority in Priority}
+        self._stream_finish: Dict[Tuple[Priority, str], float] = {}
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def acquire(self):
+        """
+        Waits for this request's turn, then for `limiter`.
+        Usage:
+            async with scheduler.acquire():
+                # do rate-limited work here
+
+        The request's class, stream and weight are read from the current
+        `request_tag` context when `acquire` is called.
+        """
+        tag = _current_tag.get()
+        return self._acquire(tag)
+
+    def _enqueue(self, tag: RequestTag) -> _Waiter:
+        """
+        Queues a request, stamping it with its stream's next virtual finish time.
+        """
+        priority = Priority(tag.priority if tag.priority is not None else Priority.Interactive)
+        weight = tag.weight if tag.weight is not None else self.default_weight
+        waiter = _Waiter(priority, asyncio.get_running_loop().create_future(), self.clock())
+        if tag.stream is None:
+            # Untagged requests each form a stream of their own.
+            start = self._virtual_time[priority]
+        else:
+            key = (priority, tag.stream)
+            start = max(self._virtual_time[priority], self._stream_finish.get(key, 0.0))
+        finish = start + 1.0 / max(weight, 1e-9)
+        if tag.stream is not None:
+            self._stream_finish[(priority, tag.stream)] = finish
+        heapq.heappush(self._queue, (int(priority), finish, next(self._sequence), waiter))
+
+        stats = self.stats[priority]
+        stats.queue_depth += 1
+        stats.max_queue_depth = max(stats.max_queue_depth, stats.queue_depth)
+        return waiter
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """
+        Pops the next request to start, skipping ones whose callers gave up.
+        """
+        while self._queue:
+            _, finish, _, waiter = heapq.heappop(self._queue)
+            if waiter.future.done():
+                continue
+            self._virtual_time[waiter.priority] = finish
+            return waiter
+        return None
+
+    def _record_start(self, waiter: _Waiter):
+        """
+        Updates the statistics of a request's class as it's released.
+        """
+        stats = self.stats[waiter.priority]
+        stats.queue_depth -= 1
+        stats.started += 1
+        waited = self.clock() - waiter.enqueued
+        stats.wait_seconds += waited
+        stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+
+    async def _dispatch(self):
+        """
+        Releases queued requests one at a time through `limiter`.
+        """
+        try:
+            while any(not waiter.future.done() for *_, waiter in self._queue):
+                try:
+                    async with self.limiter.acquire():
+                        waiter = self._next_waiter()
+                        if waiter is None:
+                            break
+                        self._record_start(waiter)
+                        waiter.future.set_result(None)
+                except Exception as err:
+                    # E.g. a full `TokenBucketRateLimiter` queue: fail the next request.
+                    waiter = self._next_waiter()
+                    if waiter is not None:
+                        self.stats[waiter.priority].queue_depth -= 1
+                        waiter.future.set_exception(err)
+        finally:
+            self._dispatcher = None
+            if not self._queue:
+                # Idle; forget finished streams.
+                self._stream_finish.clear()
+
+    @asynccontextmanager
+    async def _acquire(self, tag: RequestTag):
+        waiter = self._enqueue(tag)
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if not waiter.future.done() or waiter.future.cancelled():
+                self.stats[waiter.priority].queue_depth -= 1
+            raise
+        yield
+
+    def __repr__(self) -> str:
+        return "{}({})".format(_classname(self), repr(self.limiter))
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import gzip
+import json
+import logging
+import os
+import re
+from collections import deque
+from datetime import datetime, timezone
+from concurrent.futures import Executor
+from typing import IO, Any, AsyncGenerator, Deque, Dict, Iterable, Iterator, List, Optional, Union
+
+from aioarxiv.models import BaseResult, OAIResult
+from aioarxiv.models.utilities import (
+    _DEFAULT_TIME,
+    collapse_whitespace,
+    optional_text,
+    parse_day,
+    parse_rfc822_date,
+)
+from aioarxiv.oai import ABS_URL, paper_links, parse_author_string
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FIELDS = (
+    "entry_id",
+    "title",
+    "authors",
+    "summary",
+    "comment",
+    "journal_ref",
+    "doi",
+    "primary_category",
+    "categories",
+    "published",
+    "updated",
+    "versions",
+    "datestamp",
+)
+"""The `OAIResult` attributes a snapshot record can be projected to."""
+
+SNAPSHOT_CHUNK_BYTES = 4 * 1024 * 1024
+"""Approximate bytes of snapshot lines parsed together as one chunk."""
+
+SnapshotRecord = Union[OAIResult, Dict[str, Any]]
+
+# Version dates are always like "Mon, 2 Apr 2007 19:18:42 GMT".
+_VERSION_DATE = re.compile(r"\w{3}, (\d{1,2}) (\w{3}) (\d{4}) (\d{2}):(\d{2}):(\d{2}) GMT")
+_MONTHS = {
+    month: index
+    for index, month in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1
+    )
+}
+
+
+def _open_snapshot(path: str) -> IO[bytes]:
+    """
+    Opens a snapshot file for reading, decompressing it if it's gzipped.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _check_fields(fields: Optional[Iterable[str]]) -> frozenset:
+    """
+    Validates a projection, which always includes `entry_id`.
+    """
+    if fields is None:
+        return frozenset(SNAPSHOT_FIELDS)
+    fields = frozenset(fields) | {"entry_id"}
+    unknown = fields.difference(SNAPSHOT_FIELDS)
+    if unknown:
+        raise ValueError("Unknown snapshot fields: {}".format(", ".join(sorted(unknown))))
+    return fields
+
+
+def _version_date(created: Optional[str]) -> datetime:
+    """
+    Parses a version's `created` date, avoiding the general RFC 822 parser for
+    the snapshot's fixed format.
+    """
+    if not created:
+        return _DEFAULT_TIME
+    match = _VERSION_DATE.fullmatch(created)
+    if match is None or match.group(2) not in _MONTHS:
+        return parse_rfc822_date(created)
+    day, month, year, hour, minute, second = match.groups()
+    return datetime(
+        int(year),
+        _MONTHS[month],
+        int(day),
+        int(hour),
+        int(minute),
+        int(second),
+        tzinfo=timezone.utc,
+    )
+
+
+def _authors(record: dict) -> List[BaseResult.Author]:
+    """
+    Builds a record's authors from `authors_parsed` (`[keyname, forenames,
+    suffix, *affiliations]` lists), or from the `authors` string without it.
+    """
+    parsed = record.get("authors_parsed")
+    if not parsed:
+        return parse_author_string(record.get("authors") or "")
+    authors = []
+    for parts in parsed:
+        keyname, forenames, suffix = (list(parts) + ["", "", ""])[:3]
+        name = " ".join(part for part in (forenames, keyname, suffix) if part)
+        affiliations = [a for a in parts[3:] if a]
+        authors.append(BaseResult.Author(name, ", ".join(affiliations) or None))
+    return authors
+
+
+def parse_snapshot_record(
+    record: dict, fields: Iterable[str] = SNAPSHOT_FIELDS, compact: bool = False
+) -> SnapshotRecord:
+    """
+    Converts a decoded line of arXiv's metadata snapshot into an `OAIResult`,
+    or, if `compact`, a dict of the projected `fields`.
+
+    Only the projected fields are parsed; the rest keep their defaults.
+
+    Raises:
+        OAIResult.MissingFieldError: If the record has no `id`.
+    """
+    short_id = record.get("id")
+    if not short_id:
+        raise OAIResult.MissingFieldError("id")
+    versions = record.get("versions") or []
+    if versions:
+        short_id += versions[-1].get("version", "")
+
+    values: Dict[str, Any] = {"entry_id": ABS_URL + short_id}
+    categories = (record.get("categories") or "").split()
+    for field in fields:
+        if field == "title":
+            values["title"] = collapse_whitespace(record.get("title") or "")
+        elif field == "authors":
+            values["authors"] = _authors(record)
+        elif field == "summary":
+            values["summary"] = (record.get("abstract") or "").strip()
+        elif field == "comment":
+            values["comment"] = optional_text(record.get("comments"))
+        elif field == "journal_ref":
+            values["journal_ref"] = optional_text(record.get("journal-ref"))
+        elif field == "doi":
+            values["doi"] = optional_text(record.get("doi"))
+        elif field == "primary_category":
+            values["primary_category"] = categories[0] if categories else ""
+        elif field == "categories":
+            values["categories"] = categories
+        elif field == "published":
+            values["published"] = _version_date(versions[0].get("created") if versions else None)
+        elif field == "updated":
+            values["updated"] = _version_date(versions[-1].get("created") if versions else None)
+        elif field == "versions":
+            values["versions"] = [v.get("version", "") for v in versions]
+        elif field == "datestamp":
+            values["datestamp"] = parse_day(record.get("update_date") or "")
+
+    if compact:
+        return values
+    return OAIResult(links=paper_links(short_id), **values)
+
+
+def _parse_lines(lines: List[bytes], fields: frozenset, compact: bool) -> List[SnapshotRecord]:
+    """
+    Parses a chunk of snapshot lines, skipping blank and malformed ones. Runs
+    in a worker process when loading in parallel, so it must stay picklable.
+    """
+    parsed = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            parsed.append(parse_snapshot_record(json.loads(line), fields, compact))
+        except (ValueError, AttributeError, OAIResult.MissingFieldError) as e:
+            logger.warning("Skipping malformed snapshot record: %s", e)
+    return parsed
+
+
+def read_snapshot(
+    path: str, fields: Optional[Iterable[str]] = None, compact: bool = False
+) -> Iterator[SnapshotRecord]:
+    """
+    Reads arXiv's JSON-lines metadata snapshot (optionally gzipped) one line
+    at a time, yielding an `OAIResult` per paper, or a dict of the projected
+    `fields` if `compact`.
+
+    Memory use is bounded by a single line, however large the file. For
+    parsing on several cores, use `load_snapshot`.
+
+    Args:
+        path: The snapshot file, e.g. `arxiv-metadata-oai-snapshot.json`
+        fields: The `SNAPSHOT_FIELDS` to parse; `None` for all of them.
+            Parsing fewer fields, particularly dates and authors, is faster.
+        compact: Whether to yield plain dicts rather than `OAIResult`s
+    """
+    fields = _check_fields(fields)
+    with _open_snapshot(path) as f:
+        for line in f:
+            yield from _parse_lines([line], fields, compact)
+
+
+async def load_snapshot(
+    path: str,
+    fields: Optional[Iterable[str]] = None,
+    compact: bool = False,
+    executor: Optional[Executor] = None,
+    chunk_bytes: int = SNAPSHOT_CHUNK_BYTES,
+    max_pending: Optional[int] = None,
+) -> AsyncGenerator[SnapshotRecord, None]:
+    """
+    Loads arXiv's metadata snapshot like `read_snapshot`, parsing chunks of
+    about `chunk_bytes` of lines in `executor`. A `ProcessPoolExecutor`
+    parses chunks on several cores at once; `None` parses on the event loop,
+    a chunk at a time. Records are yielded in file order.
+
+    Reading runs ahead of the consumer by at most `max_pending` chunks
+    (default: twice the CPU count), bounding memory use.
+    """
+    fields = _check_fields(fields)
+    max_pending = max(max_pending or 2 * (os.cpu_count() or 1), 1)
+    if executor is None:
+        # Parsing inline; reading ahead wouldn't overlap with anything.
+        max_pending = 1
+    loop = asyncio.get_running_loop()
+    pending: Deque[asyncio.Future] = deque()
+
+    f = await loop.run_in_executor(None, _open_snapshot, path)
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                lines = await loop.run_in_executor(None, f.readlines, chunk_bytes)
+                if not lines:
+                    exhausted = True
+                    break
+                if executor is None:
+                    future = loop.create_future()
+                    future.set_result(_parse_lines(lines, fields, compact))
+                else:
+                    parse = functools.partial(_parse_lines, lines, fields, compact)
+                    future = loop.run_in_executor(executor, parse)
+                pending.append(future)
+            if not pending:
+                return
+            for record in await pending.popleft():
+                yield record
+    finally:
+        for future in pending:
+            future.cancel()
+        await loop.run_in_executor(None, f.close)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Optional
+
+import aiohttp
+
+from aioarxiv.models.utilities import _classname
+
+
+class AttemptStats(object):
+    """
+    Timing and outcome of one try at fetching a feed.
+    """
+
+    url: str
+    """The requested URL."""
+    try_index: int
+    """0 for the initial try, 1 for the first retry, and so on."""
+    backoff: float
+    """Seconds the retry policy waited before this try."""
+    elapsed: float
+    """Seconds from the start of the try, including any rate-limiter wait, to its outcome."""
+    status: Optional[int]
+    """The HTTP status of the response, if one was received."""
+    error: Optional[str]
+    """A description of the error if the try failed."""
+
+    def __init__(
+        self,
+        url: str,
+        try_index: int,
+        backoff: float,
+        elapsed: float,
+        status: Optional[int] = None,
+        error: Optional[str] = None,
+    ):
+        self.url = url
+        self.try_index = try_index
+        self.backoff = backoff
+        self.elapsed = elapsed
+        self.status = status
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the try succeeded."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return "{}({}, try_index={}, backoff={}, elapsed={}, status={}, error={})".format(
+            _classname(self),
+            repr(self.url),
+            repr(self.try_index),
+            repr(self.backoff),
+            repr(self.elapsed),
+            repr(self.status),
+            repr(self.error),
+        )
+
+
+class ClientStats(object):
+    """
+    Counters describing a `Client`'s requests, exposed as `Client.stats`.
+    """
+
+    requests: int
+    """Number of tries made, including retries."""
+    retries: int
+    """Number of tries which were retries of a failed try."""
+    failures: int
+    """Number of requests abandoned after their last try failed."""
+    backoff_seconds: float
+    """Total seconds spent waiting on the retry policy."""
+    attempts: Deque[AttemptStats]
+    """The most recent tries, oldest first."""
+    coalesced_requests: int
+    """Number of feed fetches which joined an identical request already in flight."""
+    writes: int
+    """Number of download chunks written to disk."""
+    bytes_written: int
+    """Number of downloaded bytes written to disk."""
+    write_seconds: float
+    """Total seconds spent in download disk writes, which run off the event loop."""
+    max_write_seconds: float
+    """The slowest single download disk write, in seconds."""
+    connections_created: int
+    """Number of connections opened by the client's session."""
+    connections_reused: int
+    """Number of requests (including downloads) served on an already-open pooled connection."""
+
+    def __init__(self, max_attempts: int = 1000):
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.backoff_seconds = 0.0
+        self.attempts = deque(maxlen=max_attempts)
+        self.coalesced_requests = 0
+        self.writes = 0
+        self.bytes_written = 0
+        self.write_seconds = 0.0
+        self.max_write_seconds = 0.0
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    @property
+    def connection_reuse_ratio(self) -> float:
+        """The fraction of connection acquisitions which reused a pooled connection."""
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+    @property
+    def mean_write_seconds(self) -> float:
+        """The mean latency of download disk writes, in seconds."""
+        return self.write_seconds / self.writes if self.writes else 0.0
+
+    def _record_write(self, size: int, elapsed: float):
+        """
+        Records a download chunk write of `size` bytes which took `elapsed` seconds.
+        """
+        self.writes += 1
+        self.bytes_written += size
+        self.write_seconds += elapsed
+        self.max_write_seconds = max(self.max_write_seconds, elapsed)
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Returns a trace config counting a session's new and reused connections.
+        """
+
+        async def on_create(session, context, params):
+            self.connections_created += 1
+
+        async def on_reuse(session, context, params):
+            self.connections_reused += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(on_create)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
+    def _record_attempt(self, attempt: AttemptStats) -> AttemptStats:
+        """
+        Records a finished try and returns it.
+        """
+        self.requests += 1
+        if attempt.try_index > 0:
+            self.retries += 1
+        self.backoff_seconds += attempt.backoff
+        self.attempts.append(attempt)
+        return attempt
+
+    def __repr__(self) -> str:
+        return (
+            "{}(requests={}, retries={}, failures={}, backoff_seconds={}, "
+            "connections_created={}, connections_reused={})"
+        ).format(
+            _classname(self),
+            repr(self.requests),
+            repr(self.retries),
+            repr(self.failures),
+            repr(self.backoff_seconds),
+            repr(self.connections_created),
+            repr(self.connections_reused),
+        )
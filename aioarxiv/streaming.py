@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import List, Optional
+from xml.etree import ElementTree
+
+from aioarxiv.models.utilities import _classname
+
+_ENTRY = "{http://www.w3.org/2005/Atom}entry"
+_TOTAL_RESULTS = "{http://a9.com/-/spec/opensearch/1.1/}totalResults"
+
+
+class AtomStreamParser(object):
+    """
+    An incremental parser for arXiv API Atom feeds.
+
+    Bytes are fed in as they arrive with `feed`, which returns the `<entry>`
+    elements completed so far. Convert them with `parsers.entry_to_result`,
+    the same mapping `ArxivParser` uses. Completed entries are dropped from
+    the tree, so a large page is never held in memory as XML.
+    """
+
+    total_results: Optional[int]
+    """The feed's `opensearch:totalResults`, once parsed."""
+    num_entries: int
+    """Number of entries completed so far."""
+
+    def __init__(self):
+        self.total_results = None
+        self.num_entries = 0
+        self._parser = ElementTree.XMLPullParser(events=("start", "end"))
+        self._root: Optional[ElementTree.Element] = None
+
+    def feed(self, data: bytes) -> List[ElementTree.Element]:
+        """
+        Parses the next chunk of the document, returning the entries it
+        completed.
+
+        Raises:
+            xml.etree.ElementTree.ParseError: If the document is malformed.
+        """
+        self._parser.feed(data)
+        return self._take_completed()
+
+    def close(self) -> List[ElementTree.Element]:
+        """
+        Finishes parsing the document, returning any remaining entries.
+
+        Raises:
+            xml.etree.ElementTree.ParseError: If the document is malformed or
+                truncated.
+        """
+        self._parser.close()
+        return self._take_completed()
+
+    def _take_completed(self) -> List[ElementTree.Element]:
+        completed = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = element
+            elif element.tag == _ENTRY:
+                completed.append(element)
+                self.num_entries += 1
+                if self._root is not None:
+                    self._root.remove(element)
+            elif element.tag == _TOTAL_RESULTS:
+                self.total_results = int((element.text or "").strip())
+        return completed
+
+    def __repr__(self) -> str:
+        return "{}(total_results={}, num_entries={})".format(
+            _classname(self), repr(self.total_results), repr(self.num_entries)
+        )
+
+
+class StreamedPage(object):
+    """
+    Progress of a Search API page streamed by `Client`.
+    """
+
+    num_entries: int
+    """
+    Number of entries parsed from the page, including partial entries which
+    couldn't be parsed into results.
+    """
+    total_results: Optional[int]
+    """The total number of results reported by the feed, once parsed."""
+
+    def __init__(self):
+        self.num_entries = 0
+        self.total_results = None
+
+    def __repr__(self) -> str:
+        return "{}(num_entries={}, total_results={})".format(
+            _classname(self), repr(self.num_entries), repr(self.total_results)
+        )
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from aioarxiv.models import SearchResult
+from aioarxiv.models.utilities import _classname
+
+
+class SyncResult(object):
+    """
+    The outcome of `Client.sync`: the results updated since the previous
+    watermark, and the watermark to sync from next time.
+    """
+
+    results: List[SearchResult]
+    """The results updated at or after the previous watermark, most recently updated first."""
+    watermark: Optional[datetime]
+    """
+    The latest `SearchResult.updated` synced, to pass as `since` to the next
+    sync; the previous watermark if nothing was updated since, or if the sync
+    wasn't `complete`.
+    """
+    pages: int
+    """The number of pages fetched."""
+    complete: bool
+    """
+    Whether every result updated since the previous watermark was fetched.
+    `False` if the query's `max_results` cut the sync short.
+    """
+
+    def __init__(
+        self,
+        results: List[SearchResult],
+        watermark: Optional[datetime],
+        pages: int,
+        complete: bool = True,
+    ):
+        self.results = results
+        self.watermark = watermark
+        self.pages = pages
+        self.complete = complete
+
+    def __repr__(self) -> str:
+        return "{}(<{} results>, watermark={}, pages={}, complete={})".format(
+            _classname(self),
+            len(self.results),
+            repr(self.watermark),
+            repr(self.pages),
+            repr(self.complete),
+        )
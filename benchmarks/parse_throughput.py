@@ -0,0 +1,58 @@
+"""
+Benchmarks the throughput of `Client` parser backends on the mock feeds.
+
+Each parser parses every feed repeatedly; throughput is reported in entries per
+second along with the speedup over `FeedparserParser`.
+
+Usage:
+    python benchmarks/parse_throughput.py --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from typing import Dict
+
+import aioarxiv
+
+MOCK_FEEDS = os.path.join(os.path.dirname(__file__), "..", "tests", "mock_feeds")
+FEEDS = ["search_mock_feed.xml", "rss_mock_feed.xml"]
+
+
+def throughput(parser: aioarxiv.BaseParser, content: bytes, repeat: int) -> float:
+    """Parses `content` `repeat` times, returning entries parsed per second."""
+    entries = 0
+    began = time.perf_counter()
+    for _ in range(repeat):
+        entries += parser.parse(content).num_entries
+    return entries / (time.perf_counter() - began)
+
+
+def main(args: argparse.Namespace):
+    # Results without PDF links log a warning each; keep the output readable.
+    logging.disable(logging.WARNING)
+    parsers: Dict[str, aioarxiv.BaseParser] = {
+        "feedparser": aioarxiv.FeedparserParser(),
+        "arxiv": aioarxiv.ArxivParser(),
+    }
+    for name in FEEDS:
+        with open(os.path.join(MOCK_FEEDS, name), "rb") as f:
+            content = f.read()
+        baseline = None
+        for label, parser in parsers.items():
+            rate = throughput(parser, content, args.repeat)
+            baseline = baseline or rate
+            print(
+                "{:<22} {:<10} {:>10,.0f} entries/s ({:.1f}x)".format(
+                    name, label, rate, rate / baseline
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="parses per feed and parser")
+    main(parser.parse_args())
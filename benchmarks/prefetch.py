@@ -0,0 +1,104 @@
+"""
+Benchmarks `Client.prefetch_pages` against a local stub of the arXiv API.
+
+The stub server answers every query with synthetic Atom pages after a fixed
+latency, and the consumer spends a fixed amount of time on each result. Without
+prefetching, network and processing time add up; with prefetching they overlap.
+
+Usage:
+    python benchmarks/prefetch.py --results 1000 --page-size 100 --latency 0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+
+import aioarxiv
+
+ENTRY = """
+  <entry>
+    <id>http://arxiv.org/abs/2401.{0:05d}v1</id>
+    <updated>2024-01-01T00:00:00Z</updated>
+    <published>2024-01-01T00:00:00Z</published>
+    <title>Paper {0}</title>
+    <summary>Abstract {0}</summary>
+    <author><name>Author {0}</name></author>
+    <link href="http://arxiv.org/abs/2401.{0:05d}v1" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.{0:05d}v1" rel="related" type="application/pdf"/>
+    <arxiv:primary_category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>"""
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title>arXiv Query</title>
+  <opensearch:totalResults>{total}</opensearch:totalResults>
+  <opensearch:startIndex>{start}</opensearch:startIndex>
+  <opensearch:itemsPerPage>{count}</opensearch:itemsPerPage>{entries}
+</feed>"""
+
+
+def stub_app(total: int, latency: float) -> web.Application:
+    """An aiohttp application serving `total` synthetic results."""
+
+    async def query(request: web.Request) -> web.Response:
+        start = int(request.query.get("start", 0))
+        count = int(request.query.get("max_results", 10))
+        await asyncio.sleep(latency)
+        entries = "".join(ENTRY.format(i) for i in range(start, min(start + count, total)))
+        body = FEED.format(total=total, start=start, count=count, entries=entries)
+        return web.Response(body=body.encode("utf-8"), content_type="application/atom+xml")
+
+    app = web.Application()
+    app.router.add_get("/api/query", query)
+    return app
+
+
+async def consume(base_url: str, args: argparse.Namespace, prefetch_pages: int) -> float:
+    """Walks every result once, returning the elapsed wall-clock time."""
+    client = aioarxiv.Client(
+        page_size=args.page_size, delay_seconds=args.delay, prefetch_pages=prefetch_pages
+    )
+    client.query_url_format = base_url + "/api/query?"
+    began = time.monotonic()
+    async with client:
+        async for _ in client.results(aioarxiv.SearchQuery(query="benchmark")):
+            await asyncio.sleep(args.work)
+    return time.monotonic() - began
+
+
+async def main(args: argparse.Namespace):
+    runner = web.AppRunner(stub_app(args.results, args.latency))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base_url = "http://127.0.0.1:{}".format(port)
+
+    try:
+        baseline = await consume(base_url, args, prefetch_pages=0)
+        print("prefetch_pages=0: {:.2f}s".format(baseline))
+        for pages in args.prefetch:
+            elapsed = await consume(base_url, args, prefetch_pages=pages)
+            print(
+                "prefetch_pages={}: {:.2f}s ({:.0%} of baseline)".format(
+                    pages, elapsed, elapsed / baseline
+                )
+            )
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--results", type=int, default=1000, help="results served by the stub")
+    parser.add_argument("--page-size", type=int, default=100, help="Client.page_size")
+    parser.add_argument("--delay", type=float, default=0.2, help="Client.delay_seconds")
+    parser.add_argument("--latency", type=float, default=0.5, help="stub response latency (s)")
+    parser.add_argument("--work", type=float, default=0.005, help="processing time per result (s)")
+    parser.add_argument("--prefetch", type=int, nargs="+", default=[1, 2], help="values to compare")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,228 @@
+import asyncio
+import unittest
+from datetime import date, datetime, timezone
+from datetime import time as time_of_day
+from unittest.mock import patch
+
+import aioarxiv
+from tests.test_watch import MONDAY, TUESDAY, Exhausted, FeedSession
+
+
+def utc(*args) -> float:
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+THANKSGIVING = date(2024, 11, 28)
+
+
+class TestAnnouncementCalendar(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(utc(2024, 11, 25, 12))
+        self.calendar = aioarxiv.AnnouncementCalendar(holidays=[THANKSGIVING], clock=self.clock)
+
+    def test_update_at_follows_daylight_time(self):
+        self.assertEqual(self.calendar.update_at(date(2024, 11, 25)), utc(2024, 11, 25, 5))
+        self.assertEqual(self.calendar.update_at(date(2024, 7, 1)), utc(2024, 7, 1, 4))
+        # Midnight precedes the 2:00 switch on both changeover days.
+        self.assertEqual(self.calendar.update_at(date(2024, 3, 10)), utc(2024, 3, 10, 5))
+        self.assertEqual(self.calendar.update_at(date(2024, 3, 11)), utc(2024, 3, 11, 4))
+        self.assertEqual(self.calendar.update_at(date(2024, 11, 3)), utc(2024, 11, 3, 4))
+        self.assertEqual(self.calendar.update_at(date(2024, 11, 4)), utc(2024, 11, 4, 5))
+
+        calendar = aioarxiv.AnnouncementCalendar(update_time=time_of_day(20, 30))
+        self.assertEqual(calendar.update_at(date(2024, 11, 25)), utc(2024, 11, 26, 1, 30))
+
+    def test_announcement_days(self):
+        self.assertTrue(self.calendar.is_announcement_day(date(2024, 11, 29)))
+        self.assertFalse(self.calendar.is_announcement_day(date(2024, 11, 30)))
+        self.assertFalse(self.calendar.is_announcement_day(date(2024, 12, 1)))
+        self.assertFalse(self.calendar.is_announcement_day(THANKSGIVING))
+
+    def test_next_update(self):
+        self.assertEqual(self.calendar.next_update(), utc(2024, 11, 26, 5))
+        # Strictly after: an update that's due now is already past.
+        self.assertEqual(self.calendar.next_update(utc(2024, 11, 26, 5)), utc(2024, 11, 27, 5))
+        # Skips the holiday, and the weekend.
+        self.assertEqual(self.calendar.next_update(utc(2024, 11, 27, 6)), utc(2024, 11, 29, 5))
+        self.assertEqual(self.calendar.next_update(utc(2024, 11, 29, 6)), utc(2024, 12, 2, 5))
+        # Late evening Eastern is already the next UTC day.
+        self.assertEqual(self.calendar.next_update(utc(2024, 11, 26, 3)), utc(2024, 11, 26, 5))
+
+    def test_previous_update(self):
+        self.assertEqual(self.calendar.previous_update(), utc(2024, 11, 25, 5))
+        self.assertEqual(self.calendar.previous_update(utc(2024, 11, 25, 5)), utc(2024, 11, 25, 5))
+        self.assertEqual(self.calendar.previous_update(utc(2024, 12, 1, 12)), utc(2024, 11, 29, 5))
+        self.assertEqual(self.calendar.previous_update(utc(2024, 11, 28, 12)), utc(2024, 11, 27, 5))
+
+
+class TestAnnouncementPoller(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(utc(2024, 11, 25, 12))
+        self.poller = aioarxiv.AnnouncementPoller(
+            aioarxiv.AnnouncementCalendar(holidays=[THANKSGIVING], clock=self.clock),
+            lead=300,
+            dense_interval=60,
+            dense_window=1800,
+            max_interval=3600,
+        )
+
+    def delay(self, changed: bool = False, updated=None) -> float:
+        """Polls, then sleeps for the returned delay."""
+        delay = self.poller.delay(changed, updated)
+        self.clock.now += delay
+        return delay
+
+    def test_sleeps_until_window(self):
+        self.assertEqual(self.delay(), utc(2024, 11, 26, 4, 55) - utc(2024, 11, 25, 12))
+        self.assertEqual(self.poller.awaiting, utc(2024, 11, 26, 5))
+        # Dense polls throughout the window.
+        delays = [self.delay() for _ in range(35)]
+        self.assertEqual(delays, [60] * 35)
+        self.assertEqual(self.clock.now, utc(2024, 11, 26, 5, 30))
+
+    def test_change_moves_to_next_update(self):
+        self.delay()
+        self.delay()
+        self.delay()
+        # A change at 4:57 is Tuesday's update, a few minutes early.
+        self.assertEqual(
+            self.delay(changed=True), utc(2024, 11, 27, 4, 55) - utc(2024, 11, 26, 4, 57)
+        )
+        self.assertEqual(self.poller.awaiting, utc(2024, 11, 27, 5))
+
+    def test_backs_off_when_overdue(self):
+        self.clock.now = utc(2024, 11, 26, 5, 30)
+        self.poller.delay(changed=True)
+        self.clock.now = utc(2024, 11, 27, 5, 30)
+        delays = [self.delay() for _ in range(8)]
+        self.assertEqual(delays, [120, 240, 480, 960, 1920, 3600, 3600, 3600])
+
+    def test_backoff_stops_at_following_window(self):
+        self.poller.max_interval = 86400
+        self.clock.now = utc(2024, 11, 25, 5, 30)
+        self.poller.delay(changed=True)
+        self.clock.now = utc(2024, 11, 26, 5, 30)
+        delays = [self.delay() for _ in range(10)]
+        # Never sleeps past the next window, and rolls over to that update.
+        self.assertEqual(delays[:-1], [120, 240, 480, 960, 1920, 3840, 7680, 15360, 30720])
+        self.assertEqual(delays[-1], 22980)
+        self.assertEqual(self.clock.now, utc(2024, 11, 27, 4, 55))
+        self.assertEqual(self.delay(), 60)
+        self.assertEqual(self.poller.awaiting, utc(2024, 11, 27, 5))
+
+    def test_start_just_before_update(self):
+        # 23:57 Eastern on Monday: Tuesday's update is three minutes away.
+        self.clock.now = utc(2024, 11, 26, 4, 57)
+        self.assertEqual(self.delay(changed=True), 60)
+        self.assertEqual(self.poller.awaiting, utc(2024, 11, 26, 5))
+
+        # Before a weekend, Friday's update isn't skipped either.
+        self.poller = aioarxiv.AnnouncementPoller(self.poller.calendar)
+        self.clock.now = utc(2024, 11, 29, 4, 50)
+        self.assertEqual(self.delay(changed=True), 300)
+        self.assertEqual(self.poller.awaiting, utc(2024, 11, 29, 5))
+
+    def test_start_after_update_landed(self):
+        # Tuesday's update is already in the feed: wait for Wednesday's.
+        self.clock.now = utc(2024, 11, 26, 5, 10)
+        self.assertEqual(
+            self.delay(changed=True, updated=utc(2024, 11, 26, 5)),
+            utc(2024, 11, 27, 4, 55) - utc(2024, 11, 26, 5, 10),
+        )
+        self.assertEqual(self.poller.awaiting, utc(2024, 11, 27, 5))
+
+        # Without a feed date, the first poll after an update is taken to hold it.
+        self.poller = aioarxiv.AnnouncementPoller(self.poller.calendar)
+        self.clock.now = utc(2024, 11, 26, 14)
+        self.delay(changed=True)
+        self.assertEqual(self.poller.awaiting, utc(2024, 11, 27, 5))
+
+    def test_start_before_late_update(self):
+        # The feed still holds Monday's entries: Tuesday's update is late.
+        self.clock.now = utc(2024, 11, 26, 5, 10)
+        self.assertEqual(self.delay(changed=True, updated=utc(2024, 11, 25, 5)), 60)
+        self.assertEqual(self.poller.awaiting, utc(2024, 11, 26, 5))
+        self.assertEqual(
+            self.delay(changed=True), utc(2024, 11, 27, 4, 55) - utc(2024, 11, 26, 5, 11)
+        )
+
+        # Past the window, a late update is polled for with backoff.
+        self.poller = aioarxiv.AnnouncementPoller(self.poller.calendar, max_interval=3600)
+        self.clock.now = utc(2024, 11, 26, 8)
+        delays = [self.delay(changed=True, updated=utc(2024, 11, 25, 5))]
+        delays += [self.delay() for _ in range(3)]
+        self.assertEqual(delays, [120, 240, 480, 960])
+        self.assertEqual(self.poller.awaiting, utc(2024, 11, 26, 5))
+
+    def test_skips_holiday_and_weekend(self):
+        self.clock.now = utc(2024, 11, 26, 12)
+        self.delay(changed=True)
+        self.clock.now = utc(2024, 11, 27, 5, 1)
+        self.assertEqual(
+            self.delay(changed=True), utc(2024, 11, 29, 4, 55) - utc(2024, 11, 27, 5, 1)
+        )
+        self.clock.now = utc(2024, 11, 29, 5, 1)
+        self.delay(changed=True)
+        self.assertEqual(self.poller.awaiting, utc(2024, 12, 2, 5))
+
+
+class TestWatchSchedule(unittest.IsolatedAsyncioTestCase):
+    async def test_watch_sleeps_per_poller(self):
+        clock = FakeClock(utc(2024, 11, 25, 12))
+        poller = aioarxiv.AnnouncementPoller(aioarxiv.AnnouncementCalendar(clock=clock))
+        session = FeedSession([(200, MONDAY, {}), (304, b"", {}), (200, TUESDAY, {})])
+        sleeps = []
+
+        async def sleep(delay, *args, **kwargs):
+            if delay:
+                sleeps.append(delay)
+                clock.now += delay
+
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                watch = client.watch(aioarxiv.RSSQuery("cs.LG"), poller=poller)
+                with patch.object(asyncio, "sleep", sleep):
+                    with self.assertRaises(Exhausted):
+                        async for _ in watch:
+                            pass
+                await watch.aclose()
+
+        self.assertEqual(
+            sleeps,
+            [
+                utc(2024, 11, 26, 4, 55) - utc(2024, 11, 25, 12),
+                60,
+                utc(2024, 11, 27, 4, 55) - utc(2024, 11, 26, 4, 56),
+            ],
+        )
+
+    async def test_watch_started_after_update(self):
+        # Started just after Tuesday's update, which is already in the feed.
+        clock = FakeClock(utc(2024, 11, 26, 5, 10))
+        poller = aioarxiv.AnnouncementPoller(aioarxiv.AnnouncementCalendar(clock=clock))
+        session = FeedSession([(200, TUESDAY, {})])
+        sleeps = []
+
+        async def sleep(delay, *args, **kwargs):
+            if delay:
+                sleeps.append(delay)
+                clock.now += delay
+
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                watch = client.watch(aioarxiv.RSSQuery("cs.LG"), poller=poller)
+                with patch.object(asyncio, "sleep", sleep):
+                    with self.assertRaises(Exhausted):
+                        async for _ in watch:
+                            pass
+                await watch.aclose()
+
+        self.assertEqual(sleeps, [utc(2024, 11, 27, 4, 55) - utc(2024, 11, 26, 5, 10)])
@@ -0,0 +1,253 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+
+import aioarxiv
+from aioarxiv.cache import (
+    CachedPage,
+    CachedResponse,
+    PageCache,
+    SQLiteHTTPCache,
+    canonical_url,
+    page_key,
+)
+from aioarxiv.parsers import ArxivParser, FeedparserParser
+
+
+def load_mock_feed(filename: str) -> bytes:
+    """
+    Load mock feed content from a file in the mock_feeds directory.
+    """
+    with open(os.path.join("./tests/mock_feeds/", filename), "rb") as f:
+        return f.read()
+
+
+def session_with_responses(*responses) -> AsyncMock:
+    """
+    Create a mock ClientSession returning, in order, responses described by
+    `(status, body, headers)` tuples.
+    """
+    mocks = []
+    for status, body, headers in responses:
+        response = AsyncMock(spec=aiohttp.ClientResponse)
+        response.status = status
+        response.headers = headers
+        response.content = AsyncMock()
+        response.content.read = AsyncMock(return_value=body)
+        mocks.append(response)
+
+    session = AsyncMock(spec=aiohttp.ClientSession)
+    session.get.return_value.__aenter__.side_effect = mocks
+    return session
+
+
+class TestCanonicalURL(unittest.TestCase):
+    def test_equivalent_urls_share_key(self):
+        client = aioarxiv.Client()
+        url = client._format_url(aioarxiv.SearchQuery(query="quantum"), 0, 10)
+        reordered = (
+            "HTTPS://Export.arXiv.org/api/query?max_results=10&start=0"
+            "&sortOrder=descending&sortBy=relevance&search_query=quantum"
+        )
+        self.assertEqual(canonical_url(url), canonical_url(reordered))
+
+    def test_distinct_pages(self):
+        client = aioarxiv.Client()
+        query = aioarxiv.SearchQuery(query="quantum")
+        self.assertNotEqual(
+            canonical_url(client._format_url(query, 0, 10)),
+            canonical_url(client._format_url(query, 10, 10)),
+        )
+
+
+class TestSQLiteHTTPCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.path = os.path.join(self.temp_dir, "cache.sqlite")
+        self.now = 1000.0
+
+    def clock(self) -> float:
+        return self.now
+
+    def test_persists_between_instances(self):
+        url = "https://export.arxiv.org/api/query?id_list=1605.08386"
+        cache = SQLiteHTTPCache(self.path, clock=self.clock)
+        cache.put(url, CachedResponse(b"feed", etag='"abc"', stored_at=self.now))
+        cache.close()
+
+        cache = SQLiteHTTPCache(self.path, clock=self.clock)
+        cached = cache.get(url)
+        self.assertEqual(cached.body, b"feed")
+        self.assertEqual(cached.validators(), {"If-None-Match": '"abc"'})
+        self.assertIsNone(cache.get("https://export.arxiv.org/api/query?id_list=1707.08567"))
+        cache.close()
+
+    def test_ttl_per_host(self):
+        cache = SQLiteHTTPCache(
+            ":memory:", ttl={"rss.arxiv.org": 60.0}, default_ttl=600.0, clock=self.clock
+        )
+        cached = CachedResponse(b"feed", stored_at=self.now)
+        self.now += 120.0
+        self.assertFalse(cache.is_fresh("https://rss.arxiv.org/rss/cs", cached))
+        self.assertTrue(cache.is_fresh("https://export.arxiv.org/api/query?id_list=1", cached))
+
+
+class TestClientHTTPCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.cache = SQLiteHTTPCache(":memory:", default_ttl=60.0, clock=lambda: self.now)
+        self.addCleanup(self.cache.close)
+        self.feed = load_mock_feed("rss_mock_feed.xml")
+
+    @patch("asyncio.sleep", return_value=None)
+    async def test_fresh_hit_skips_request(self, mock_sleep):
+        session = session_with_responses((200, self.feed, {"ETag": '"v1"'}))
+        async with aioarxiv.Client(http_cache=self.cache) as client:
+            with patch.object(client, "_session", session):
+                query = aioarxiv.RSSQuery("cs")
+                first = [r async for r in client.results(query)]
+                second = [r async for r in client.results(query)]
+
+        self.assertEqual(session.get.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        # Cache hits bypass the rate limiter entirely.
+        mock_sleep.assert_not_called()
+
+    @patch("asyncio.sleep", return_value=None)
+    async def test_stale_entry_revalidated(self, mock_sleep):
+        session = session_with_responses(
+            (200, self.feed, {"ETag": '"v1"', "Last-Modified": "Thu, 28 Nov 2024 00:00:00 GMT"}),
+            (304, b"", {}),
+        )
+        async with aioarxiv.Client(http_cache=self.cache) as client:
+            with patch.object(client, "_session", session):
+                query = aioarxiv.RSSQuery("cs")
+                first = [r async for r in client.results(query)]
+                self.now += 120.0
+                second = [r async for r in client.results(query)]
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.revalidations, 1)
+        _, kwargs = session.get.call_args
+        self.assertEqual(kwargs["headers"]["If-None-Match"], '"v1"')
+        self.assertEqual(kwargs["headers"]["If-Modified-Since"], "Thu, 28 Nov 2024 00:00:00 GMT")
+        # Revalidation refreshes the entry and keeps its validators.
+        cached = self.cache.get(client._format_url(query, 0, 0))
+        self.assertEqual(cached.stored_at, self.now)
+        self.assertEqual(cached.etag, '"v1"')
+
+    @patch("asyncio.sleep", return_value=None)
+    async def test_errors_not_cached(self, mock_sleep):
+        session = session_with_responses((500, b"", {}), (200, self.feed, {}))
+        async with aioarxiv.Client(http_cache=self.cache, num_retries=1) as client:
+            with patch.object(client, "_session", session):
+                results = [r async for r in client.results(aioarxiv.RSSQuery("cs"))]
+        self.assertTrue(results)
+        self.assertEqual(
+            self.cache.get(client._format_url(aioarxiv.RSSQuery("cs"), 0, 0)).body, self.feed
+        )
+
+
+class TestPageCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+
+    def clock(self) -> float:
+        return self.now
+
+    def page(self, *titles: str) -> CachedPage:
+        results = [
+            aioarxiv.SearchResult(entry_id=f"https://arxiv.org/abs/{i}", title=title)
+            for i, title in enumerate(titles)
+        ]
+        return CachedPage(results, num_entries=len(results), total_results=len(results))
+
+    def url(self, start: int) -> str:
+        client = aioarxiv.Client()
+        return str(client._format_url(aioarxiv.SearchQuery(query="quantum"), start, 10))
+
+    def test_page_key(self):
+        self.assertEqual(
+            page_key(self.url(20)),
+            (
+                "https://export.arxiv.org/api/query"
+                "?search_query=quantum&sortBy=relevance&sortOrder=descending",
+                20,
+                10,
+            ),
+        )
+        self.assertEqual(
+            page_key("https://rss.arxiv.org/rss/cs"), ("https://rss.arxiv.org/rss/cs", 0, None)
+        )
+
+    def test_hits_and_misses(self):
+        cache = PageCache(clock=self.clock)
+        self.assertIsNone(cache.get(self.url(0)))
+        page = self.page("a")
+        cache.put(self.url(0), page)
+        self.assertIs(cache.get(self.url(0)), page)
+        self.assertIsNone(cache.get(self.url(10)))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_ttl(self):
+        cache = PageCache(ttl=60.0, clock=self.clock)
+        cache.put(self.url(0), self.page("a"))
+        self.now += 60.0
+        self.assertIsNone(cache.get(self.url(0)))
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+    def test_evicts_least_recently_used_page(self):
+        cache = PageCache(max_pages=2, clock=self.clock)
+        cache.put(self.url(0), self.page("a"))
+        cache.put(self.url(10), self.page("b"))
+        cache.get(self.url(0))
+        cache.put(self.url(20), self.page("c"))
+        self.assertIsNotNone(cache.get(self.url(0)))
+        self.assertIsNone(cache.get(self.url(10)))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_evicts_by_size(self):
+        big = self.page("x" * 1000)
+        cache = PageCache(max_bytes=int(big.size * 1.5), clock=self.clock)
+        cache.put(self.url(0), big)
+        cache.put(self.url(10), self.page("y" * 1000))
+        self.assertEqual(len(cache), 1)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+        self.assertIsNotNone(cache.get(self.url(10)))
+
+        # Pages larger than the whole cache aren't stored.
+        cache.put(self.url(20), self.page("z" * 10_000))
+        self.assertIsNone(cache.get(self.url(20)))
+
+    def test_size_counts_raw_entries_only_when_kept(self):
+        content = load_mock_feed("search_mock_feed.xml")
+        fast = ArxivParser().parse(content).results
+        raw = FeedparserParser().parse(content).results
+        fast_size = CachedPage(fast, len(fast), len(fast)).size
+        self.assertEqual(CachedPage(raw, len(raw), len(raw)).size, 2 * fast_size)
+
+
+class TestClientPageCache(unittest.IsolatedAsyncioTestCase):
+    @patch("asyncio.sleep", return_value=None)
+    async def test_repeated_query_skips_fetch_and_parse(self, mock_sleep):
+        feed = load_mock_feed("rss_mock_feed.xml")
+        session = session_with_responses((200, feed, {}))
+        cache = PageCache()
+        async with aioarxiv.Client(page_cache=cache) as client:
+            with patch.object(client, "_session", session), patch.object(
+                client.parser, "parse", wraps=client.parser.parse
+            ) as mock_parse:
+                query = aioarxiv.RSSQuery("cs")
+                first = [r async for r in client.results(query)]
+                second = [r async for r in client.results(query, offset=2)]
+
+        self.assertEqual(session.get.call_count, 1)
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertEqual(first[2:], second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
@@ -0,0 +1,226 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import List
+from unittest.mock import patch
+
+import aioarxiv
+from aioarxiv.checkpoint import query_fingerprint
+from tests.test_lookup import atom_feed
+from tests.test_planner import START, CorpusSession
+
+
+class PagedSession:
+    """
+    A stand-in for `aiohttp.ClientSession` answering every search query with
+    pages of `ids`, which tests may change between requests.
+    """
+
+    def __init__(self, ids: List[str]):
+        self.ids = ids
+        self.starts: List[int] = []
+
+    def get(self, url, **kwargs):
+        start, count = int(url.query["start"]), int(url.query["max_results"])
+        self.starts.append(start)
+        body = atom_feed(self.ids[start : start + count]).replace(
+            "<opensearch:totalResults>{}<".format(len(self.ids[start : start + count])).encode(),
+            "<opensearch:totalResults>{}<".format(len(self.ids)).encode(),
+        )
+
+        class _Response:
+            status = 200
+            headers = {}
+
+            class content:
+                @staticmethod
+                async def read():
+                    return body
+
+        class _Request:
+            async def __aenter__(self):
+                return _Response()
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Request()
+
+    async def close(self):
+        pass
+
+
+def corpus(n: int) -> List[str]:
+    return ["2401.{:05d}v1".format(i) for i in range(n)]
+
+
+class TestCheckpointStores(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def stores(self):
+        return [
+            aioarxiv.JSONCheckpointStore(os.path.join(self.dir.name, "checkpoints.json")),
+            aioarxiv.SQLiteCheckpointStore(os.path.join(self.dir.name, "checkpoints.db")),
+        ]
+
+    def test_round_trip(self):
+        window = (START, START + timedelta(days=1))
+        checkpoint = aioarxiv.Checkpoint(
+            "abc", shard=1, offset=200, total_results=450, last_ids=["2401.00001"], shards=[window]
+        )
+        for store in self.stores():
+            with self.subTest(store=store):
+                self.assertIsNone(store.load("harvest"))
+                store.save("harvest", checkpoint)
+                store.save("other", aioarxiv.Checkpoint("def"))
+                self.assertEqual(store.load("harvest"), checkpoint)
+                self.assertEqual(store.load("harvest").shards, [window])
+                store.delete("harvest")
+                self.assertIsNone(store.load("harvest"))
+                self.assertEqual(store.load("other").fingerprint, "def")
+
+    def test_json_save_is_atomic(self):
+        path = os.path.join(self.dir.name, "checkpoints.json")
+        store = aioarxiv.JSONCheckpointStore(path)
+        store.save("harvest", aioarxiv.Checkpoint("abc", offset=100))
+
+        with patch("aioarxiv.checkpoint.json.dump", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                store.save("harvest", aioarxiv.Checkpoint("abc", offset=200))
+
+        self.assertEqual(store.load("harvest").offset, 100)
+        self.assertEqual(os.listdir(self.dir.name), ["checkpoints.json"])
+        with open(path) as f:
+            self.assertEqual(json.load(f)["harvest"]["offset"], 100)
+
+    def test_fingerprint(self):
+        query = aioarxiv.SearchQuery(query="cat:cs.LG", max_results=10)
+        self.assertEqual(
+            query_fingerprint(query),
+            query_fingerprint(aioarxiv.SearchQuery(query="cat:cs.LG", max_results=None)),
+        )
+        self.assertNotEqual(
+            query_fingerprint(query), query_fingerprint(aioarxiv.SearchQuery(query="cat:cs.AI"))
+        )
+
+
+class TestHarvest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, "checkpoints.json")
+
+    async def harvest(self, session, query, take=None, close=True) -> List[str]:
+        """
+        Runs a harvest with a fresh store, taking at most `take` results.
+        """
+        store = aioarxiv.JSONCheckpointStore(self.path)
+        async with aioarxiv.Client(delay_seconds=0, page_size=10) as client:
+            with patch.object(client, "_session", session):
+                harvest = client.harvest(query, store, key="test")
+                ids = []
+                async for result in harvest:
+                    ids.append(result.get_short_id())
+                    if take is not None and len(ids) == take:
+                        break
+                if close:
+                    await harvest.aclose()
+        return ids
+
+    async def test_resumes_after_close_mid_page(self):
+        session = PagedSession(corpus(25))
+        query = aioarxiv.SearchQuery(query="all:test")
+        first = await self.harvest(session, query, take=13)
+        self.assertEqual(aioarxiv.JSONCheckpointStore(self.path).load("test").yielded, 13)
+
+        session.starts.clear()
+        second = await self.harvest(session, query)
+        self.assertEqual(first + second, corpus(25))
+        # The partly yielded page is fetched again, but none of it repeated.
+        self.assertEqual(session.starts, [10, 20])
+
+        checkpoint = aioarxiv.JSONCheckpointStore(self.path).load("test")
+        self.assertTrue(checkpoint.done)
+        self.assertEqual(await self.harvest(session, query), [])
+
+    async def test_crash_repeats_only_uncommitted_page(self):
+        session = PagedSession(corpus(25))
+        query = aioarxiv.SearchQuery(query="all:test")
+        # Abandoning the generator without closing it is like a crash.
+        await self.harvest(session, query, take=13, close=False)
+        checkpoint = aioarxiv.JSONCheckpointStore(self.path).load("test")
+        self.assertEqual((checkpoint.offset, checkpoint.yielded), (10, 10))
+
+        self.assertEqual(await self.harvest(session, query), corpus(25)[10:])
+
+    async def test_skips_results_shifted_by_new_papers(self):
+        ids = corpus(30)
+        session = PagedSession(ids[5:])
+        query = aioarxiv.SearchQuery(query="all:test")
+        first = await self.harvest(session, query, take=10)
+        # Newer papers push earlier results onto later pages.
+        session.ids = ids[:5] + ids[5:]
+        second = await self.harvest(session, query)
+        # The new papers are yielded, and nothing is repeated.
+        self.assertEqual(first + second, ids[5:15] + ids[:5] + ids[15:])
+
+    async def test_max_results_across_runs(self):
+        session = PagedSession(corpus(25))
+        query = aioarxiv.SearchQuery(query="all:test", max_results=15)
+        first = await self.harvest(session, query, take=4)
+        second = await self.harvest(session, query)
+        self.assertEqual(first + second, corpus(15))
+        # Raising the limit carries on from the same cursor.
+        query.max_results = 20
+        self.assertEqual(await self.harvest(session, query), corpus(20)[15:])
+
+    async def test_other_query_starts_over(self):
+        session = PagedSession(corpus(12))
+        await self.harvest(session, aioarxiv.SearchQuery(query="all:test"), take=5)
+        with self.assertLogs("aioarxiv.checkpoint", level="WARNING"):
+            results = await self.harvest(session, aioarxiv.SearchQuery(query="all:other"))
+        self.assertEqual(results, corpus(12))
+
+    async def test_planned_harvest(self):
+        session = CorpusSession(size=40, spacing=timedelta(hours=1))
+        store = aioarxiv.SQLiteCheckpointStore(":memory:")
+        query = aioarxiv.SearchQuery(query="all:test")
+        end = datetime(2024, 1, 3, tzinfo=timezone.utc)
+        async with aioarxiv.Client(delay_seconds=0, page_size=4) as client:
+            with patch.object(client, "_session", session):
+                planner = aioarxiv.QueryPlanner(client, max_shard_size=10)
+                harvest = planner.harvest(query, store, START, end, key="planned")
+                first = [r.get_short_id() async for r, _ in zip_range(harvest, 17)]
+                await harvest.aclose()
+                probes = len(session.requests)
+
+                checkpoint = store.load("planned")
+                self.assertGreater(len(checkpoint.shards), 1)
+                second = [
+                    r.get_short_id()
+                    async for r in planner.harvest(query, store, START, end, key="planned")
+                ]
+                # The saved plan is reused rather than probed again.
+                self.assertFalse(
+                    any(
+                        "max_results=1&" in url or url.endswith("max_results=1")
+                        for url in session.requests[probes:]
+                    )
+                )
+        self.assertEqual(first + second, ["2401.{:05d}v1".format(i) for i in range(40)])
+
+
+async def zip_range(generator, n: int):
+    """
+    Yields the first `n` items of an async generator, each paired with its index.
+    """
+    i = 0
+    async for item in generator:
+        yield item, i
+        i += 1
+        if i == n:
+            return
@@ -1,12 +1,14 @@
 import unittest
-from unittest.mock import MagicMock, call, patch, AsyncMock
+from unittest.mock import DEFAULT, MagicMock, call, patch, AsyncMock
 import aioarxiv
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List
 from pytest import approx
 import aiohttp
 import asyncio
 import os
+import time
+from yarl import URL
 
 
 def session_with_empty_response(code: int) -> AsyncMock:
@@ -92,6 +94,85 @@ def session_with_mock_feed(feed_type: str = "valid", code: int = 200) -> AsyncMo
     return mock_session
 
 
+def atom_page(start: int, count: int, total: int) -> bytes:
+    """
+    Build an arXiv API Atom page containing `count` entries from `start`.
+
+    Args:
+        start (int): Offset of the first entry on the page
+        count (int): Number of entries on the page
+        total (int): Value reported in `opensearch:totalResults`
+
+    Returns:
+        bytes: The encoded Atom document
+    """
+    entries = "".join(
+        """
+  <entry>
+    <id>http://arxiv.org/abs/2401.{0:05d}v1</id>
+    <updated>2024-01-01T00:00:00Z</updated>
+    <published>2024-01-01T00:00:00Z</published>
+    <title>Paper {0}</title>
+    <summary>Abstract {0}</summary>
+    <author><name>Author {0}</name></author>
+    <link href="http://arxiv.org/abs/2401.{0:05d}v1" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.{0:05d}v1" rel="related" type="application/pdf"/>
+    <arxiv:primary_category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>""".format(i)
+        for i in range(start, min(start + count, total))
+    )
+    return """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title>arXiv Query</title>
+  <opensearch:totalResults>{}</opensearch:totalResults>
+  <opensearch:startIndex>{}</opensearch:startIndex>
+  <opensearch:itemsPerPage>{}</opensearch:itemsPerPage>{}
+</feed>""".format(total, start, count, entries).encode("utf-8")
+
+
+class AtomPageSession:
+    """
+    A stand-in for `aiohttp.ClientSession` serving `atom_page`s for the
+    `start` and `max_results` of each requested URL.
+
+    Requests for any page but the first block until `release` is set, which
+    lets tests observe requests that are still in flight.
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self.requested: List[str] = []
+        self.cancelled: List[str] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    def get(self, url, **kwargs):
+        session = self
+
+        class _Request:
+            async def __aenter__(self):
+                session.requested.append(str(url))
+                start = int(url.query["start"])
+                if start > 0:
+                    try:
+                        await session.release.wait()
+                    except asyncio.CancelledError:
+                        session.cancelled.append(str(url))
+                        raise
+                response = MagicMock(spec=aiohttp.ClientResponse)
+                response.status = 200
+                response.content.read = AsyncMock(
+                    return_value=atom_page(start, int(url.query["max_results"]), session.total)
+                )
+                return response
+
+            async def __aexit__(self, *args):
+                return None
+
+        return _Request()
+
+
 class TestClient(unittest.IsolatedAsyncioTestCase):
     async def test_invalid_format_id(self):
         with self.assertRaises(aioarxiv.HTTPError):
@@ -389,9 +470,9 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
                 # A client should sleep until delay_seconds have passed.
                 await client._parse_feed(url)
                 mock_sleep.assert_not_called()
-                # Overwrite _last_request_dt to minimize flakiness: different
+                # Overwrite _last_slot to minimize flakiness: different
                 # environments will have different page fetch times.
-                client.rate_limiter._last_request_dt = datetime.now()
+                client.rate_limiter._last_slot = time.monotonic()
                 await client._parse_feed(url)
                 mock_sleep.assert_called_once_with(approx(client.delay_seconds, rel=1e-3))
 
@@ -409,7 +490,7 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
                 # `test_sleep_standard`.
                 await client._parse_feed(url1)
                 mock_sleep.assert_not_called()
-                client.rate_limiter._last_request_dt = datetime.now()
+                client.rate_limiter._last_slot = time.monotonic()
                 await client._parse_feed(url2)
                 mock_sleep.assert_called_once_with(approx(client.delay_seconds, rel=1e-3))
 
@@ -421,17 +502,13 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
             # Patch the ClientSession creation in the Client class
             with patch.object(client, "_session", mock_session):
                 url = client._format_url(aioarxiv.SearchQuery(query="quantum"), 0, 1)
-                # If _last_request_dt is less than delay_seconds ago, sleep.
-                client.rate_limiter._last_request_dt = datetime.now() - timedelta(
-                    seconds=client.delay_seconds - 1
-                )
+                # If _last_slot is less than delay_seconds ago, sleep.
+                client.rate_limiter._last_slot = time.monotonic() - (client.delay_seconds - 1)
                 await client._parse_feed(url)
                 mock_sleep.assert_called_once()
                 mock_sleep.reset_mock()
-                # If _last_request_dt is at least delay_seconds ago, don't sleep.
-                client.rate_limiter._last_request_dt = datetime.now() - timedelta(
-                    seconds=client.delay_seconds
-                )
+                # If _last_slot is at least delay_seconds ago, don't sleep.
+                client.rate_limiter._last_slot = time.monotonic() - client.delay_seconds
                 await client._parse_feed(url)
                 mock_sleep.assert_not_called()
 
@@ -453,6 +530,17 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
         # Create a mock ClientSession
         mock_session = session_with_empty_response(code=500)
         async with aioarxiv.Client() as client:
+            client.retry_policy.jitter = 0
+            # The mocked sleep returns immediately; advance the limiter's clock
+            # as if it had actually slept.
+            now = time.monotonic()
+            client.rate_limiter.clock = lambda: now
+
+            async def advance_clock(seconds):
+                nonlocal now
+                now += seconds
+
+            mock_sleep.side_effect = advance_clock
             # Patch the ClientSession creation in the Client class
             with patch.object(client, "_session", mock_session):
                 url = client._format_url(aioarxiv.SearchQuery(query="quantum"), 0, 1)
@@ -460,16 +548,33 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
                     await client._parse_feed(url)
                 except aioarxiv.HTTPError:
                     pass
-                # Should sleep between retries.
+                # Should back off exponentially between retries; the backoff
+                # already covers the rate limiter's delay.
                 mock_sleep.assert_called()
                 self.assertEqual(mock_sleep.call_count, client.num_retries)
                 mock_sleep.assert_has_calls(
                     [
-                        call(approx(client.delay_seconds, abs=1e-2)),
+                        call(approx(client.retry_policy.backoff_base * 2**i, abs=1e-2))
+                        for i in range(client.num_retries)
                     ]
-                    * client.num_retries
                 )
 
+    @patch("asyncio.sleep", return_value=None)
+    async def test_sleep_separate_hosts(self, mock_sleep):
+        mock_session = session_with_mock_feed("valid")
+        async with aioarxiv.Client() as client:
+            with patch.object(client, "_session", mock_session):
+                search_url = client._format_url(aioarxiv.SearchQuery(query="quantum"), 0, 1)
+                rss_url = client._format_url(aioarxiv.RSSQuery(query="cs"), 0, 1)
+                # The query API and RSS feeds draw from separate budgets.
+                await client._parse_feed(search_url)
+                await client._parse_feed(rss_url)
+                mock_sleep.assert_not_called()
+                # Requests to the same host are still spaced.
+                client.rate_limiters.for_url(rss_url)._last_slot = time.monotonic()
+                await client._parse_feed(rss_url)
+                mock_sleep.assert_called_once_with(approx(client.delay_seconds, rel=1e-3))
+
     async def test_concurrent_requests_rate_limit(self):
         # Create a mock session that simulates network requests
         mock_session = session_with_empty_response(200)
@@ -524,11 +629,19 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
     async def test_live_concurrent_requests(self):
         async with aioarxiv.Client() as client:
             request_times: List[datetime] = []
+            session_get = client._session.get
+
+            # The rate limiter spaces request starts, so record when each
+            # request is sent rather than when its results are consumed.
+            def record_request(*args, **kwargs):
+                request_times.append(datetime.now())
+                return session_get(*args, **kwargs)
+
+            client._session.get = record_request
 
             async def make_request(query):
                 search = aioarxiv.SearchQuery(query=query, max_results=1)
                 results = [r async for r in client.results(search)]
-                request_times.append(datetime.now())
                 return results
 
             # Perform 3 concurrent requests
@@ -557,10 +670,17 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
             with patch.object(client, "_session", mock_session):
                 request_times: List[datetime] = []
 
+                # The rate limiter spaces request starts, so record when each
+                # request is sent rather than when its results are consumed.
+                def record_request(*args, **kwargs):
+                    request_times.append(datetime.now())
+                    return DEFAULT
+
+                mock_session.get.side_effect = record_request
+
                 async def make_request(query):
                     rss_query = aioarxiv.RSSQuery(query)
                     results = [r async for r in client.results(rss_query)]
-                    request_times.append(datetime.now())
                     return results
 
                 # Perform 3 concurrent requests
@@ -582,3 +702,51 @@ class TestClient(unittest.IsolatedAsyncioTestCase):
                         2.9,  # Allowing slight tolerance under 3 seconds
                         f"Requests {i-1} and {i} were too close: {time_diff} seconds",
                     )
+
+    async def test_prefetch_pages(self):
+        session = AtomPageSession(total=35)
+        async with aioarxiv.Client(page_size=10, delay_seconds=0, prefetch_pages=2) as client:
+            with patch.object(client, "_session", session):
+                search = aioarxiv.SearchQuery(query="testing")
+                results = [r async for r in client.results(search)]
+
+        self.assertEqual(
+            [r.get_short_id() for r in results],
+            ["2401.{:05d}v1".format(i) for i in range(35)],
+        )
+        # Each page is requested exactly once despite being prefetched.
+        starts = sorted(int(URL(url).query["start"]) for url in session.requested)
+        self.assertEqual(starts, [0, 10, 20, 30])
+
+    async def test_prefetch_respects_max_results(self):
+        session = AtomPageSession(total=100)
+        async with aioarxiv.Client(page_size=10, delay_seconds=0, prefetch_pages=5) as client:
+            with patch.object(client, "_session", session):
+                search = aioarxiv.SearchQuery(query="testing", max_results=15)
+                results = [r async for r in client.results(search)]
+
+        self.assertEqual(len(results), 15)
+        # Pages past max_results are never prefetched.
+        self.assertEqual(len(session.requested), 2)
+
+    async def test_prefetch_cancelled_on_close(self):
+        session = AtomPageSession(total=100)
+        session.release.clear()
+        async with aioarxiv.Client(page_size=10, delay_seconds=0, prefetch_pages=3) as client:
+            with patch.object(client, "_session", session):
+                generator = client.results(aioarxiv.SearchQuery(query="testing"))
+                first = await generator.__anext__()
+                self.assertEqual(first.get_short_id(), "2401.00000v1")
+                # Let the background fetches start and block in flight.
+                await asyncio.sleep(0)
+                self.assertGreater(len(session.requested), 1)
+
+                await generator.aclose()
+                await asyncio.sleep(0)
+                self.assertEqual(sorted(session.cancelled), sorted(session.requested[1:]))
+
+                # Cancelled prefetches never reach the network afterwards.
+                requested = list(session.requested)
+                session.release.set()
+                await asyncio.sleep(0.01)
+                self.assertEqual(session.requested, requested)
@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from yarl import URL
+
+import aioarxiv
+from tests.test_client import session_with_empty_response
+from tests.test_lookup import IdListSession
+
+IDS = ["2401.00001", "2401.00002"]
+
+
+class TestRequestCoalescing(unittest.IsolatedAsyncioTestCase):
+    def url(self, client: aioarxiv.Client, ids=IDS) -> URL:
+        return URL(client._format_url(aioarxiv.SearchQuery(id_list=ids), 0, 10))
+
+    async def test_concurrent_identical_fetches_share_one_request(self):
+        session = IdListSession({i: 1 for i in IDS}, delays={IDS[0]: 0.05})
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                url = self.url(client)
+                # The same request with its parameters in another order.
+                reordered = url.with_query(list(reversed(list(url.query.items()))))
+                feeds = await asyncio.gather(
+                    *(client._parse_feed(u) for u in [url, url, reordered, url])
+                )
+
+        self.assertEqual(len(session.requested), 1)
+        self.assertTrue(all(feed is feeds[0] for feed in feeds))
+        self.assertEqual(len(feeds[0].results), 2)
+        self.assertEqual(client.stats.coalesced_requests, 3)
+        self.assertEqual(client._in_flight, {})
+
+    async def test_distinct_and_sequential_fetches_not_shared(self):
+        session = IdListSession({i: 1 for i in IDS}, delays={IDS[0]: 0.02})
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                await asyncio.gather(
+                    client._parse_feed(self.url(client)),
+                    client._parse_feed(self.url(client, IDS[:1])),
+                )
+                await client._parse_feed(self.url(client))
+        self.assertEqual(len(session.requested), 3)
+        self.assertEqual(client.stats.coalesced_requests, 0)
+
+    async def test_disabled(self):
+        session = IdListSession({i: 1 for i in IDS}, delays={IDS[0]: 0.02})
+        async with aioarxiv.Client(delay_seconds=0, coalesce_requests=False) as client:
+            with patch.object(client, "_session", session):
+                url = self.url(client)
+                await asyncio.gather(client._parse_feed(url), client._parse_feed(url))
+        self.assertEqual(len(session.requested), 2)
+
+    async def test_cancelled_follower_does_not_cancel_request(self):
+        session = IdListSession({i: 1 for i in IDS}, delays={IDS[0]: 0.05})
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                url = self.url(client)
+                first = asyncio.ensure_future(client._parse_feed(url))
+                second = asyncio.ensure_future(client._parse_feed(url))
+                await asyncio.sleep(0.01)
+                second.cancel()
+                feed = await first
+        self.assertTrue(second.cancelled())
+        self.assertEqual(len(feed.results), 2)
+        self.assertEqual(len(session.requested), 1)
+        self.assertEqual(session.cancelled, set())
+
+    async def test_follower_takes_over_from_cancelled_caller(self):
+        session = IdListSession({i: 1 for i in IDS}, delays={IDS[0]: 0.05})
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                url = self.url(client)
+                first = asyncio.ensure_future(client._parse_feed(url))
+                second = asyncio.ensure_future(client._parse_feed(url))
+                third = asyncio.ensure_future(client._parse_feed(url))
+                await asyncio.sleep(0.01)
+                first.cancel()
+                feeds = await asyncio.gather(second, third)
+        self.assertEqual(session.cancelled, {IDS[0]})
+        # One of the followers repeats the request and the other joins it.
+        self.assertEqual(len(session.requested), 2)
+        self.assertIs(feeds[0], feeds[1])
+        self.assertEqual(client._in_flight, {})
+
+    async def test_errors_shared(self):
+        session = session_with_empty_response(500)
+        retry_policy = aioarxiv.RetryPolicy(max_retries=1, backoff_base=0.01, jitter=0)
+        async with aioarxiv.Client(delay_seconds=0, retry_policy=retry_policy) as client:
+            with patch.object(client, "_session", session):
+                url = self.url(client)
+                errors = await asyncio.gather(
+                    client._parse_feed(url), client._parse_feed(url), return_exceptions=True
+                )
+        self.assertIsInstance(errors[0], aioarxiv.HTTPError)
+        self.assertIs(errors[0], errors[1])
+        self.assertEqual(session.get.call_count, 2)
@@ -1,9 +1,15 @@
 import aioarxiv
+import asyncio
+import hashlib
 import os
 import shutil
 import tempfile
+import threading
 import unittest
 import aiohttp
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aioarxiv.downloads import _QueuedFileWriter
 
 
 class TestDownload(unittest.IsolatedAsyncioTestCase):
@@ -196,3 +202,310 @@ class TestDownload(unittest.IsolatedAsyncioTestCase):
         await self.fetched_result.download_pdf(
             dirpath=self.temp_dir
         )  # Should create new session internally
+
+
+class TestDownloadRateLimit(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.result = aioarxiv.SearchResult(
+            entry_id="https://arxiv.org/abs/1605.08386v1",
+            title="Heat-bath random walks with Markov bases",
+        )
+
+    def mock_session(self) -> AsyncMock:
+        async def iter_chunked(size):
+            yield b"%PDF-1.4"
+
+        response = MagicMock(spec=aiohttp.ClientResponse)
+        response.status = 200
+        response.headers = {}
+        response.content_length = 8
+        response.content.iter_chunked = iter_chunked
+        session = AsyncMock(spec=aiohttp.ClientSession)
+        session.get.return_value.__aenter__.return_value = response
+        return session
+
+    @patch("asyncio.sleep", return_value=None)
+    async def test_download_uses_host_limiter(self, mock_sleep):
+        client = aioarxiv.Client()
+        session = self.mock_session()
+        limiter = client.rate_limiters.for_url(self.result.pdf_url)
+        self.assertIsNot(limiter, client.rate_limiter)
+
+        path = await self.result.download_pdf(
+            dirpath=self.temp_dir, session=session, rate_limiters=client.rate_limiters
+        )
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"%PDF-1.4")
+        mock_sleep.assert_not_called()
+
+        await self.result.download_source(
+            dirpath=self.temp_dir, session=session, rate_limiters=client.rate_limiters
+        )
+        mock_sleep.assert_called_once()
+
+    @patch("asyncio.sleep", return_value=None)
+    async def test_download_defaults_to_shared_limiters(self, mock_sleep):
+        session = self.mock_session()
+        await self.result.download_pdf(dirpath=self.temp_dir, session=session)
+        await self.result.download_pdf(dirpath=self.temp_dir, session=session)
+        # Downloads without a client's limiters still wait on the host's.
+        self.assertIn("arxiv.org", aioarxiv.downloads.DEFAULT_RATE_LIMITERS)
+        self.assertGreaterEqual(mock_sleep.call_count, 1)
+
+
+class TestPooledDownloads(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+
+        async def handler(request):
+            return web.Response(body=b"%PDF " + request.match_info["id"].encode())
+
+        app = web.Application()
+        app.router.add_get("/pdf/{id}", handler)
+        app.router.add_get("/src/{id}", handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.temp_dir = tempfile.mkdtemp()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        shutil.rmtree(self.temp_dir)
+
+    def result(self, short_id: str) -> aioarxiv.SearchResult:
+        return aioarxiv.SearchResult(
+            entry_id="http://arxiv.org/abs/" + short_id,
+            title="Paper " + short_id,
+            links=[
+                aioarxiv.SearchResult.Link(
+                    str(self.server.make_url("/pdf/" + short_id)), title="pdf"
+                )
+            ],
+        )
+
+    async def test_reuses_pooled_connections(self):
+        results = [self.result("2401.0000{}".format(i)) for i in range(3)]
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            paths = [await client.download_pdf(r, dirpath=self.temp_dir) for r in results]
+            source = await client.download_source(results[0], dirpath=self.temp_dir)
+
+        for path, result in zip(paths, results):
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"%PDF " + result.get_short_id().encode())
+        self.assertTrue(source.endswith(".tar.gz"))
+        self.assertEqual(
+            client.stats.bytes_written, sum(os.path.getsize(p) for p in paths + [source])
+        )
+        self.assertGreater(client.stats.write_seconds, 0)
+        self.assertEqual(client.stats.connections_created, 1)
+        self.assertEqual(client.stats.connections_reused, 3)
+        self.assertEqual(client.stats.connection_reuse_ratio, 0.75)
+
+    async def test_connector_options(self):
+        client = aioarxiv.Client(connections_per_host=2, keepalive_timeout=5.0, dns_cache_ttl=60)
+        async with client:
+            connector = client._session.connector
+            self.assertEqual(connector.limit_per_host, 2)
+            self.assertTrue(connector.use_dns_cache)
+            self.assertEqual(connector._keepalive_timeout, 5.0)
+
+    async def test_requires_session(self):
+        with self.assertRaises(RuntimeError):
+            await aioarxiv.Client().download_pdf(self.result("2401.00000"), self.temp_dir)
+
+
+class TestDownloadMany(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+
+        self.served_dir = tempfile.mkdtemp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.bodies = {}
+        for i in range(4):
+            short_id = "2401.0000{}".format(i)
+            self.bodies[short_id] = os.urandom(300_000 + i)
+            with open(os.path.join(self.served_dir, short_id), "wb") as f:
+                f.write(self.bodies[short_id])
+        self.ranges = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def handler(request):
+            self.ranges.append(request.headers.get("Range"))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(0.01)
+            finally:
+                self.in_flight -= 1
+            path = os.path.join(self.served_dir, request.match_info["id"])
+            if not os.path.exists(path):
+                raise web.HTTPNotFound()
+            return web.FileResponse(path)
+
+        app = web.Application()
+        app.router.add_get("/pdf/{id}", handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        shutil.rmtree(self.temp_dir)
+        shutil.rmtree(self.served_dir)
+
+    def result(self, short_id: str) -> aioarxiv.SearchResult:
+        return aioarxiv.SearchResult(
+            entry_id="http://arxiv.org/abs/" + short_id,
+            title="Paper",
+            links=[
+                aioarxiv.SearchResult.Link(
+                    str(self.server.make_url("/pdf/" + short_id)), title="pdf"
+                )
+            ],
+        )
+
+    def read(self, outcome: aioarxiv.DownloadResult) -> bytes:
+        with open(outcome.path, "rb") as f:
+            return f.read()
+
+    async def test_batch_reports_each_file(self):
+        results = [self.result(i) for i in ["2401.00000", "2401.09999", "2401.00001"]]
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            outcomes = await client.download_many(results, dest=self.temp_dir, concurrency=2)
+
+        self.assertEqual([o.status for o in outcomes], ["downloaded", "failed", "downloaded"])
+        self.assertEqual([o.result for o in outcomes], results)
+        self.assertIsInstance(outcomes[1].error, aiohttp.ClientResponseError)
+        self.assertEqual(self.read(outcomes[0]), self.bodies["2401.00000"])
+        self.assertEqual(outcomes[2].size, len(self.bodies["2401.00001"]))
+        self.assertFalse(any(name.endswith(".part") for name in os.listdir(self.temp_dir)))
+
+    async def test_concurrency_bounded(self):
+        results = [self.result("2401.0000{}".format(i)) for i in range(4)]
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            outcomes = await client.download_many(results, dest=self.temp_dir, concurrency=2)
+        self.assertTrue(all(o.ok for o in outcomes))
+        self.assertEqual(self.max_in_flight, 2)
+
+    async def test_resumes_partial_file(self):
+        result = self.result("2401.00002")
+        body = self.bodies["2401.00002"]
+        path = os.path.join(self.temp_dir, result._get_default_filename())
+        with open(path + ".part", "wb") as f:
+            f.write(body[:1000])
+
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            [outcome] = await client.download_many([result], dest=self.temp_dir)
+
+        self.assertEqual(outcome.status, "resumed")
+        self.assertEqual(self.ranges, ["bytes=1000-"])
+        self.assertEqual(self.read(outcome), body)
+        self.assertEqual(outcome.sha256, hashlib.sha256(body).hexdigest())
+        self.assertFalse(os.path.exists(path + ".part"))
+
+    async def test_skips_existing_files(self):
+        result = self.result("2401.00000")
+        path = os.path.join(self.temp_dir, result._get_default_filename())
+        with open(path, "wb") as f:
+            f.write(b"already here")
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            [skipped] = await client.download_many([result], dest=self.temp_dir)
+            [overwritten] = await client.download_many([result], dest=self.temp_dir, overwrite=True)
+        self.assertEqual(skipped.status, "skipped")
+        self.assertEqual(overwritten.status, "downloaded")
+        self.assertEqual(self.ranges, [None])
+        self.assertEqual(self.read(overwritten), self.bodies["2401.00000"])
+
+    async def test_checksum_mismatch(self):
+        results = [self.result("2401.00000"), self.result("2401.00001")]
+        checksums = {
+            "2401.00000": "0" * 64,
+            "2401.00001": hashlib.sha256(self.bodies["2401.00001"]).hexdigest(),
+        }
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            outcomes = await client.download_many(results, dest=self.temp_dir, checksums=checksums)
+
+        self.assertEqual([o.status for o in outcomes], ["failed", "downloaded"])
+        self.assertIsInstance(outcomes[0].error, aioarxiv.DownloadError)
+        self.assertEqual(os.listdir(self.temp_dir), [os.path.basename(outcomes[1].path)])
+
+    async def test_result_without_url(self):
+        # Neither a PDF link nor an arXiv entry ID to construct one from.
+        broken = aioarxiv.SearchResult(entry_id="urn:broken", title="Broken")
+        self.assertIsNone(broken.pdf_url)
+        results = [broken, self.result("2401.00000")]
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            outcomes = await client.download_many(results, dest=self.temp_dir)
+            [source] = await client.download_many([broken], kind="source", dest=self.temp_dir)
+
+        self.assertEqual([o.status for o in outcomes], ["failed", "downloaded"])
+        self.assertIsInstance(outcomes[0].error, aioarxiv.DownloadError)
+        self.assertIs(outcomes[0].result, broken)
+        self.assertEqual(self.read(outcomes[1]), self.bodies["2401.00000"])
+        self.assertEqual(source.status, "failed")
+
+    async def test_invalid_kind(self):
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with self.assertRaises(ValueError):
+                await client.download_many([], kind="html", dest=self.temp_dir)
+
+
+class SlowFile:
+    """
+    A file-like object whose writes block until `release` is set, recording
+    the thread each write runs in.
+    """
+
+    def __init__(self, fail: bool = False):
+        self.release = threading.Event()
+        self.chunks = []
+        self.threads = set()
+        self.closed = False
+        self.fail = fail
+
+    def write(self, chunk: bytes):
+        self.threads.add(threading.current_thread())
+        self.release.wait(5)
+        if self.fail:
+            raise OSError("No space left on device")
+        self.chunks.append(chunk)
+
+    def close(self):
+        self.closed = True
+
+
+class TestQueuedWrites(unittest.IsolatedAsyncioTestCase):
+    async def test_writes_off_event_loop_with_bounded_queue(self):
+        stats = aioarxiv.ClientStats()
+        file = SlowFile()
+        writer = _QueuedFileWriter(file, None, stats, max_pending=2)
+        # One chunk is being written and two are queued; the next must wait.
+        for i in range(3):
+            await asyncio.wait_for(writer.write(bytes([i])), 1)
+        blocked = asyncio.ensure_future(writer.write(b"\x03"))
+        await asyncio.sleep(0.05)
+        self.assertFalse(blocked.done())
+
+        file.release.set()
+        await asyncio.wait_for(blocked, 1)
+        await writer.close()
+        self.assertEqual(b"".join(file.chunks), b"\x00\x01\x02\x03")
+        self.assertTrue(file.closed)
+        self.assertNotIn(threading.current_thread(), file.threads)
+        self.assertEqual((stats.writes, stats.bytes_written), (4, 4))
+        self.assertGreater(stats.max_write_seconds, 0.04)
+        self.assertAlmostEqual(stats.mean_write_seconds, stats.write_seconds / 4)
+
+    async def test_write_error_surfaces(self):
+        file = SlowFile(fail=True)
+        file.release.set()
+        writer = _QueuedFileWriter(file, None, None, max_pending=1)
+        await writer.write(b"x")
+        with self.assertRaises(OSError):
+            await writer.close()
+        self.assertTrue(file.closed)
+        with self.assertRaises(OSError):
+            await writer.write(b"x")
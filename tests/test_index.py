@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timezone
+
+import aioarxiv
+from aioarxiv.index import split_version
+from aioarxiv.parsers import ArxivParser
+from tests.test_parsers import load_mock_feed, result_fields
+
+
+def paper(short_id: str, title: str = "", summary: str = "", authors=("Ada Lovelace",)):
+    return aioarxiv.SearchResult(
+        entry_id="http://arxiv.org/abs/" + short_id,
+        updated=datetime(2024, 1, 2, tzinfo=timezone.utc),
+        title=title or "Paper " + short_id,
+        summary=summary,
+        authors=[aioarxiv.SearchResult.Author(name) for name in authors],
+        primary_category="cs.LG",
+        categories=["cs.LG", "stat.ML"],
+    )
+
+
+class TestLocalIndex(unittest.TestCase):
+    def setUp(self):
+        self.now = 1_000.0
+        self.index = aioarxiv.LocalIndex(":memory:", clock=lambda: self.now)
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_round_trip(self):
+        parser = ArxivParser()
+        results = parser.parse(load_mock_feed("search_mock_feed.xml")).results
+        results += parser.parse(load_mock_feed("rss_mock_feed.xml")).results
+        results.append(
+            aioarxiv.OAIResult(
+                entry_id="http://arxiv.org/abs/0704.0001v2",
+                title="Harvested",
+                datestamp=date(2008, 11, 13),
+                sets=["physics:hep-ph"],
+                versions=["v1", "v2"],
+            )
+        )
+        self.assertEqual(self.index.add_many(results), len(results))
+
+        found = self.index.get_many(r.get_short_id() for r in results)
+        self.assertEqual(len(found), len(results))
+        for result in results:
+            restored = found[result.get_short_id()]
+            self.assertIs(type(restored), type(result))
+            self.assertEqual(result_fields(restored), result_fields(result))
+
+    def test_versions(self):
+        self.index.add_many(
+            [paper("2401.00001v1", "Old title"), paper("2401.00001v2", "New title")]
+        )
+        self.index.add(paper("2401.00002v1"))
+
+        self.assertEqual(self.index.get("2401.00001").title, "New title")
+        self.assertEqual(self.index.get("arXiv:2401.00001v1").title, "Old title")
+        self.assertEqual(
+            self.index.get("https://arxiv.org/abs/2401.00002").get_short_id(), "2401.00002v1"
+        )
+        self.assertIsNone(self.index.get("2401.00001v3"))
+        self.assertIsNone(self.index.get("not an id"))
+        self.assertEqual(len(self.index), 2)
+        self.assertIn("2401.00002", self.index)
+
+        # Searches only match each paper's newest version.
+        self.assertEqual(self.index.search("title"), [paper("2401.00001v2")])
+        self.assertEqual(self.index.search("old"), [])
+
+    def test_search(self):
+        self.index.add_many(
+            [
+                paper("2401.00001", summary="We study transformers."),
+                paper("2401.00002", "Transformers for everything"),
+                paper("2401.00003", authors=["Ashish Vaswani"]),
+                paper("2401.00004", "Graphs"),
+            ]
+        )
+        # Title matches outrank summary matches.
+        self.assertEqual(
+            [r.get_short_id() for r in self.index.search("transformers")],
+            ["2401.00002", "2401.00001"],
+        )
+        self.assertEqual(
+            [r.get_short_id() for r in self.index.search("authors:vaswani")], ["2401.00003"]
+        )
+        self.assertEqual(len(self.index.search('categories:"stat.ML"', limit=3)), 3)
+        self.assertEqual(len(self.index.search('categories:"stat.ML"', offset=3)), 1)
+        self.assertEqual(
+            self.index.search("transformers NOT summary:study")[0].title,
+            "Transformers for everything",
+        )
+
+    def test_replace_reindexes(self):
+        self.index.add(paper("2401.00001", "Quantum gravity"))
+        self.index.add(paper("2401.00001", "Classical mechanics"))
+        self.assertEqual(self.index.search("quantum"), [])
+        self.assertEqual(len(self.index.search("classical")), 1)
+
+        self.index.delete("2401.00001")
+        self.assertEqual(self.index.search("classical"), [])
+        self.assertEqual(len(self.index), 0)
+
+    def test_batched_transactions(self):
+        self.index.batch_size = 2
+
+        def results():
+            for i in range(3):
+                yield paper("2401.{:05d}".format(i))
+            raise RuntimeError("interrupted")
+
+        with self.assertRaises(RuntimeError):
+            self.index.add_many(results())
+        # The complete batch was committed; the partial one wasn't.
+        self.assertEqual(len(self.index), 2)
+
+    def test_max_age(self):
+        self.index.add(paper("2401.00001v1"))
+        self.now += 3600
+        self.index.add(paper("2401.00002v1"))
+        self.assertEqual(
+            sorted(self.index.get_many(["2401.00001", "2401.00002v1"], max_age=60)),
+            ["2401.00002v1"],
+        )
+        self.assertEqual(len(self.index.get_many(["2401.00001", "2401.00002v1"])), 2)
+
+    def test_split_version(self):
+        self.assertEqual(split_version("2107.05580v12"), ("2107.05580", 12))
+        self.assertEqual(split_version("quant-ph/0201082"), ("quant-ph/0201082", 0))
+
+
+class TestLocalIndexFile(unittest.TestCase):
+    def test_persisted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "papers.db")
+            index = aioarxiv.LocalIndex(path)
+            index.add(paper("2401.00001v1", "Persisted paper"))
+            index.close()
+
+            index = aioarxiv.LocalIndex(path)
+            self.assertEqual(index.get("2401.00001").title, "Persisted paper")
+            self.assertEqual(len(index.search("persisted")), 1)
+            index.close()
@@ -0,0 +1,177 @@
+import asyncio
+import unittest
+from typing import Dict, List, Set
+from unittest.mock import patch
+
+import aioarxiv
+from aioarxiv.lookup import chunk_ids, dedup_ids, match_ids
+from aioarxiv.models.utilities import normalize_arxiv_id
+
+
+def atom_feed(short_ids: List[str]) -> bytes:
+    """
+    Build an arXiv API Atom feed with one entry per short ID.
+    """
+    entries = "".join(
+        """
+  <entry>
+    <id>http://arxiv.org/abs/{0}</id>
+    <updated>2024-01-01T00:00:00Z</updated>
+    <published>2024-01-01T00:00:00Z</published>
+    <title>Paper {0}</title>
+    <summary>Abstract {0}</summary>
+    <author><name>Author</name></author>
+    <arxiv:primary_category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>""".format(short_id)
+        for short_id in short_ids
+    )
+    return """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <opensearch:totalResults>{}</opensearch:totalResults>{}
+</feed>""".format(len(short_ids), entries).encode("utf-8")
+
+
+class IdListSession:
+    """
+    A stand-in for `aiohttp.ClientSession` answering `id_list` queries for the
+    IDs in `known`, which maps unversioned IDs to their latest version.
+
+    Each request takes `delays` seconds for its first ID (default 0), which
+    lets tests control the order in which concurrent requests complete.
+    """
+
+    def __init__(self, known: Dict[str, int], delays: Dict[str, float] = None):
+        self.known = known
+        self.delays = delays or {}
+        self.requested: List[List[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled: Set[str] = set()
+
+    def get(self, url, **kwargs):
+        session = self
+        id_list = url.query["id_list"].split(",")
+
+        class _Response:
+            status = 200
+            headers = {}
+
+            class content:
+                @staticmethod
+                async def read():
+                    found = []
+                    for arxiv_id in id_list:
+                        base, _, version = arxiv_id.partition("v")
+                        if base in session.known:
+                            found.append(base + "v" + (version or str(session.known[base])))
+                    return atom_feed(found)
+
+        class _Request:
+            async def __aenter__(self):
+                session.requested.append(id_list)
+                session.in_flight += 1
+                session.max_in_flight = max(session.max_in_flight, session.in_flight)
+                try:
+                    await asyncio.sleep(session.delays.get(id_list[0], 0))
+                except asyncio.CancelledError:
+                    session.cancelled.add(id_list[0])
+                    raise
+                finally:
+                    session.in_flight -= 1
+                return _Response()
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Request()
+
+    async def close(self):
+        pass
+
+
+class TestIdHelpers(unittest.TestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize_arxiv_id(" arXiv:2107.05580v1"), "2107.05580v1")
+        self.assertEqual(normalize_arxiv_id("https://arxiv.org/pdf/2107.05580.pdf"), "2107.05580")
+        self.assertEqual(
+            normalize_arxiv_id("https://arxiv.org/abs/quant-ph/0201082v1"), "quant-ph/0201082v1"
+        )
+        self.assertEqual(normalize_arxiv_id("math.GT/0309136"), "math.GT/0309136")
+        self.assertIsNone(normalize_arxiv_id("abc"))
+        self.assertIsNone(normalize_arxiv_id("0000.000"))
+
+    def test_dedup(self):
+        requested, invalid = dedup_ids(
+            ["2107.05580", "arXiv:2107.05580", "2107.05580v1", "nope", "hep-th/9901001"]
+        )
+        self.assertEqual(requested, ["2107.05580", "2107.05580v1", "hep-th/9901001"])
+        self.assertEqual(invalid, ["nope"])
+
+    def test_chunk_by_count_and_length(self):
+        ids = ["2401.{:05d}".format(i) for i in range(10)]
+        self.assertEqual([len(c) for c in chunk_ids(ids, 4, 10_000)], [4, 4, 2])
+        # Each ID is 10 characters, plus a comma after the first.
+        self.assertEqual([len(c) for c in chunk_ids(ids, 100, 32)], [3, 3, 3, 1])
+        self.assertEqual(sum(chunk_ids(ids, 3, 32), []), ids)
+
+    def test_match_versions(self):
+        results = [
+            aioarxiv.SearchResult(entry_id="http://arxiv.org/abs/2401.00001v3"),
+            aioarxiv.SearchResult(entry_id="http://arxiv.org/abs/2401.00002v1"),
+        ]
+        found = match_ids(["2401.00001", "2401.00002v2", "2401.00002v1"], results)
+        self.assertEqual(sorted(found), ["2401.00001", "2401.00002v1"])
+
+
+class TestGetByIds(unittest.IsolatedAsyncioTestCase):
+    async def test_ordered_with_missing(self):
+        known = {"2401.{:05d}".format(i): 1 for i in range(0, 20, 2)}
+        ids = ["2401.{:05d}".format(i) for i in reversed(range(20))]
+        # Make earlier chunks finish last.
+        session = IdListSession(known, delays={ids[0]: 0.05, ids[5]: 0.02})
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                lookup = client.get_by_ids(ids + ["bad id", ids[0]], chunk_size=5)
+                results = [r async for r in lookup]
+
+        self.assertEqual(
+            [r.get_short_id() for r in results],
+            [i + "v1" for i in ids if i in known],
+        )
+        self.assertEqual(lookup.missing, [i for i in ids if i not in known])
+        self.assertEqual(lookup.invalid, ["bad id"])
+        self.assertEqual(len(session.requested), 4)
+        self.assertTrue(all(len(chunk) <= 5 for chunk in session.requested))
+
+    async def test_unordered_yields_first_completed(self):
+        ids = ["2401.{:05d}".format(i) for i in range(4)]
+        session = IdListSession({i: 2 for i in ids}, delays={ids[0]: 0.05})
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                lookup = client.get_by_ids(ids, ordered=False, chunk_size=2)
+                results = [r.get_short_id() async for r in lookup]
+        self.assertEqual(results, ["2401.00002v2", "2401.00003v2", "2401.00000v2", "2401.00001v2"])
+        self.assertEqual(lookup.missing, [])
+
+    async def test_concurrency_bounded(self):
+        ids = ["2401.{:05d}".format(i) for i in range(10)]
+        session = IdListSession({}, delays={i: 0.01 for i in ids})
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                lookup = client.get_by_ids(ids, concurrency=3, chunk_size=1)
+                self.assertEqual([r async for r in lookup], [])
+        self.assertEqual(session.max_in_flight, 3)
+        self.assertEqual(lookup.missing, ids)
+
+    async def test_aclose_cancels_in_flight(self):
+        ids = ["2401.{:05d}".format(i) for i in range(3)]
+        session = IdListSession({i: 1 for i in ids}, delays={ids[1]: 10, ids[2]: 10})
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                lookup = client.get_by_ids(ids, chunk_size=1)
+                first = await lookup.__aiter__().__anext__()
+                await lookup.aclose()
+                await asyncio.sleep(0)
+        self.assertEqual(first.get_short_id(), "2401.00000v1")
+        self.assertEqual(session.cancelled, {ids[1], ids[2]})
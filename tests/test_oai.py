@@ -0,0 +1,311 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timezone
+from typing import Dict, List
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import aioarxiv
+from aioarxiv.checkpoint import query_fingerprint
+from aioarxiv.oai import OAIPage, OAIStreamParser
+
+OAI_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+  <responseDate>2024-03-01T00:00:00Z</responseDate>
+  <request verb="ListRecords">http://oaipmh.arxiv.org/oai</request>
+"""
+
+
+def arxiv_record(short_id: str, datestamp: str, deleted: bool = False) -> str:
+    """
+    An OAI-PMH record in the `arXiv` metadata format.
+    """
+    if deleted:
+        return """<record><header status="deleted">
+      <identifier>oai:arXiv.org:{0}</identifier><datestamp>{1}</datestamp>
+      <setSpec>cs</setSpec></header></record>""".format(short_id, datestamp)
+    return """<record>
+    <header>
+      <identifier>oai:arXiv.org:{0}</identifier>
+      <datestamp>{1}</datestamp>
+      <setSpec>cs</setSpec>
+    </header>
+    <metadata>
+      <arXiv xmlns="http://arxiv.org/OAI/arXiv/">
+        <id>{0}</id>
+        <created>2024-01-05</created>
+        <updated>{1}</updated>
+        <authors>
+          <author><keyname>Lovelace</keyname><forenames>Ada</forenames></author>
+          <author><keyname>Babbage</keyname><forenames>Charles</forenames><suffix>Jr</suffix>
+            <affiliation>Cambridge</affiliation></author>
+        </authors>
+        <title>Paper
+          {0}</title>
+        <categories>cs.LG stat.ML</categories>
+        <comments>10 pages</comments>
+        <journal-ref></journal-ref>
+        <doi>10.1000/{0}</doi>
+        <abstract>  Abstract {0}.  </abstract>
+      </arXiv>
+    </metadata>
+  </record>""".format(short_id, datestamp)
+
+
+ARXIV_RAW_RECORD = """<record>
+    <header>
+      <identifier>oai:arXiv.org:0704.0001</identifier>
+      <datestamp>2008-11-13</datestamp>
+      <setSpec>physics:hep-ph</setSpec>
+    </header>
+    <metadata>
+      <arXivRaw xmlns="http://arxiv.org/OAI/arXivRaw/">
+        <id>0704.0001</id>
+        <submitter>Pavel Nadolsky</submitter>
+        <version version="v1"><date>Mon, 2 Apr 2007 19:18:42 GMT</date><size>37kb</size></version>
+        <version version="v2"><date>Tue, 24 Jul 2007 20:10:27 GMT</date><size>37kb</size></version>
+        <title>Calculation of prompt diphoton production cross sections</title>
+        <authors>C. Bal\\'azs, E. L. Berger (Argonne and Chicago), P. M. Nadolsky and C.-P. Yuan</authors>
+        <categories>hep-ph</categories>
+        <journal-ref>Phys.Rev.D76:013009,2007</journal-ref>
+        <abstract>A fully differential calculation.</abstract>
+      </arXivRaw>
+    </metadata>
+  </record>"""
+
+
+class OAIServer:
+    """
+    A stub OAI-PMH repository serving `records` (short ID, datestamp, deleted)
+    in pages of `page_size`, with resumption tokens naming the next offset.
+    """
+
+    def __init__(self, records, page_size: int = 3, unavailable: int = 0):
+        self.records = records
+        self.page_size = page_size
+        self.unavailable = unavailable
+        self.requests: List[Dict[str, str]] = []
+        self.tokens: Dict[str, tuple] = {}
+        app = web.Application()
+        app.router.add_get("/oai", self.handle)
+        self.server = TestServer(app)
+
+    @property
+    def url(self) -> str:
+        return str(self.server.make_url("/oai"))
+
+    async def handle(self, request: web.Request) -> web.Response:
+        args = dict(request.query)
+        self.requests.append(args)
+        if self.unavailable:
+            self.unavailable -= 1
+            return web.Response(status=503, headers={"Retry-After": "0"})
+
+        if "resumptionToken" in args:
+            if args["resumptionToken"] not in self.tokens:
+                return self.error("badResumptionToken", "Token expired")
+            offset, window = self.tokens[args["resumptionToken"]]
+        else:
+            if args.get("metadataPrefix") not in ("arXiv", "arXivRaw"):
+                return self.error("cannotDisseminateFormat")
+            offset, window = 0, (args.get("from", ""), args.get("until", ""))
+        selected = self.selected(*window)
+        if not selected:
+            return self.error("noRecordsMatch", "No records")
+
+        page = "".join(arxiv_record(*r) for r in selected[offset : offset + self.page_size])
+        token = ""
+        if offset + self.page_size < len(selected):
+            token = "tok-{}".format(offset + self.page_size)
+            self.tokens[token] = (offset + self.page_size, window)
+        return web.Response(
+            body=OAI_HEADER
+            + "<ListRecords>{}".format(page)
+            + '<resumptionToken cursor="{}" completeListSize="{}">{}</resumptionToken>'.format(
+                offset, len(selected), token
+            )
+            + "</ListRecords></OAI-PMH>",
+            content_type="text/xml",
+        )
+
+    def selected(self, start: str, end: str):
+        return [
+            r for r in self.records if (not start or r[1] >= start) and (not end or r[1] <= end)
+        ]
+
+    @staticmethod
+    def error(code: str, message: str = "") -> web.Response:
+        return web.Response(
+            body=OAI_HEADER + '<error code="{}">{}</error></OAI-PMH>'.format(code, message),
+            content_type="text/xml",
+        )
+
+
+def records(n: int) -> List[tuple]:
+    return [("2401.{:05d}".format(i), "2024-02-{:02d}".format(i % 28 + 1), False) for i in range(n)]
+
+
+class TestOAIParser(unittest.TestCase):
+    def parse(self, body: str) -> OAIPage:
+        parser = OAIStreamParser()
+        data = (OAI_HEADER + "<ListRecords>" + body + "</ListRecords></OAI-PMH>").encode()
+        # Feed in small chunks, splitting records across chunks.
+        for i in range(0, len(data), 50):
+            parser.feed(data[i : i + 50])
+        return parser.close()
+
+    def test_arxiv_format(self):
+        page = self.parse(
+            arxiv_record("2401.00001", "2024-02-03")
+            + '<resumptionToken cursor="0" completeListSize="7">next</resumptionToken>'
+        )
+        self.assertEqual(
+            (page.resumption_token, page.complete_list_size, page.cursor), ("next", 7, 0)
+        )
+        (result,) = page.results
+        self.assertIsInstance(result, aioarxiv.SearchResult)
+        self.assertEqual(result.get_short_id(), "2401.00001")
+        self.assertEqual(result.title, "Paper 2401.00001")
+        self.assertEqual(result.summary, "Abstract 2401.00001.")
+        self.assertEqual([a.name for a in result.authors], ["Ada Lovelace", "Charles Babbage Jr"])
+        self.assertEqual(result.authors[1].institutions, "Cambridge")
+        self.assertEqual(
+            (result.primary_category, result.categories), ("cs.LG", ["cs.LG", "stat.ML"])
+        )
+        self.assertEqual(result.published, datetime(2024, 1, 5, tzinfo=timezone.utc))
+        self.assertEqual(result.updated, datetime(2024, 2, 3, tzinfo=timezone.utc))
+        self.assertEqual(
+            (result.comment, result.journal_ref, result.doi),
+            ("10 pages", None, "10.1000/2401.00001"),
+        )
+        self.assertEqual(result.pdf_url, "http://arxiv.org/pdf/2401.00001")
+        self.assertEqual(
+            (result.datestamp, result.sets, result.deleted), (date(2024, 2, 3), ["cs"], False)
+        )
+
+    def test_arxiv_raw_format(self):
+        (result,) = self.parse(ARXIV_RAW_RECORD).results
+        self.assertEqual(result.get_short_id(), "0704.0001v2")
+        self.assertEqual(result.versions, ["v1", "v2"])
+        self.assertEqual(result.published, datetime(2007, 4, 2, 19, 18, 42, tzinfo=timezone.utc))
+        self.assertEqual(result.updated, datetime(2007, 7, 24, 20, 10, 27, tzinfo=timezone.utc))
+        self.assertEqual(
+            [a.name for a in result.authors],
+            ["C. Bal\\'azs", "E. L. Berger", "P. M. Nadolsky", "C.-P. Yuan"],
+        )
+        self.assertEqual(result.authors[1].institutions, "Argonne and Chicago")
+        self.assertEqual(result.journal_ref, "Phys.Rev.D76:013009,2007")
+        self.assertEqual(result.pdf_url, "http://arxiv.org/pdf/0704.0001v2")
+        self.assertIsNone(self.parse(ARXIV_RAW_RECORD).resumption_token)
+
+    def test_deleted_record(self):
+        (result,) = self.parse(arxiv_record("2401.00009", "2024-02-05", deleted=True)).results
+        self.assertTrue(result.deleted)
+        self.assertEqual(result.get_short_id(), "2401.00009")
+
+    def test_query_args(self):
+        query = aioarxiv.OAIQuery(
+            "arXivRaw", set_spec="cs", from_date=date(2024, 1, 2), until="2024-01-31"
+        )
+        self.assertEqual(
+            query._url_args(),
+            {
+                "verb": "ListRecords",
+                "metadataPrefix": "arXivRaw",
+                "set": "cs",
+                "from": "2024-01-02",
+                "until": "2024-01-31",
+            },
+        )
+        with self.assertRaises(ValueError):
+            aioarxiv.OAIQuery("oai_dc")
+
+
+class TestOAIHarvest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.repository = OAIServer(records(8))
+        await self.repository.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.repository.server.close()
+
+    def client(self, **kwargs) -> aioarxiv.Client:
+        client = aioarxiv.Client(delay_seconds=0, **kwargs)
+        client.oai_url = self.repository.url
+        return client
+
+    async def test_follows_resumption_tokens(self):
+        async with self.client() as client:
+            results = [r async for r in client.oai_records(aioarxiv.OAIQuery(set_spec="cs"))]
+        self.assertEqual([r.get_short_id() for r in results], [r[0] for r in records(8)])
+        self.assertEqual(len(self.repository.requests), 3)
+        self.assertEqual(
+            self.repository.requests[0],
+            {"verb": "ListRecords", "metadataPrefix": "arXiv", "set": "cs"},
+        )
+        self.assertEqual(
+            self.repository.requests[1], {"verb": "ListRecords", "resumptionToken": "tok-3"}
+        )
+
+    async def test_selective_harvest(self):
+        query = aioarxiv.OAIQuery(from_date=date(2024, 2, 3), until=date(2024, 2, 6))
+        async with self.client() as client:
+            results = [r async for r in client.oai_records(query)]
+            empty = [r async for r in client.oai_records(aioarxiv.OAIQuery(from_date="2030-01-01"))]
+        self.assertEqual([r.datestamp.day for r in results], [3, 4, 5, 6])
+        self.assertEqual(self.repository.requests[0]["from"], "2024-02-03")
+        self.assertEqual(empty, [])
+
+    async def test_max_results_and_deleted(self):
+        self.repository.records[1] = (self.repository.records[1][0], "2024-02-02", True)
+        async with self.client() as client:
+            query = aioarxiv.OAIQuery(max_results=4)
+            kept = [r.get_short_id() async for r in client.oai_records(query)]
+            everything = [
+                r async for r in client.oai_records(aioarxiv.OAIQuery(), include_deleted=True)
+            ]
+        self.assertEqual(kept, ["2401.00000", "2401.00002", "2401.00003", "2401.00004"])
+        self.assertEqual([r.deleted for r in everything].count(True), 1)
+
+    async def test_resumes_from_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = aioarxiv.JSONCheckpointStore(os.path.join(tmp, "checkpoints.json"))
+            query = aioarxiv.OAIQuery(set_spec="cs")
+            async with self.client() as client:
+                harvest = client.oai_records(query, store, key="cs")
+                first = [await harvest.__anext__() for _ in range(4)]
+                await harvest.aclose()
+
+                checkpoint = store.load("cs")
+                self.assertEqual((checkpoint.resumption_token, checkpoint.yielded), ("tok-3", 4))
+                self.assertEqual(checkpoint.last_ids, ["2401.00003"])
+
+                requests = len(self.repository.requests)
+                rest = [r async for r in client.oai_records(query, store, key="cs")]
+                # The resumed run starts from the saved token.
+                self.assertEqual(self.repository.requests[requests]["resumptionToken"], "tok-3")
+                self.assertTrue(store.load("cs").done)
+                self.assertEqual([r async for r in client.oai_records(query, store, key="cs")], [])
+
+        self.assertEqual([r.get_short_id() for r in first + rest], [r[0] for r in records(8)])
+
+    async def test_retries_flow_control(self):
+        self.repository.unavailable = 2
+        policy = aioarxiv.RetryPolicy(max_retries=2, backoff_base=0.01, jitter=0)
+        async with self.client(retry_policy=policy) as client:
+            results = [r async for r in client.oai_records(aioarxiv.OAIQuery())]
+        self.assertEqual(len(results), 8)
+        self.assertEqual(client.stats.retries, 2)
+
+    async def test_repository_errors(self):
+        store = aioarxiv.SQLiteCheckpointStore(":memory:")
+        fingerprint = query_fingerprint(aioarxiv.OAIQuery())
+        store.save("expired", aioarxiv.Checkpoint(fingerprint, resumption_token="expired"))
+        async with self.client() as client:
+            with self.assertRaises(aioarxiv.OAIError) as ctx:
+                [r async for r in client.oai_records(aioarxiv.OAIQuery(), store, key="expired")]
+        self.assertEqual(ctx.exception.code, "badResumptionToken")
+        self.assertIn("Token expired", str(ctx.exception))
+        self.assertEqual(len(self.repository.requests), 1)
@@ -0,0 +1,212 @@
+import asyncio
+import os
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+
+import aioarxiv
+from aioarxiv.parsers import ArxivParser, FeedparserParser, ParsedFeed
+
+MOCK_FEEDS = [
+    "search_mock_feed.xml",
+    "rss_mock_feed.xml",
+    "atom_rss_mock_feed.xml",
+    "empty_rss_mock_feed.xml",
+    "error_rss_mock_feed.xml",
+]
+
+
+def load_mock_feed(filename: str) -> bytes:
+    """
+    Load mock feed content from a file in the mock_feeds directory.
+    """
+    with open(os.path.join("./tests/mock_feeds/", filename), "rb") as f:
+        return f.read()
+
+
+def result_fields(result: aioarxiv.BaseResult) -> dict:
+    """
+    A comparable summary of every public field of a result.
+    """
+    fields = {k: v for k, v in vars(result).items() if k != "_raw"}
+    fields["authors"] = [vars(a) for a in result.authors]
+    fields["links"] = [vars(link) for link in result.links]
+    return fields
+
+
+def session_with_body(body: bytes) -> AsyncMock:
+    """
+    Create a mock ClientSession whose responses all have the given body.
+    """
+    response = AsyncMock(spec=aiohttp.ClientResponse)
+    response.status = 200
+    response.headers = {}
+    response.content = AsyncMock()
+    response.content.read = AsyncMock(return_value=body)
+
+    session = AsyncMock(spec=aiohttp.ClientSession)
+    session.get.return_value.__aenter__.return_value = response
+    return session
+
+
+class RecordingParser(ArxivParser):
+    """
+    An `ArxivParser` recording the thread each parse runs in.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def parse(self, content: bytes) -> ParsedFeed:
+        self.threads.append(threading.current_thread())
+        return super().parse(content)
+
+
+class TestParserParity(unittest.TestCase):
+    def test_mock_feeds(self):
+        for filename in MOCK_FEEDS:
+            with self.subTest(feed=filename):
+                content = load_mock_feed(filename)
+                fast = ArxivParser().parse(content)
+                expected = FeedparserParser().parse(content)
+
+                self.assertIsNone(fast._raw)
+                self.assertEqual(fast.num_entries, expected.num_entries)
+                self.assertEqual(fast.total_results, expected.total_results)
+                self.assertEqual(len(fast.results), len(expected.results))
+                for result, expected_result in zip(fast.results, expected.results):
+                    self.assertIs(type(result), type(expected_result))
+                    fields = result_fields(result)
+                    expected_fields = result_fields(expected_result)
+                    if "<" in result.summary or "&" in result.summary:
+                        # feedparser sanitizes RSS abstracts as HTML, which
+                        # mangles math like `$1<p<2$`; see `test_rss_summary_not_sanitized`.
+                        del fields["summary"], expected_fields["summary"]
+                    self.assertEqual(fields, expected_fields)
+
+    def test_search_fields(self):
+        result = ArxivParser().parse(load_mock_feed("search_mock_feed.xml")).results[0]
+        self.assertEqual(result.entry_id, "http://arxiv.org/abs/cond-mat/0102536v1")
+        self.assertEqual(result.get_short_id(), "cond-mat/0102536v1")
+        self.assertEqual(result.updated.isoformat(), "2001-02-28T20:12:09+00:00")
+        self.assertEqual(result.primary_category, "cond-mat.str-el")
+        self.assertEqual(result.doi, "10.1063/1.1383585")
+        self.assertEqual(result.journal_ref, "J. Chem. Phys. 115, 1626 (2001)")
+        self.assertEqual(result.pdf_url, "http://arxiv.org/pdf/cond-mat/0102536v1")
+        self.assertEqual(
+            [a.name for a in result.authors], ["David Prendergast", "M. Nolan", "Claudia Filippi"]
+        )
+
+    def test_atom_rss_fields(self):
+        results = ArxivParser().parse(load_mock_feed("atom_rss_mock_feed.xml")).results
+        self.assertTrue(all(isinstance(r, aioarxiv.RSSResult) for r in results))
+        result = results[0]
+        self.assertEqual(result.entry_id, "https://arxiv.org/abs/2406.10238v1")
+        self.assertEqual(result.get_short_id(), "2406.10238v1")
+        self.assertEqual(result.announce_type, aioarxiv.AnnounceType.New)
+        self.assertEqual(result.feed_date.isoformat(), "2024-06-17T04:00:00+00:00")
+        self.assertEqual(result.categories, ["cs.LG", "math.OC"])
+        self.assertIn("0<\\beta<1", result.summary)
+        self.assertEqual(results[2].doi, "10.5555/jmlr.2024.01234")
+
+    def test_rss_summary_not_sanitized(self):
+        content = load_mock_feed("rss_mock_feed.xml")
+        results = {r.get_short_id(): r for r in ArxivParser().parse(content).results}
+        self.assertIn("0<x<0.125", results["2406.13637v2"].summary)
+
+    def test_malformed_falls_back_to_feedparser(self):
+        content = load_mock_feed("search_mock_feed.xml").replace(b"</feed>", b"")
+        with self.assertLogs("aioarxiv.parsers", level="WARNING") as logs:
+            parsed = ArxivParser().parse(content)
+        self.assertIsNotNone(parsed.raw)
+        self.assertTrue(parsed.raw.bozo)
+        self.assertEqual(parsed.num_entries, 3)
+        self.assertIn("Bozo feed", logs.output[0])
+
+    def test_skips_partial_entries(self):
+        content = load_mock_feed("search_mock_feed.xml").replace(
+            b"<id>http://arxiv.org/abs/2411.17700v2</id>", b""
+        )
+        with self.assertLogs("aioarxiv.parsers", level="WARNING"):
+            parsed = ArxivParser().parse(content)
+        self.assertEqual(parsed.num_entries, 3)
+        self.assertEqual(len(parsed.results), 2)
+
+
+class TestAtomRSSQuery(unittest.IsolatedAsyncioTestCase):
+    async def test_results_are_rss_results(self):
+        session = session_with_body(load_mock_feed("atom_rss_mock_feed.xml"))
+        query = aioarxiv.RSSQuery("cs.LG", feed="ATOM", id_list=["2406.10238"])
+        async with aioarxiv.Client() as client:
+            with patch.object(client, "_session", session):
+                results = [r async for r in client.results(query)]
+        self.assertEqual([r.get_short_id() for r in results], ["2406.10238v1"])
+        self.assertEqual(results[0].announce_type, aioarxiv.AnnounceType.New)
+
+
+class TestParseExecutor(unittest.IsolatedAsyncioTestCase):
+    async def test_inline_by_default(self):
+        parser = RecordingParser()
+        session = session_with_body(load_mock_feed("search_mock_feed.xml"))
+        async with aioarxiv.Client(parser=parser) as client:
+            with patch.object(client, "_session", session):
+                results = [r async for r in client.results(aioarxiv.SearchQuery(max_results=3))]
+        self.assertEqual(len(results), 3)
+        self.assertEqual(parser.threads, [threading.current_thread()])
+
+    async def test_thread_pool(self):
+        parser = RecordingParser()
+        session = session_with_body(load_mock_feed("search_mock_feed.xml"))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            async with aioarxiv.Client(parser=parser, parse_executor=executor) as client:
+                with patch.object(client, "_session", session):
+                    query = aioarxiv.SearchQuery(max_results=3)
+                    results = [r async for r in client.results(query)]
+        self.assertEqual(len(results), 3)
+        self.assertNotEqual(parser.threads, [threading.current_thread()])
+
+    async def test_process_pool(self):
+        content = load_mock_feed("rss_mock_feed.xml")
+        session = session_with_body(content)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            async with aioarxiv.Client(parse_executor=executor) as client:
+                with patch.object(client, "_session", session):
+                    feed = await client._parse_feed("https://rss.arxiv.org/rss/cs")
+
+        expected = ArxivParser().parse(content)
+        self.assertEqual(feed.num_entries, expected.num_entries)
+        self.assertEqual(
+            [result_fields(r) for r in feed.results], [result_fields(r) for r in expected.results]
+        )
+        # The body isn't sent back from the worker, but is restored for `raw`.
+        self.assertIs(feed.content, content)
+        self.assertEqual(len(feed.entries), expected.num_entries)
+
+    async def test_parses_after_rate_limiter_released(self):
+        held = []
+
+        class Limiter(aioarxiv.BaseRateLimiter):
+            @asynccontextmanager
+            async def acquire(self):
+                held.append(True)
+                yield
+                held.append(False)
+
+        class Parser(ArxivParser):
+            def parse(self, content: bytes) -> ParsedFeed:
+                held_while_parsing.append(held[-1])
+                return super().parse(content)
+
+        held_while_parsing = []
+        session = session_with_body(load_mock_feed("search_mock_feed.xml"))
+        async with aioarxiv.Client(rate_limiter=Limiter(), parser=Parser()) as client:
+            with patch.object(client, "_session", session):
+                await asyncio.wait_for(
+                    client._parse_feed("https://export.arxiv.org/api/query?id_list=1"), 5
+                )
+        self.assertEqual(held_while_parsing, [False])
@@ -0,0 +1,119 @@
+import re
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import List
+from unittest.mock import patch
+
+import aioarxiv
+from aioarxiv.planner import date_window_query
+from tests.test_lookup import atom_feed
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class CorpusSession:
+    """
+    A stand-in for `aiohttp.ClientSession` answering `submittedDate`-windowed
+    queries from a synthetic corpus submitted every `spacing`, starting at
+    `START`.
+    """
+
+    def __init__(self, size: int, spacing: timedelta):
+        self.dates = [START + i * spacing for i in range(size)]
+        self.requests: List[str] = []
+
+    def matching(self, search_query: str) -> List[int]:
+        match = re.search(r"submittedDate:\[(\d{12}) TO (\d{12})\]", search_query)
+        low, high = (
+            datetime.strptime(group, "%Y%m%d%H%M").replace(tzinfo=timezone.utc)
+            for group in match.groups()
+        )
+        return [i for i, date in enumerate(self.dates) if low <= date < high + timedelta(minutes=1)]
+
+    def get(self, url, **kwargs):
+        self.requests.append(str(url))
+        matching = self.matching(url.query["search_query"])
+        start, count = int(url.query["start"]), int(url.query["max_results"])
+        page = matching[start : start + count]
+        body = atom_feed(["2401.{:05d}v1".format(i) for i in page]).replace(
+            "<opensearch:totalResults>{}<".format(len(page)).encode(),
+            "<opensearch:totalResults>{}<".format(len(matching)).encode(),
+        )
+
+        class _Response:
+            status = 200
+            headers = {}
+
+            class content:
+                @staticmethod
+                async def read():
+                    return body
+
+        class _Request:
+            async def __aenter__(self):
+                return _Response()
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Request()
+
+    async def close(self):
+        pass
+
+
+class TestQueryPlanner(unittest.IsolatedAsyncioTestCase):
+    def test_date_window_query(self):
+        end = START + timedelta(days=1, minutes=5)
+        self.assertEqual(
+            date_window_query("cat:cs.LG", START, end),
+            "(cat:cs.LG) AND submittedDate:[202401010000 TO 202401020005]",
+        )
+
+    async def test_shards_under_target_size(self):
+        session = CorpusSession(size=100, spacing=timedelta(hours=1))
+        end = START + timedelta(days=10)
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                planner = aioarxiv.QueryPlanner(client, max_shard_size=15)
+                shards = await planner.plan(aioarxiv.SearchQuery(query="cat:cs.LG"), START, end)
+
+        self.assertTrue(all(shard.count <= 15 for shard in shards))
+        self.assertEqual(sum(shard.count for shard in shards), 100)
+        # Windows are chronological and don't overlap.
+        for before, after in zip(shards, shards[1:]):
+            self.assertLess(before.end, after.start)
+        # One probe for the whole range, then one per split.
+        self.assertEqual(len(session.requests), 1 + (len(shards) - 1))
+
+    async def test_results_merged_and_deduplicated(self):
+        session = CorpusSession(size=60, spacing=timedelta(minutes=30))
+        async with aioarxiv.Client(delay_seconds=0, page_size=7) as client:
+            with patch.object(client, "_session", session):
+                planner = aioarxiv.QueryPlanner(client, max_shard_size=20)
+                query = aioarxiv.SearchQuery(query="all:test")
+                results = [
+                    r.get_short_id()
+                    async for r in planner.results(query, START, START + timedelta(days=2))
+                ]
+        self.assertEqual(results, ["2401.{:05d}v1".format(i) for i in range(60)])
+        # No shard was paginated past its own size.
+        self.assertTrue(
+            all(int(re.search(r"start=(\d+)", u).group(1)) < 20 for u in session.requests)
+        )
+
+    async def test_max_results(self):
+        session = CorpusSession(size=30, spacing=timedelta(hours=1))
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                planner = aioarxiv.QueryPlanner(client, max_shard_size=10)
+                query = aioarxiv.SearchQuery(query="all:test", max_results=12)
+                results = [
+                    r async for r in planner.results(query, START, START + timedelta(days=2))
+                ]
+        self.assertEqual(len(results), 12)
+
+    async def test_requires_query(self):
+        planner = aioarxiv.QueryPlanner(aioarxiv.Client())
+        with self.assertRaises(ValueError):
+            await planner.plan(aioarxiv.SearchQuery(id_list=["2401.00001"]))
@@ -0,0 +1,242 @@
+import unittest
+from datetime import datetime, timezone
+
+import aioarxiv
+from aioarxiv.cache import canonical_url
+from aioarxiv.query import And, AndNot, DateRange, Or, Term
+
+
+def paper(short_id: str, **fields):
+    fields.setdefault("published", datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc))
+    fields.setdefault("updated", fields["published"])
+    fields["authors"] = [aioarxiv.SearchResult.Author(a) for a in fields.get("authors", [])]
+    return aioarxiv.SearchResult(entry_id="http://arxiv.org/abs/" + short_id, **fields)
+
+
+PAPERS = [
+    paper(
+        "2401.00001v1",
+        title="Checkerboard order in a Kagome antiferromagnet",
+        authors=["Adrian Del Maestro", "Jane Doe"],
+        summary="We find a quantum spin liquid.",
+        categories=["cond-mat.str-el"],
+        comment="12 pages",
+    ),
+    paper(
+        "2401.00002v2",
+        title="Schrödinger bridges for generative modelling",
+        authors=["John Smith"],
+        summary="Diffusion models as bridges.",
+        categories=["cs.LG", "stat.ML"],
+        journal_ref="NeurIPS 2023",
+        published=datetime(2023, 6, 1, tzinfo=timezone.utc),
+    ),
+    paper(
+        "2401.00003v1",
+        title="Electron transport in graphene",
+        authors=["Jane Doe"],
+        summary="Spin transport and electrons.",
+        categories=["cond-mat.mes-hall", "cs.ET"],
+    ),
+]
+
+
+class TestParseQuery(unittest.TestCase):
+    def test_tree(self):
+        node = aioarxiv.parse_query(
+            'au:del_maestro AND (ti:checkerboard OR abs:"spin liquid") ANDNOT cat:cs.LG'
+        )
+        self.assertIsInstance(node, AndNot)
+        self.assertEqual(node.exclude, Term("cat", "cs.LG"))
+        self.assertIsInstance(node.include, And)
+        self.assertIn(Term("au", "del_maestro"), node.include.operands)
+        self.assertIn(
+            Or([Term("abs", "spin liquid", phrase=True), Term("ti", "checkerboard")]),
+            node.include.operands,
+        )
+
+    def test_dates(self):
+        node = aioarxiv.parse_query("submittedDate:[202401010000 TO 202401312359]")
+        self.assertEqual(
+            node,
+            DateRange(
+                "submittedDate",
+                datetime(2024, 1, 1, tzinfo=timezone.utc),
+                datetime(2024, 1, 31, 23, 59, tzinfo=timezone.utc),
+            ),
+        )
+
+    def test_precedence(self):
+        # AND binds tighter than OR; adjacent terms are ANDed.
+        self.assertEqual(
+            aioarxiv.parse_query("a OR b c"),
+            aioarxiv.parse_query("a OR (b AND c)"),
+        )
+
+    def test_canonical(self):
+        equivalent = [
+            "au:del_maestro AND ti:checkerboard",
+            "ti:checkerboard AND  au:del_maestro",
+            "((au:del_maestro) AND (ti:checkerboard))",
+        ]
+        self.assertEqual(
+            {aioarxiv.canonical_query(q) for q in equivalent},
+            {"au:del_maestro AND ti:checkerboard"},
+        )
+        self.assertEqual(
+            aioarxiv.canonical_query('ti:( "spin   liquid" OR b) ANDNOT a'),
+            'ti:("spin liquid" OR b) ANDNOT a',
+        )
+        self.assertEqual(aioarxiv.canonical_query("  "), "")
+        # Canonical queries parse back to themselves.
+        canonical = aioarxiv.canonical_query('cat:cs.LG OR (ti:"a b" ANDNOT (c OR d)) OR "AND"')
+        self.assertEqual(aioarxiv.canonical_query(canonical), canonical)
+
+    def test_canonical_keeps_meaning(self):
+        # arXiv doesn't document implicit operators or precedence, so queries
+        # which only `parse_query` considers equivalent keep distinct forms.
+        for first, second in [
+            ("ti:quantum computing", "ti:quantum AND computing"),
+            ("a OR b AND c", "a OR (b AND c)"),
+            ("a OR b AND c", "(a OR b) AND c"),
+            ("a ANDNOT b", "b ANDNOT a"),
+            ("a b OR c", "c OR a b"),
+            ("ti:Checkerboard", "ti:checkerboard"),
+            ("ti:(a OR b)", "ti:a OR ti:b"),
+        ]:
+            with self.subTest(first=first, second=second):
+                self.assertNotEqual(
+                    aioarxiv.canonical_query(first), aioarxiv.canonical_query(second)
+                )
+                self.assertNotEqual(
+                    canonical_url(
+                        aioarxiv.Client()._format_url(aioarxiv.SearchQuery(first), 0, 10)
+                    ),
+                    canonical_url(
+                        aioarxiv.Client()._format_url(aioarxiv.SearchQuery(second), 0, 10)
+                    ),
+                )
+
+    def test_syntax_errors(self):
+        for query, position in [
+            ("ti:", 3),
+            ("foo:bar", 0),
+            ("(a OR b", 7),
+            ("a)", 1),
+            ("a AND", 5),
+            ('ti:"open', 3),
+            ("submittedDate:[2024 TO 2025]", 14),
+            ("submittedDate:[202413010000 TO 202501010000]", 14),
+        ]:
+            with self.subTest(query=query):
+                with self.assertRaises(aioarxiv.QuerySyntaxError) as context:
+                    aioarxiv.parse_query(query)
+                self.assertEqual(context.exception.position, position)
+
+    def test_cache_keys(self):
+        client = aioarxiv.Client()
+        first = client._format_url(aioarxiv.SearchQuery("ti:b AND au:a"), 0, 10)
+        second = client._format_url(aioarxiv.SearchQuery("(au:a  AND ti:b)"), 0, 10)
+        self.assertEqual(canonical_url(first), canonical_url(second))
+        # Unparseable queries are left alone.
+        unparseable = client._format_url(aioarxiv.SearchQuery("(a"), 0, 10)
+        self.assertIn("search_query=(a", canonical_url(unparseable))
+
+
+class TestMatches(unittest.TestCase):
+    def matching(self, query: str):
+        node = aioarxiv.parse_query(query)
+        return [r.get_short_id() for r in PAPERS if node.matches(r)]
+
+    def test_fields(self):
+        cases = {
+            "au:del_maestro": ["2401.00001v1"],
+            'au:"jane doe"': ["2401.00001v1", "2401.00003v1"],
+            "ti:schrodinger": ["2401.00002v2"],
+            "abs:electr*": ["2401.00003v1"],
+            'abs:"spin liquid"': ["2401.00001v1"],
+            'abs:"liquid spin"': [],
+            "co:pages": ["2401.00001v1"],
+            "jr:neurips": ["2401.00002v2"],
+            "cat:cs.lg": ["2401.00002v2"],
+            "cat:cs.*": ["2401.00002v2", "2401.00003v1"],
+            "cat:cond-mat": [],
+            "id:2401.00002": ["2401.00002v2"],
+            "id:2401.00002v1": [],
+            "rn:CERN-TH-2024": [],
+            "spin": ["2401.00001v1", "2401.00003v1"],
+            "all:graphene": ["2401.00003v1"],
+        }
+        for query, expected in cases.items():
+            with self.subTest(query=query):
+                self.assertEqual(self.matching(query), expected)
+
+    def test_operators(self):
+        self.assertEqual(self.matching("au:doe ANDNOT ti:graphene"), ["2401.00001v1"])
+        self.assertEqual(
+            self.matching("ti:checkerboard OR jr:neurips"), ["2401.00001v1", "2401.00002v2"]
+        )
+        self.assertEqual(self.matching("spin AND cat:cs.*"), ["2401.00003v1"])
+
+    def test_dates(self):
+        self.assertEqual(
+            self.matching("submittedDate:[202401151200 TO 202401151200]"),
+            ["2401.00001v1", "2401.00003v1"],
+        )
+        self.assertEqual(
+            self.matching("lastUpdatedDate:[202301010000 TO 202312312359]"), ["2401.00002v2"]
+        )
+
+
+class TestLocalIndexResults(unittest.TestCase):
+    def setUp(self):
+        self.index = aioarxiv.LocalIndex(":memory:")
+        self.index.add_many(PAPERS)
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_agrees_with_matches(self):
+        for query in [
+            "au:del_maestro",
+            'au:"jane doe" ANDNOT ti:graphene',
+            "ti:schrodinger",
+            "abs:electr*",
+            'abs:"liquid spin"',
+            "co:pages OR jr:neurips",
+            "cat:cs.LG",
+            "cat:cs.*",
+            "cat:cond-mat",
+            "id:2401.00002 OR id:2401.00003v1",
+            "spin AND cat:cs.*",
+            "pages",
+            "rn:CERN-TH-2024",
+            "submittedDate:[202401151200 TO 202401151200]",
+            "lastUpdatedDate:[202301010000 TO 202312312359] OR au:doe",
+        ]:
+            with self.subTest(query=query):
+                node = aioarxiv.parse_query(query)
+                expected = sorted(r.get_short_id() for r in PAPERS if node.matches(r))
+                found = sorted(r.get_short_id() for r in self.index.results(query))
+                self.assertEqual(found, expected)
+
+    def test_search_query(self):
+        query = aioarxiv.SearchQuery(
+            "au:doe OR jr:neurips",
+            id_list=["2401.00002", "2401.00003v1"],
+            sort_by=aioarxiv.SortCriterion.SubmittedDate,
+            sort_order=aioarxiv.SortOrder.Ascending,
+        )
+        self.assertEqual(
+            [r.get_short_id() for r in self.index.results(query)],
+            ["2401.00002v2", "2401.00003v1"],
+        )
+        self.assertEqual(len(self.index.results(query, limit=1)), 1)
+        query.max_results = 1
+        self.assertEqual(
+            [r.get_short_id() for r in self.index.results(query, offset=1)], ["2401.00003v1"]
+        )
+
+    def test_syntax_error(self):
+        with self.assertRaises(aioarxiv.QuerySyntaxError):
+            self.index.results("ti:(a")
@@ -0,0 +1,340 @@
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from typing import List
+from unittest.mock import patch
+
+import aioarxiv
+from aioarxiv.rate_limiter import (
+    AsyncRateLimiter,
+    RateLimiterRegistry,
+    SharedRateLimiter,
+    TokenBucketRateLimiter,
+    fcntl,
+)
+
+# Tests patch `asyncio.sleep`; keep a handle on the real one to yield control.
+_yield = asyncio.sleep
+
+
+class FakeClock:
+    """
+    An injectable clock that only moves when a test advances it.
+
+    `sleep` records each requested wake-up time instead of blocking, so
+    limiter tests run without real sleeps.
+    """
+
+    def __init__(self, now: float = 100.0):
+        self.now = now
+        self.wakeups: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.wakeups.append(self.now + seconds)
+
+
+class TestAsyncRateLimiter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("asyncio.sleep", side_effect=self.clock.sleep)
+        self.mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_first_acquire_does_not_sleep(self):
+        limiter = AsyncRateLimiter(period=3.0, clock=self.clock)
+        async with limiter.acquire():
+            pass
+        self.mock_sleep.assert_not_called()
+
+    async def test_slots_spaced_by_period(self):
+        limiter = AsyncRateLimiter(period=3.0, clock=self.clock)
+
+        async def request():
+            async with limiter.acquire():
+                pass
+
+        await asyncio.gather(*[request() for _ in range(5)])
+        # The first request starts immediately; the rest are spaced 3s apart.
+        self.assertEqual(self.clock.wakeups, [103.0, 106.0, 109.0, 112.0])
+
+    async def test_calls_per_period(self):
+        limiter = AsyncRateLimiter(calls=2, period=3.0, clock=self.clock)
+        for _ in range(3):
+            async with limiter.acquire():
+                pass
+        self.assertEqual(self.clock.wakeups, [101.5, 103.0])
+
+    async def test_elapsed_period_does_not_sleep(self):
+        limiter = AsyncRateLimiter(period=3.0, clock=self.clock)
+        async with limiter.acquire():
+            pass
+        self.clock.now += 3.0
+        async with limiter.acquire():
+            pass
+        self.mock_sleep.assert_not_called()
+
+    async def test_partially_elapsed_period(self):
+        limiter = AsyncRateLimiter(period=3.0, clock=self.clock)
+        async with limiter.acquire():
+            pass
+        self.clock.now += 1.0
+        async with limiter.acquire():
+            pass
+        self.mock_sleep.assert_called_once_with(2.0)
+
+    async def test_requests_overlap_in_flight(self):
+        limiter = AsyncRateLimiter(period=3.0, clock=self.clock)
+        in_flight = 0
+        max_in_flight = 0
+        finish = asyncio.Event()
+
+        async def slow_request():
+            nonlocal in_flight, max_in_flight
+            async with limiter.acquire():
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                # A slow response doesn't hold up the next request's start.
+                await finish.wait()
+                in_flight -= 1
+
+        tasks = [asyncio.ensure_future(slow_request()) for _ in range(3)]
+        for _ in range(5):
+            await _yield(0)
+        self.assertEqual(max_in_flight, 3)
+        finish.set()
+        await asyncio.gather(*tasks)
+
+    async def test_cancelled_waiter_returns_slot(self):
+        limiter = AsyncRateLimiter(period=3.0, clock=self.clock)
+        async with limiter.acquire():
+            pass
+
+        blocked = asyncio.Event()
+
+        async def never_wake(seconds: float):
+            await blocked.wait()
+
+        self.mock_sleep.side_effect = never_wake
+        waiter = asyncio.ensure_future(limiter.acquire().__aenter__())
+        await _yield(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        # The next caller gets the slot the cancelled waiter gave up.
+        self.mock_sleep.side_effect = self.clock.sleep
+        async with limiter.acquire():
+            pass
+        self.assertEqual(self.clock.wakeups, [103.0])
+
+
+class TestTokenBucketRateLimiter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("asyncio.sleep", side_effect=self.clock.sleep)
+        self.mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_burst_then_rate(self):
+        limiter = TokenBucketRateLimiter(rate=2.0, burst=3, clock=self.clock)
+
+        async def request():
+            async with limiter.acquire():
+                pass
+
+        await asyncio.gather(*[request() for _ in range(6)])
+        # Three requests fit the burst; the rest wait for tokens at 2/s.
+        self.assertEqual(self.clock.wakeups, [100.5, 101.0, 101.5])
+
+    async def test_refill_is_capped_at_burst(self):
+        limiter = TokenBucketRateLimiter(rate=1.0, burst=2, clock=self.clock)
+        self.clock.now += 60.0
+        for _ in range(3):
+            async with limiter.acquire():
+                pass
+        self.assertEqual(self.clock.wakeups, [161.0])
+
+    async def test_max_queue(self):
+        limiter = TokenBucketRateLimiter(rate=1.0, burst=1, max_queue=1, clock=self.clock)
+        blocked = asyncio.Event()
+
+        async def never_wake(seconds: float):
+            await blocked.wait()
+
+        self.mock_sleep.side_effect = never_wake
+        async with limiter.acquire():
+            pass
+        waiter = asyncio.ensure_future(limiter.acquire().__aenter__())
+        await _yield(0)
+        self.assertEqual(limiter.queue_depth, 1)
+
+        with self.assertRaises(TokenBucketRateLimiter.QueueFullError):
+            async with limiter.acquire():
+                pass
+
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual(limiter.queue_depth, 0)
+
+    async def test_cancelled_waiter_returns_token(self):
+        limiter = TokenBucketRateLimiter(rate=1.0, burst=1, clock=self.clock)
+        blocked = asyncio.Event()
+
+        async def never_wake(seconds: float):
+            self.clock.wakeups.append(self.clock.now + seconds)
+            await blocked.wait()
+
+        self.mock_sleep.side_effect = never_wake
+        async with limiter.acquire():
+            pass
+        first = asyncio.ensure_future(limiter.acquire().__aenter__())
+        second = asyncio.ensure_future(limiter.acquire().__aenter__())
+        await _yield(0)
+        self.assertEqual(self.clock.wakeups, [101.0, 102.0])
+
+        # An earlier waiter's token is already counted by the later waiter.
+        first.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+        third = asyncio.ensure_future(limiter.acquire().__aenter__())
+        await _yield(0)
+        self.assertEqual(self.clock.wakeups, [101.0, 102.0, 103.0])
+
+        # The latest waiter's token goes back to the bucket.
+        third.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await third
+        fourth = asyncio.ensure_future(limiter.acquire().__aenter__())
+        await _yield(0)
+        self.assertEqual(self.clock.wakeups, [101.0, 102.0, 103.0, 103.0])
+
+        for waiter in (second, fourth):
+            waiter.cancel()
+        await asyncio.gather(second, fourth, return_exceptions=True)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            TokenBucketRateLimiter(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucketRateLimiter(rate=1.0, burst=0)
+
+
+class TestRateLimiterRegistry(unittest.TestCase):
+    def test_per_host_limiters(self):
+        api = AsyncRateLimiter()
+        registry = RateLimiterRegistry(AsyncRateLimiter, limiters={"export.arxiv.org": api})
+        self.assertIs(registry.for_url("https://export.arxiv.org/api/query?id_list=1"), api)
+
+        rss = registry.for_url("https://rss.arxiv.org/rss/cs")
+        self.assertIsNot(rss, api)
+        self.assertIs(registry.get("RSS.arxiv.org"), rss)
+        self.assertIn("rss.arxiv.org", registry)
+
+    def test_register(self):
+        registry = RateLimiterRegistry(AsyncRateLimiter)
+        downloads = TokenBucketRateLimiter(rate=1.0, burst=4)
+        registry.register("arxiv.org", downloads)
+        self.assertIs(registry.for_url("https://arxiv.org/pdf/2107.05580v1"), downloads)
+
+
+def _shared_worker(path: str, period: float, requests: int, starts):
+    """Acquires a SharedRateLimiter from a separate process."""
+
+    async def run():
+        limiter = SharedRateLimiter(path, period=period)
+        for _ in range(requests):
+            async with limiter.acquire():
+                starts.put(time.time())
+
+    asyncio.run(run())
+
+
+@unittest.skipIf(fcntl is None, "SharedRateLimiter requires fcntl")
+class TestSharedRateLimiter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.path = os.path.join(self.temp_dir, "limiter")
+        self.clock = FakeClock()
+        patcher = patch("asyncio.sleep", side_effect=self.clock.sleep)
+        self.mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_instances_share_slots(self):
+        # Separate instances stand in for separate processes.
+        limiters = [SharedRateLimiter(self.path, period=3.0, clock=self.clock) for _ in range(3)]
+        for limiter in limiters * 2:
+            async with limiter.acquire():
+                pass
+        self.assertEqual(self.clock.wakeups, [103.0, 106.0, 109.0, 112.0, 115.0])
+
+    async def test_elapsed_period_does_not_sleep(self):
+        first = SharedRateLimiter(self.path, period=3.0, clock=self.clock)
+        second = SharedRateLimiter(self.path, period=3.0, clock=self.clock)
+        async with first.acquire():
+            pass
+        self.clock.now += 3.0
+        async with second.acquire():
+            pass
+        self.mock_sleep.assert_not_called()
+
+    async def test_cancelled_waiter_returns_slot(self):
+        limiter = SharedRateLimiter(self.path, period=3.0, clock=self.clock)
+        async with limiter.acquire():
+            pass
+
+        blocked = asyncio.Event()
+
+        async def never_wake(seconds: float):
+            await blocked.wait()
+
+        self.mock_sleep.side_effect = never_wake
+        waiter = asyncio.ensure_future(limiter.acquire().__aenter__())
+        while not self.mock_sleep.called:
+            await _yield(0.01)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        self.mock_sleep.side_effect = self.clock.sleep
+        async with SharedRateLimiter(self.path, period=3.0, clock=self.clock).acquire():
+            pass
+        self.assertEqual(self.clock.wakeups, [103.0])
+
+    def test_client_accepts_limiter(self):
+        limiter = SharedRateLimiter(self.path)
+        client = aioarxiv.Client(rate_limiter=limiter)
+        self.assertIs(client.rate_limiter, limiter)
+        self.assertIs(client.rate_limiters.for_url(client.query_url_format), limiter)
+
+
+@unittest.skipIf(fcntl is None, "SharedRateLimiter requires fcntl")
+class TestSharedRateLimiterProcesses(unittest.TestCase):
+    def test_processes_share_budget(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, "limiter")
+        period = 0.2
+
+        context = multiprocessing.get_context("spawn")
+        starts = context.Queue()
+        workers = [
+            context.Process(target=_shared_worker, args=(path, period, 2, starts)) for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+            self.assertEqual(worker.exitcode, 0)
+
+        times = sorted(starts.get(timeout=5) for _ in range(6))
+        for earlier, later in zip(times, times[1:]):
+            self.assertGreaterEqual(later - earlier, period - 0.01)
@@ -0,0 +1,138 @@
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+
+import aioarxiv
+from aioarxiv.retry import RetryPolicy, parse_retry_after
+
+
+def session_with_statuses(*statuses: int, retry_after: str = None) -> AsyncMock:
+    """
+    Create a mock ClientSession whose responses have the given statuses, in
+    order, and an empty body.
+    """
+    responses = []
+    for status in statuses:
+        response = AsyncMock(spec=aiohttp.ClientResponse)
+        response.status = status
+        response.headers = {"Retry-After": retry_after} if retry_after else {}
+        response.content = AsyncMock()
+        response.content.read = AsyncMock(return_value=b"")
+        responses.append(response)
+
+    session = AsyncMock(spec=aiohttp.ClientSession)
+    session.get.return_value.__aenter__.side_effect = responses
+    return session
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_exponential_backoff(self):
+        policy = RetryPolicy(max_retries=5, backoff_base=1.0, backoff_max=5.0, jitter=0)
+        error = aioarxiv.HTTPError("url", 0, 500)
+        delays = [policy.delay(error, retry) for retry in range(1, 6)]
+        self.assertEqual(delays, [1.0, 2.0, 4.0, 5.0, 5.0])
+
+    def test_max_retries(self):
+        policy = RetryPolicy(max_retries=2)
+        error = aioarxiv.HTTPError("url", 0, 500)
+        self.assertIsNotNone(policy.delay(error, 2))
+        self.assertIsNone(policy.delay(error, 3))
+
+    def test_jitter(self):
+        error = aioarxiv.HTTPError("url", 0, 500)
+        policy = RetryPolicy(backoff_base=4.0, jitter=0.5, rng=lambda: 1.0)
+        self.assertEqual(policy.delay(error, 1), 2.0)
+        policy = RetryPolicy(backoff_base=4.0, jitter=0.5, rng=lambda: 0.0)
+        self.assertEqual(policy.delay(error, 1), 4.0)
+        with self.assertRaises(ValueError):
+            RetryPolicy(jitter=1.5)
+
+    def test_status_rules(self):
+        policy = RetryPolicy(backoff_base=1.0, jitter=0, status_rules={503: 10.0, 400: None})
+        self.assertEqual(policy.delay(aioarxiv.HTTPError("url", 0, 503), 2), 20.0)
+        self.assertEqual(policy.delay(aioarxiv.HTTPError("url", 0, 500), 2), 2.0)
+        self.assertIsNone(policy.delay(aioarxiv.HTTPError("url", 0, 400), 1))
+        # Other errors use the default backoff.
+        self.assertEqual(policy.delay(aiohttp.ClientError(), 1), 1.0)
+
+    def test_retry_after(self):
+        error = aioarxiv.HTTPError("url", 0, 503, retry_after=30.0)
+        policy = RetryPolicy(backoff_base=1.0, jitter=0)
+        self.assertEqual(policy.delay(error, 1), 30.0)
+        policy = RetryPolicy(backoff_base=1.0, jitter=0, respect_retry_after=False)
+        self.assertEqual(policy.delay(error, 1), 1.0)
+
+    def test_max_retry_time(self):
+        policy = RetryPolicy(backoff_base=4.0, jitter=0, max_retry_time=10.0)
+        error = aioarxiv.HTTPError("url", 0, 500)
+        self.assertEqual(policy.delay(error, 1, elapsed=5.0), 4.0)
+        self.assertIsNone(policy.delay(error, 1, elapsed=7.0))
+
+    def test_parse_retry_after(self):
+        now = datetime(2024, 11, 28, 12, 0, 0, tzinfo=timezone.utc)
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertEqual(parse_retry_after("Thu, 28 Nov 2024 12:00:30 GMT", now=now), 30.0)
+        self.assertEqual(parse_retry_after("Thu, 28 Nov 2024 11:00:00 GMT", now=now), 0.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+class TestClientRetries(unittest.IsolatedAsyncioTestCase):
+    @patch("asyncio.sleep", return_value=None)
+    async def test_retry_after_header(self, mock_sleep):
+        session = session_with_statuses(503, 503, retry_after="42")
+        policy = RetryPolicy(max_retries=1, backoff_base=1.0, jitter=0)
+        async with aioarxiv.Client(delay_seconds=0, retry_policy=policy) as client:
+            with patch.object(client, "_session", session):
+                with self.assertRaises(aioarxiv.HTTPError) as cm:
+                    await client._parse_feed("https://export.arxiv.org/api/query?id_list=1")
+        self.assertEqual(cm.exception.retry_after, 42.0)
+        mock_sleep.assert_called_once_with(42.0)
+
+    @patch("asyncio.sleep", return_value=None)
+    async def test_attempt_stats(self, mock_sleep):
+        session = session_with_statuses(500, 503, 200)
+        policy = RetryPolicy(max_retries=3, backoff_base=1.0, jitter=0)
+        async with aioarxiv.Client(delay_seconds=0, retry_policy=policy) as client:
+            with patch.object(client, "_session", session):
+                await client._parse_feed("https://export.arxiv.org/api/query?id_list=1")
+
+        self.assertEqual(client.stats.requests, 3)
+        self.assertEqual(client.stats.retries, 2)
+        self.assertEqual(client.stats.failures, 0)
+        self.assertEqual(client.stats.backoff_seconds, 3.0)
+        attempts = list(client.stats.attempts)
+        self.assertEqual([a.status for a in attempts], [500, 503, 200])
+        self.assertEqual([a.backoff for a in attempts], [0.0, 1.0, 2.0])
+        self.assertEqual([a.ok for a in attempts], [False, False, True])
+
+    @patch("asyncio.sleep", return_value=None)
+    async def test_error_attempts(self, mock_sleep):
+        session = session_with_statuses(500, 500, 500)
+        async with aioarxiv.Client(num_retries=2) as client:
+            with patch.object(client, "_session", session):
+                with self.assertRaises(aioarxiv.HTTPError) as cm:
+                    await client._parse_feed("https://export.arxiv.org/api/query?id_list=1")
+        self.assertEqual(cm.exception.retry, 2)
+        self.assertEqual([a.try_index for a in cm.exception.attempts], [0, 1, 2])
+        self.assertEqual(client.stats.failures, 1)
+
+    @patch("asyncio.sleep", return_value=None)
+    async def test_no_retry_on_bad_request(self, mock_sleep):
+        session = session_with_statuses(400)
+        async with aioarxiv.Client(num_retries=3) as client:
+            with patch.object(client, "_session", session):
+                with self.assertRaises(aioarxiv.HTTPError) as cm:
+                    await client._parse_feed("https://export.arxiv.org/api/query?id_list=abc")
+        self.assertEqual(cm.exception.retry, 0)
+        self.assertEqual(session.get.call_count, 1)
+
+    def test_num_retries_shorthand(self):
+        client = aioarxiv.Client(num_retries=5)
+        self.assertEqual(client.retry_policy.max_retries, 5)
+        client.num_retries = 1
+        self.assertEqual(client.retry_policy.max_retries, 1)
+        policy = RetryPolicy(max_retries=7)
+        self.assertEqual(aioarxiv.Client(retry_policy=policy).num_retries, 7)
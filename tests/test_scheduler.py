@@ -0,0 +1,143 @@
+import asyncio
+import time
+import unittest
+from typing import List
+from unittest.mock import patch
+
+import aioarxiv
+from aioarxiv import FairScheduler, Priority, request_tag
+from tests.test_client import AtomPageSession
+from tests.test_lookup import IdListSession
+
+INTERVAL = 0.02
+
+
+class TestFairScheduler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.scheduler = FairScheduler(aioarxiv.AsyncRateLimiter(period=INTERVAL))
+        self.started: List[str] = []
+        self.times: List[float] = []
+
+    async def request(self, name: str, **tag):
+        with request_tag(**tag):
+            async with self.scheduler.acquire():
+                self.started.append(name)
+                self.times.append(time.monotonic())
+
+    def spawn(self, name: str, count: int = 1, **tag) -> List[asyncio.Task]:
+        return [asyncio.ensure_future(self.request(name, **tag)) for _ in range(count)]
+
+    async def test_interactive_overtakes_bulk(self):
+        bulk = self.spawn("bulk", 6, priority=Priority.Bulk, stream="backfill")
+        await asyncio.sleep(INTERVAL * 1.5)
+        interactive = self.spawn("interactive", priority=Priority.Interactive, stream="user")
+        await asyncio.gather(*bulk, *interactive)
+
+        # The interactive request takes the next free slot.
+        self.assertLessEqual(self.started.index("interactive"), 3)
+        self.assertEqual(len(self.started), 7)
+        # Global spacing holds throughout.
+        gaps = [b - a for a, b in zip(self.times, self.times[1:])]
+        self.assertGreaterEqual(min(gaps), INTERVAL * 0.5)
+
+    async def test_weighted_fair_queuing_between_streams(self):
+        tasks = self.spawn("a", 12, priority=Priority.Bulk, stream="a", weight=2.0)
+        tasks += self.spawn("b", 12, priority=Priority.Bulk, stream="b", weight=1.0)
+        await asyncio.gather(*tasks)
+        first = self.started[:9]
+        self.assertEqual((first.count("a"), first.count("b")), (6, 3))
+
+    async def test_late_stream_not_starved(self):
+        tasks = self.spawn("a", 10, priority=Priority.Bulk, stream="a")
+        await asyncio.sleep(INTERVAL * 1.5)
+        tasks += self.spawn("b", 2, priority=Priority.Bulk, stream="b")
+        await asyncio.gather(*tasks)
+        self.assertLess(self.started.index("b"), 5)
+        self.assertLessEqual(len(self.started) - 1 - self.started[::-1].index("b"), 6)
+
+    async def test_stats(self):
+        tasks = self.spawn("bulk", 3, priority=Priority.Bulk)
+        tasks += self.spawn("interactive", 2)
+        await asyncio.sleep(0)
+        bulk, interactive = self.scheduler.stats[Priority.Bulk], self.scheduler.stats[0]
+        self.assertEqual((bulk.queue_depth, interactive.queue_depth), (3, 2))
+
+        await asyncio.gather(*tasks)
+        self.assertEqual((bulk.queue_depth, bulk.max_queue_depth, bulk.started), (0, 3, 3))
+        self.assertEqual(interactive.started, 2)
+        self.assertGreater(bulk.mean_wait_seconds, interactive.mean_wait_seconds)
+        self.assertGreaterEqual(bulk.max_wait_seconds, INTERVAL * 3.5)
+
+    async def test_cancelled_request_leaves_queue(self):
+        tasks = self.spawn("bulk", 4, priority=Priority.Bulk)
+        await asyncio.sleep(0)
+        tasks[-1].cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.assertEqual(self.started, ["bulk"] * 3)
+        stats = self.scheduler.stats[Priority.Bulk]
+        self.assertEqual((stats.queue_depth, stats.started), (0, 3))
+        self.assertIsNone(self.scheduler._dispatcher)
+
+    async def test_limiter_errors_reach_a_request(self):
+        limiter = aioarxiv.TokenBucketRateLimiter(rate=1 / INTERVAL, burst=1, max_queue=0)
+        self.scheduler = FairScheduler(limiter)
+        results = await asyncio.gather(*self.spawn("a", 2), return_exceptions=True)
+        self.assertEqual(results[0], None)
+        self.assertIsInstance(results[1], aioarxiv.TokenBucketRateLimiter.QueueFullError)
+
+
+class TestClientScheduling(unittest.IsolatedAsyncioTestCase):
+    async def test_interactive_query_overtakes_prefetch(self):
+        session = AtomPageSession(total=200)
+        scheduler = FairScheduler(aioarxiv.AsyncRateLimiter(period=INTERVAL))
+        async with aioarxiv.Client(
+            page_size=10, prefetch_pages=5, rate_limiter=scheduler
+        ) as client:
+            with patch.object(client, "_session", session):
+                backfill = client.results(aioarxiv.SearchQuery(query="backfill"))
+                await backfill.__anext__()
+                await asyncio.sleep(INTERVAL)
+                interactive = [
+                    r
+                    async for r in client.results(aioarxiv.SearchQuery(query="user", max_results=1))
+                ]
+                await backfill.aclose()
+
+        self.assertEqual(len(interactive), 1)
+        user = next(i for i, url in enumerate(session.requested) if "user" in url)
+        # Requested ahead of most of the queued prefetches.
+        self.assertLessEqual(user, 3)
+        self.assertEqual(scheduler.stats[Priority.Interactive].started, 2)
+        self.assertGreater(scheduler.stats[Priority.Bulk].started, 0)
+
+    async def test_caller_tag_takes_precedence(self):
+        session = AtomPageSession(total=10)
+        scheduler = FairScheduler(aioarxiv.AsyncRateLimiter(period=0))
+        async with aioarxiv.Client(page_size=10, rate_limiter=scheduler) as client:
+            with patch.object(client, "_session", session):
+                with request_tag(priority=Priority.Bulk):
+                    [r async for r in client.results(aioarxiv.SearchQuery(query="backfill"))]
+        self.assertEqual(scheduler.stats[Priority.Bulk].started, 1)
+        self.assertEqual(scheduler.stats[Priority.Interactive].started, 0)
+
+    async def test_interactive_query_overtakes_lookup(self):
+        ids = ["2401.{:05d}".format(i) for i in range(40)]
+        session = IdListSession({arxiv_id: 1 for arxiv_id in ids + ["2402.00001"]})
+        scheduler = FairScheduler(aioarxiv.AsyncRateLimiter(period=INTERVAL))
+        async with aioarxiv.Client(rate_limiter=scheduler) as client:
+            with patch.object(client, "_session", session):
+
+                async def lookup():
+                    return [r async for r in client.get_by_ids(ids, concurrency=8, chunk_size=1)]
+
+                bulk = asyncio.ensure_future(lookup())
+                await asyncio.sleep(INTERVAL * 1.5)
+                query = aioarxiv.SearchQuery(id_list=["2402.00001"])
+                interactive = [r async for r in client.results(query)]
+                self.assertEqual(len(await bulk), 40)
+
+        self.assertEqual(len(interactive), 1)
+        # Requested ahead of most of the lookup's queued chunks.
+        self.assertLessEqual(session.requested.index(["2402.00001"]), 4)
+        self.assertEqual(scheduler.stats[Priority.Interactive].started, 1)
+        self.assertEqual(scheduler.stats[Priority.Bulk].started, 40)
@@ -0,0 +1,156 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import aioarxiv
+
+
+def snapshot_line(i: int, **overrides) -> str:
+    record = {
+        "id": "2401.{:05d}".format(i),
+        "submitter": "Ada Lovelace",
+        "authors": "Ada Lovelace, Charles Babbage and Alan Turing",
+        "title": "Paper\n  {}".format(i),
+        "comments": "10 pages",
+        "journal-ref": None,
+        "doi": "10.1000/{}".format(i),
+        "report-no": None,
+        "categories": "cs.LG stat.ML",
+        "license": None,
+        "abstract": "  Abstract {}.\n".format(i),
+        "versions": [
+            {"version": "v1", "created": "Mon, 2 Apr 2007 19:18:42 GMT"},
+            {"version": "v2", "created": "Tue, 24 Jul 2007 20:10:27 GMT"},
+        ],
+        "update_date": "2008-11-13",
+        "authors_parsed": [["Lovelace", "Ada", ""], ["Babbage", "Charles", "Jr", "Cambridge"]],
+    }
+    record.update(overrides)
+    return json.dumps(record) + "\n"
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "snapshot.json")
+        lines = [snapshot_line(i) for i in range(50)]
+        lines[3] = snapshot_line(3, authors_parsed=None)
+        lines.insert(10, "{not json\n")
+        lines.insert(20, "\n")
+        with open(self.path, "w") as f:
+            f.writelines(lines)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_results(self):
+        results = list(aioarxiv.read_snapshot(self.path))
+        self.assertEqual(len(results), 50)
+        result = results[0]
+        self.assertIsInstance(result, aioarxiv.SearchResult)
+        self.assertEqual(result.get_short_id(), "2401.00000v2")
+        self.assertEqual(result.title, "Paper 0")
+        self.assertEqual(result.summary, "Abstract 0.")
+        self.assertEqual([a.name for a in result.authors], ["Ada Lovelace", "Charles Babbage Jr"])
+        self.assertEqual(result.authors[1].institutions, "Cambridge")
+        self.assertEqual(
+            (result.primary_category, result.categories), ("cs.LG", ["cs.LG", "stat.ML"])
+        )
+        self.assertEqual(result.published, datetime(2007, 4, 2, 19, 18, 42, tzinfo=timezone.utc))
+        self.assertEqual(result.updated, datetime(2007, 7, 24, 20, 10, 27, tzinfo=timezone.utc))
+        self.assertEqual((result.versions, result.datestamp), (["v1", "v2"], date(2008, 11, 13)))
+        self.assertEqual(
+            (result.comment, result.journal_ref, result.doi), ("10 pages", None, "10.1000/0")
+        )
+        self.assertEqual(result.pdf_url, "http://arxiv.org/pdf/2401.00000v2")
+        # Without `authors_parsed`, the author string is split.
+        self.assertEqual(
+            [a.name for a in results[3].authors], ["Ada Lovelace", "Charles Babbage", "Alan Turing"]
+        )
+
+    def test_projection(self):
+        records = list(
+            aioarxiv.read_snapshot(self.path, fields=["title", "categories"], compact=True)
+        )
+        self.assertEqual(
+            records[1],
+            {
+                "entry_id": "http://arxiv.org/abs/2401.00001v2",
+                "title": "Paper 1",
+                "categories": ["cs.LG", "stat.ML"],
+            },
+        )
+        result = next(aioarxiv.read_snapshot(self.path, fields=["doi"]))
+        self.assertEqual((result.doi, result.title, result.authors), ("10.1000/0", "", []))
+        with self.assertRaises(ValueError):
+            next(aioarxiv.read_snapshot(self.path, fields=["abstract"]))
+
+    def test_gzipped(self):
+        gz_path = self.path + ".gz"
+        with open(self.path, "rb") as f, gzip.open(gz_path, "wb") as gz:
+            gz.write(f.read())
+        self.assertEqual(
+            [r.entry_id for r in aioarxiv.read_snapshot(gz_path)],
+            [r.entry_id for r in aioarxiv.read_snapshot(self.path)],
+        )
+
+
+class TestLoadSnapshot(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "snapshot.json")
+        with open(self.path, "w") as f:
+            f.writelines(snapshot_line(i) for i in range(200))
+        self.expected = [r.entry_id for r in aioarxiv.read_snapshot(self.path)]
+
+    async def asyncTearDown(self):
+        self.tmp.cleanup()
+
+    async def test_inline(self):
+        loaded = [r.entry_id async for r in aioarxiv.load_snapshot(self.path, chunk_bytes=4096)]
+        self.assertEqual(loaded, self.expected)
+
+    async def test_parallel_in_order(self):
+        with ProcessPoolExecutor(2) as executor:
+            loaded = [
+                r
+                async for r in aioarxiv.load_snapshot(
+                    self.path, fields=["title"], compact=True, executor=executor, chunk_bytes=4096
+                )
+            ]
+        self.assertEqual([r["entry_id"] for r in loaded], self.expected)
+        self.assertEqual(loaded[7]["title"], "Paper 7")
+
+    async def test_bounded_read_ahead(self):
+        files = []
+
+        class CountingFile:
+            def __init__(self, path):
+                self.f = open(path, "rb")
+                self.reads = 0
+                files.append(self)
+
+            def readlines(self, hint):
+                self.reads += 1
+                return self.f.readlines(hint)
+
+            def close(self):
+                self.f.close()
+
+        with patch("aioarxiv.snapshot._open_snapshot", CountingFile):
+            with ThreadPoolExecutor(2) as executor:
+                records = aioarxiv.load_snapshot(
+                    self.path, executor=executor, chunk_bytes=4096, max_pending=3
+                )
+                first = await records.__anext__()
+                await records.aclose()
+
+        self.assertEqual(first.entry_id, self.expected[0])
+        (f,) = files
+        self.assertEqual(f.reads, 3)
+        self.assertTrue(f.f.closed)
@@ -0,0 +1,205 @@
+import asyncio
+import os
+import unittest
+from typing import List, Optional
+from unittest.mock import patch
+
+import aiohttp
+import feedparser
+from yarl import URL
+
+import aioarxiv
+from aioarxiv.parsers import entry_to_result
+from aioarxiv.streaming import AtomStreamParser
+from tests.test_client import atom_page
+
+
+def load_mock_feed(filename: str) -> bytes:
+    """
+    Load mock feed content from a file in the mock_feeds directory.
+    """
+    with open(os.path.join("./tests/mock_feeds/", filename), "rb") as f:
+        return f.read()
+
+
+def result_fields(result: aioarxiv.SearchResult) -> dict:
+    """
+    A comparable summary of every public field of a result.
+    """
+    fields = {k: v for k, v in vars(result).items() if k != "_raw"}
+    fields["authors"] = [vars(a) for a in result.authors]
+    fields["links"] = [vars(link) for link in result.links]
+    return fields
+
+
+class StreamingSession:
+    """
+    A stand-in for `aiohttp.ClientSession` whose responses stream scripted
+    chunks. Each response is a list of byte chunks; an exception in the list is
+    raised when reached, like a dropped connection. When `gate` is set to an
+    event, chunks after the first wait for it.
+    """
+
+    def __init__(self, *responses: List, status: int = 200):
+        self.responses = list(responses)
+        self.status = status
+        self.requested: List[str] = []
+        self.chunks_read = 0
+        self.gate: Optional[asyncio.Event] = None
+
+    def get(self, url, **kwargs):
+        session = self
+        self.requested.append(str(url))
+        chunks = self.responses.pop(0)
+
+        class _Content:
+            async def iter_chunked(self, n):
+                for chunk in chunks:
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    if session.gate is not None and session.chunks_read > 0:
+                        await session.gate.wait()
+                    session.chunks_read += 1
+                    yield chunk
+
+            async def read(self):
+                return b"".join(chunks)
+
+        class _Response:
+            status = session.status
+            headers = {}
+            content = _Content()
+
+        class _Request:
+            async def __aenter__(self):
+                return _Response()
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Request()
+
+    async def close(self):
+        pass
+
+
+def split(data: bytes, size: int) -> List[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestAtomStreamParser(unittest.TestCase):
+    def test_matches_feedparser(self):
+        data = load_mock_feed("search_mock_feed.xml")
+        parser = AtomStreamParser()
+        entries = []
+        for chunk in split(data, 13):
+            entries.extend(parser.feed(chunk))
+        entries.extend(parser.close())
+
+        expected = feedparser.parse(data)
+        self.assertEqual(parser.total_results, 182375)
+        self.assertEqual(parser.num_entries, len(expected.entries))
+        for streamed, parsed in zip(entries, expected.entries):
+            self.assertEqual(
+                result_fields(entry_to_result(streamed)),
+                result_fields(aioarxiv.SearchResult._from_feed_entry(parsed)),
+            )
+
+    def test_entries_complete_before_document(self):
+        data = load_mock_feed("search_mock_feed.xml")
+        parser = AtomStreamParser()
+        first_entry_end = data.index(b"</entry>") + len(b"</entry>")
+        entries = parser.feed(data[:first_entry_end])
+        self.assertEqual(
+            [e.findtext("{http://www.w3.org/2005/Atom}id") for e in entries],
+            ["http://arxiv.org/abs/cond-mat/0102536v1"],
+        )
+        self.assertEqual(len(parser.feed(data[first_entry_end:])), 2)
+
+
+class TestClientStreaming(unittest.IsolatedAsyncioTestCase):
+    async def test_yields_before_body_completes(self):
+        data = atom_page(0, 10, 10)
+        first_entry_end = data.index(b"</entry>") + len(b"</entry>")
+        chunks = [data[:first_entry_end]] + split(data[first_entry_end:], 256)
+        session = StreamingSession(chunks)
+        session.gate = asyncio.Event()
+        async with aioarxiv.Client(streaming=True) as client:
+            with patch.object(client, "_session", session):
+                results = client.results(aioarxiv.SearchQuery(query="testing"))
+                first = await results.__anext__()
+                self.assertEqual(first.title, "Paper 0")
+                # Only part of the body has been read so far.
+                self.assertLess(session.chunks_read, len(chunks))
+                session.gate.set()
+                rest = [r async for r in results]
+        self.assertEqual([r.title for r in rest], [f"Paper {i}" for i in range(1, 10)])
+
+    async def test_paginates(self):
+        session = StreamingSession(
+            split(atom_page(0, 4, 10), 100),
+            split(atom_page(4, 4, 10), 100),
+            split(atom_page(8, 4, 10), 100),
+        )
+        async with aioarxiv.Client(page_size=4, delay_seconds=0, streaming=True) as client:
+            with patch.object(client, "_session", session):
+                results = [r async for r in client.results(aioarxiv.SearchQuery(query="testing"))]
+        self.assertEqual([r.title for r in results], [f"Paper {i}" for i in range(10)])
+        self.assertEqual([URL(u).query["start"] for u in session.requested], ["0", "4", "8"])
+
+    async def test_max_results_stops_stream(self):
+        session = StreamingSession(split(atom_page(0, 10, 100), 100))
+        async with aioarxiv.Client(page_size=10, streaming=True) as client:
+            with patch.object(client, "_session", session):
+                query = aioarxiv.SearchQuery(query="testing", max_results=3)
+                results = [r async for r in client.results(query)]
+        self.assertEqual(len(results), 3)
+        self.assertEqual(len(session.requested), 1)
+
+    @patch("asyncio.sleep", return_value=None)
+    async def test_retry_skips_yielded_entries(self, mock_sleep):
+        data = atom_page(0, 6, 6)
+        third_entry_end = data.index(b"</entry>", data.index(b"Paper 2")) + len(b"</entry>")
+        session = StreamingSession(
+            [data[:third_entry_end], aiohttp.ClientPayloadError("connection dropped")],
+            split(data, 100),
+        )
+        async with aioarxiv.Client(streaming=True) as client:
+            with patch.object(client, "_session", session):
+                results = [r async for r in client.results(aioarxiv.SearchQuery(query="testing"))]
+        self.assertEqual([r.title for r in results], [f"Paper {i}" for i in range(6)])
+        self.assertEqual(len(session.requested), 2)
+        self.assertEqual(client.stats.retries, 1)
+
+    @patch("asyncio.sleep", return_value=None)
+    async def test_http_error(self, mock_sleep):
+        session = StreamingSession([], [], status=500)
+        async with aioarxiv.Client(streaming=True, num_retries=1) as client:
+            with patch.object(client, "_session", session):
+                with self.assertRaises(aioarxiv.HTTPError):
+                    [r async for r in client.results(aioarxiv.SearchQuery(query="testing"))]
+        self.assertEqual(len(session.requested), 2)
+
+    @patch("asyncio.sleep", return_value=None)
+    async def test_truncated_body_is_retried(self, mock_sleep):
+        data = atom_page(0, 6, 6)
+        third_entry_end = data.index(b"</entry>", data.index(b"Paper 2")) + len(b"</entry>")
+        session = StreamingSession([data[:third_entry_end]], split(data, 100))
+        async with aioarxiv.Client(streaming=True) as client:
+            with patch.object(client, "_session", session):
+                results = [r async for r in client.results(aioarxiv.SearchQuery(query="testing"))]
+        self.assertEqual([r.title for r in results], [f"Paper {i}" for i in range(6)])
+        self.assertEqual(len(session.requested), 2)
+        self.assertEqual(client.stats.retries, 1)
+
+    async def test_malformed_body_fetched_whole(self):
+        data = atom_page(0, 6, 6)
+        third_entry_end = data.index(b"</entry>", data.index(b"Paper 2")) + len(b"</entry>")
+        session = StreamingSession([data[:third_entry_end] + b"<entry><</entry>"], [data])
+        async with aioarxiv.Client(streaming=True, num_retries=0) as client:
+            with patch.object(client, "_session", session):
+                with self.assertLogs("aioarxiv.client", level="WARNING"):
+                    query = aioarxiv.SearchQuery(query="testing")
+                    results = [r async for r in client.results(query)]
+        self.assertEqual([r.title for r in results], [f"Paper {i}" for i in range(6)])
+        self.assertEqual(len(session.requested), 2)
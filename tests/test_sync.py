@@ -0,0 +1,171 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+from unittest.mock import patch
+
+import aioarxiv
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def feed(entries: List[Tuple[str, datetime]], total: int, malformed=()) -> bytes:
+    """
+    Build an arXiv API Atom feed of `(short_id, updated)` entries. Entries in
+    `malformed` get an unparseable `<updated>`.
+    """
+    body = "".join(
+        """
+  <entry>
+    <id>http://arxiv.org/abs/{0}</id>
+    <updated>{1}</updated>
+    <published>2023-01-01T00:00:00Z</published>
+    <title>Paper {0}</title>
+    <summary>Abstract {0}</summary>
+    <author><name>Author</name></author>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>""".format(
+            short_id,
+            "not a date" if short_id in malformed else updated.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        )
+        for short_id, updated in entries
+    )
+    return """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <opensearch:totalResults>{}</opensearch:totalResults>{}
+</feed>""".format(total, body).encode("utf-8")
+
+
+class UpdatedSession:
+    """
+    A stand-in for `aiohttp.ClientSession` serving a corpus of papers, each
+    `(short_id, updated)`, most recently updated first. The papers in
+    `malformed` are served with unparseable updated dates.
+    """
+
+    def __init__(self, papers: List[Tuple[str, datetime]], malformed=()):
+        self.papers = papers
+        self.malformed = set(malformed)
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        start, count = int(url.query["start"]), int(url.query["max_results"])
+        ordered = sorted(self.papers, key=lambda paper: paper[1], reverse=True)
+        body = feed(ordered[start : start + count], len(ordered), self.malformed)
+
+        class _Response:
+            status = 200
+            headers = {}
+
+            class content:
+                @staticmethod
+                async def read():
+                    return body
+
+        class _Request:
+            async def __aenter__(self):
+                return _Response()
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Request()
+
+    async def close(self):
+        pass
+
+
+def corpus(n: int) -> List[Tuple[str, datetime]]:
+    """Papers updated an hour apart, the last most recently."""
+    return [("2401.{:05d}v1".format(i), START + timedelta(hours=i)) for i in range(n)]
+
+
+class TestSync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.store = aioarxiv.JSONCheckpointStore(os.path.join(self.dir.name, "sync.json"))
+        self.query = aioarxiv.SearchQuery(query="cat:cs.LG")
+
+    async def sync(self, session, query=None, **kwargs) -> aioarxiv.SyncResult:
+        async with aioarxiv.Client(delay_seconds=0, page_size=10) as client:
+            with patch.object(client, "_session", session):
+                return await client.sync(query or self.query, **kwargs)
+
+    async def test_stops_at_watermark(self):
+        session = UpdatedSession(corpus(100))
+        synced = await self.sync(session, since=START + timedelta(hours=95))
+
+        self.assertEqual(
+            [r.get_short_id() for r in synced.results],
+            ["2401.{:05d}v1".format(i) for i in range(99, 94, -1)],
+        )
+        self.assertEqual(synced.watermark, START + timedelta(hours=99))
+        self.assertTrue(synced.complete)
+        self.assertEqual(synced.pages, 1)
+        self.assertEqual(session.urls[0].query["sortBy"], "lastUpdatedDate")
+        self.assertEqual(session.urls[0].query["sortOrder"], "descending")
+
+    async def test_pages_until_watermark(self):
+        session = UpdatedSession(corpus(100))
+        synced = await self.sync(session, since=(START + timedelta(hours=75)).replace(tzinfo=None))
+        self.assertEqual(len(synced.results), 25)
+        self.assertEqual(synced.pages, 3)
+
+    async def test_full_sync(self):
+        session = UpdatedSession(corpus(25))
+        synced = await self.sync(session)
+        self.assertEqual(len(synced.results), 25)
+        self.assertEqual(synced.pages, 3)
+        self.assertEqual(synced.watermark, START + timedelta(hours=24))
+
+    async def test_persisted_watermark(self):
+        papers = corpus(50)
+        session = UpdatedSession(papers)
+        first = await self.sync(session, store=self.store, key="cs")
+        self.assertEqual(len(first.results), 50)
+
+        # Nothing new: one page, no results, the watermark holds.
+        session.urls = []
+        unchanged = await self.sync(session, store=self.store, key="cs")
+        self.assertEqual(unchanged.results, [])
+        self.assertEqual(unchanged.watermark, first.watermark)
+        self.assertEqual(len(session.urls), 1)
+
+        # A paper revised at the watermark and another one revised later.
+        papers.append(("2401.00003v2", first.watermark))
+        papers.append(("2401.00007v2", first.watermark + timedelta(minutes=5)))
+        updated = await self.sync(session, store=self.store, key="cs")
+        self.assertEqual(
+            [r.get_short_id() for r in updated.results], ["2401.00007v2", "2401.00003v2"]
+        )
+        self.assertEqual(updated.watermark, first.watermark + timedelta(minutes=5))
+        self.assertEqual(self.store.load("cs").watermark, updated.watermark)
+        self.assertEqual(self.store.load("cs").watermark_ids, ["2401.00007v2"])
+        self.assertEqual(self.store.load("cs").last_ids, [])
+
+    async def test_max_results_doesnt_advance_watermark(self):
+        session = UpdatedSession(corpus(50))
+        since = START + timedelta(hours=10)
+        query = aioarxiv.SearchQuery(query="cat:cs.LG", max_results=15)
+        synced = await self.sync(session, query=query, since=since, store=self.store, key="cs")
+        self.assertEqual(len(synced.results), 15)
+        self.assertFalse(synced.complete)
+        self.assertEqual(synced.watermark, since)
+        self.assertIsNone(self.store.load("cs"))
+
+    async def test_skips_unparseable_dates(self):
+        session = UpdatedSession(corpus(30), malformed=["2401.00027v1"])
+        synced = await self.sync(session, since=START + timedelta(hours=20))
+        self.assertEqual(
+            [r.get_short_id() for r in synced.results],
+            ["2401.{:05d}v1".format(i) for i in range(29, 19, -1) if i != 27],
+        )
+        self.assertTrue(synced.complete)
+
+        # In a full sync too, they don't break the watermark.
+        synced = await self.sync(UpdatedSession(corpus(5), malformed=["2401.00004v1"]))
+        self.assertEqual(len(synced.results), 4)
+        self.assertEqual(synced.watermark, START + timedelta(hours=3))
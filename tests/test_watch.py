@@ -0,0 +1,191 @@
+import os
+import tempfile
+import unittest
+from typing import List, Tuple
+from unittest.mock import patch
+
+import aioarxiv
+
+
+def rss_feed(entries: List[Tuple[str, str]], day: int = 28) -> bytes:
+    """
+    Build an arXiv RSS feed of `(versioned_id, announce_type)` entries.
+    """
+    items = "".join(
+        """
+    <item>
+      <title>Paper {0}</title>
+      <link>https://arxiv.org/abs/{3}</link>
+      <description>arXiv:{0} Announce Type: {1}
+Abstract: Abstract {0}</description>
+      <guid isPermaLink="false">oai:arXiv.org:{0}</guid>
+      <category>cs.LG</category>
+      <pubDate>Thu, {2} Nov 2024 00:00:00 -0500</pubDate>
+      <arxiv:announce_type>{1}</arxiv:announce_type>
+      <dc:creator>Jane Doe</dc:creator>
+    </item>""".format(short_id, announce_type, day, short_id.split("v")[0])
+        for short_id, announce_type in entries
+    )
+    return """<?xml version='1.0' encoding='UTF-8'?>
+<rss xmlns:arxiv="http://arxiv.org/schemas/atom" xmlns:dc="http://purl.org/dc/elements/1.1/" version="2.0">
+  <channel>
+    <title>cs.LG updates on arXiv.org</title>
+    <pubDate>Thu, {} Nov 2024 00:00:00 -0500</pubDate>{}
+  </channel>
+</rss>""".format(day, items).encode("utf-8")
+
+
+class Exhausted(Exception):
+    pass
+
+
+class FeedSession:
+    """
+    A stand-in for `aiohttp.ClientSession` answering polls with scripted
+    `(status, body, headers)` responses, recording each request's headers.
+    Raises `Exhausted` once the responses run out.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers or {})
+        if not self.responses:
+            raise Exhausted()
+        status, body, response_headers = self.responses.pop(0)
+
+        class _Response:
+            pass
+
+        response = _Response()
+        response.status = status
+        response.headers = response_headers
+
+        class content:
+            @staticmethod
+            async def read():
+                return body
+
+        response.content = content
+
+        class _Request:
+            async def __aenter__(self):
+                return response
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Request()
+
+    async def close(self):
+        pass
+
+
+MONDAY = rss_feed([("2411.00001v1", "new"), ("2411.00002v1", "new"), ("2411.00003v1", "cross")], 25)
+TUESDAY = rss_feed(
+    [("2411.00003v1", "cross"), ("2411.00004v1", "new"), ("2411.00001v2", "replace")], 26
+)
+
+
+class TestWatch(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.store = aioarxiv.JSONCheckpointStore(os.path.join(self.dir.name, "watch.json"))
+        self.query = aioarxiv.RSSQuery("cs.LG")
+
+    async def watch(self, session, take: int, **kwargs) -> List[str]:
+        """
+        Watches until `take` entries are yielded or the responses run out.
+        """
+        keys = []
+        async with aioarxiv.Client(delay_seconds=0) as client:
+            with patch.object(client, "_session", session):
+                watch = client.watch(self.query, interval=0, **kwargs)
+                try:
+                    async for result in watch:
+                        keys.append(
+                            "{} {}".format(result.get_short_id(), result.announce_type.value)
+                        )
+                        if len(keys) == take:
+                            break
+                except Exhausted:
+                    pass
+                finally:
+                    await watch.aclose()
+        return keys
+
+    async def test_yields_new_entries_once(self):
+        session = FeedSession(
+            [
+                (200, MONDAY, {"ETag": '"monday"'}),
+                (304, b"", {}),
+                (200, MONDAY, {}),
+                (200, TUESDAY, {"ETag": '"tuesday"', "Last-Modified": "Tue, 26 Nov 2024"}),
+            ]
+        )
+        with patch.object(
+            aioarxiv.parsers.ArxivParser,
+            "parse",
+            autospec=True,
+            side_effect=aioarxiv.parsers.ArxivParser.parse,
+        ) as parse:
+            keys = await self.watch(session, take=5)
+        self.assertEqual(
+            keys,
+            [
+                "2411.00001v1 new",
+                "2411.00002v1 new",
+                "2411.00003v1 cross",
+                "2411.00004v1 new",
+                "2411.00001v2 replace",
+            ],
+        )
+        # Polls are conditional; 304s and unchanged bodies aren't parsed.
+        self.assertNotIn("If-None-Match", session.requests[0])
+        self.assertEqual(session.requests[1]["If-None-Match"], '"monday"')
+        self.assertEqual(parse.call_count, 2)
+
+    async def test_seen_persisted(self):
+        session = FeedSession([(200, MONDAY, {})])
+        self.assertEqual(len(await self.watch(session, take=3, store=self.store, key="cs")), 3)
+
+        # A restarted watch only yields entries it hasn't yielded before.
+        session = FeedSession([(200, MONDAY, {}), (200, TUESDAY, {})])
+        keys = await self.watch(session, take=2, store=self.store, key="cs")
+        self.assertEqual(keys, ["2411.00004v1 new", "2411.00001v2 replace"])
+        self.assertIn("2411.00002v1 new", self.store.load("cs").seen)
+
+    async def test_close_mid_feed(self):
+        session = FeedSession([(200, MONDAY, {})])
+        self.assertEqual(
+            await self.watch(session, take=1, store=self.store, key="cs"), ["2411.00001v1 new"]
+        )
+        session = FeedSession([(200, MONDAY, {})])
+        keys = await self.watch(session, take=2, store=self.store, key="cs")
+        self.assertEqual(keys, ["2411.00002v1 new", "2411.00003v1 cross"])
+
+    async def test_retention(self):
+        session = FeedSession([(200, MONDAY, {})])
+        await self.watch(session, take=3, store=self.store, key="cs", retention=60)
+
+        # Entries out of the feed for longer than `retention` are forgotten.
+        with patch(
+            "aioarxiv.client.time.time",
+            return_value=self.store.load("cs").seen["2411.00002v1 new"] + 120,
+        ):
+            session = FeedSession([(200, TUESDAY, {})])
+            await self.watch(session, take=3, store=self.store, key="cs", retention=60)
+        self.assertEqual(
+            sorted(self.store.load("cs").seen),
+            ["2411.00001v2 replace", "2411.00003v1 cross", "2411.00004v1 new"],
+        )
+
+    async def test_id_list(self):
+        self.query = aioarxiv.RSSQuery("cs.LG", id_list=["2411.00002", "2411.00004"])
+        session = FeedSession([(200, MONDAY, {}), (200, TUESDAY, {})])
+        self.assertEqual(
+            await self.watch(session, take=2), ["2411.00002v1 new", "2411.00004v1 new"]
+        )